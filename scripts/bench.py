@@ -0,0 +1,334 @@
+"""
+MCP Tool 부하 벤치마크. stdio 또는 HTTP로 서버에 동시 요청을 보내 지연 분위수·처리량·응답 바이트를 측정합니다.
+
+대상 DB는 .env의 MySQL(실제 DB) 또는 --fake로 지정한 가짜 information_schema(scripts/bench_schema.py fake로 생성)입니다.
+--url을 주지 않으면 서버를 하위 프로세스로 띄우고, 처리량 제한은 끕니다(RATE_LIMIT_RPM=0, --env로 덮어쓰기 가능).
+
+실행 예:
+  python scripts/bench_schema.py fake --out bench_fake.db --tables 5000 --columns 30 --fks 3
+  python scripts/bench.py --fake bench_fake.db --schema bench --transport stdio --concurrency 8 --requests 500
+  python scripts/bench.py --fake bench_fake.db --schema bench --transport http --concurrency 32 --out base.json
+  python scripts/bench.py --fake bench_fake.db --schema bench --env METADATA_CACHE_ENABLED=false --compare base.json
+  python scripts/bench.py --transport http --url http://127.0.0.1:8000/mcp --schema mydb
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+from fastmcp import Client  # noqa: E402
+from fastmcp.client.transports import StdioTransport, StreamableHttpTransport  # noqa: E402
+
+_ERROR = re.compile(r'^\{\s*"error"')
+DEFAULT_MIX = "get_table_metadata=4,get_tables_metadata=2,list_tables=2,get_schema_overview=1"
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="MCP Tool 부하 벤치마크 (p50/p95/p99, 처리량, 응답 바이트)")
+    p.add_argument("--schema", required=True, help="대상 스키마")
+    p.add_argument("--transport", choices=("stdio", "http"), default="stdio")
+    p.add_argument("--url", default=None, help="이미 떠 있는 HTTP 서버 (예: http://127.0.0.1:8000/mcp)")
+    p.add_argument("--port", type=int, default=0, help="HTTP 서버를 띄울 포트 (기본: 빈 포트)")
+    p.add_argument("--fake", default=None, help="fake information_schema 파일 (미지정 시 .env의 DB)")
+    p.add_argument("--rtt-ms", type=float, default=0.0, help="fake 사용 시 쿼리당 왕복 지연(ms)")
+    p.add_argument("--workers", type=int, default=1, help="HTTP 서버 워커 프로세스 수 (기본: 1)")
+    p.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="서버 환경변수 (반복 가능)")
+    p.add_argument("--concurrency", type=int, default=8, help="동시 요청 수 (기본: 8)")
+    p.add_argument("--requests", type=int, default=200, help="측정 요청 수 (기본: 200)")
+    p.add_argument("--warmup", type=int, default=20, help="측정 전 워밍업 요청 수 (기본: 20)")
+    p.add_argument("--mix", default=DEFAULT_MIX, help=f"Tool=가중치 목록 (기본: {DEFAULT_MIX})")
+    p.add_argument("--batch", type=int, default=20, help="get_tables_metadata 테이블 수 (기본: 20)")
+    p.add_argument("--page-size", type=int, default=100, help="list_tables page_size (기본: 100)")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--server-log", default=os.devnull, help="하위 프로세스 서버 stderr(감사 로그 등) 저장 경로")
+    p.add_argument("--out", default=None, help="결과 JSON 저장 경로")
+    p.add_argument("--compare", default=None, help="이전 결과 JSON과 분위수·처리량 비교")
+    return p.parse_args()
+
+
+def _mix(text: str) -> list[tuple[str, float]]:
+    out = []
+    for part in text.split(","):
+        name, _, weight = part.strip().partition("=")
+        out.append((name.strip(), float(weight or 1)))
+    return out
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _server_command(args, http_port: int | None) -> list[str]:
+    if args.fake:
+        cmd = [sys.executable, str(ROOT / "scripts" / "bench_fake_server.py"), args.fake, "--rtt-ms", str(args.rtt_ms)]
+    else:
+        cmd = [sys.executable, "-m", "src.server"]
+    if http_port is not None:
+        cmd += ["--http", str(http_port)]
+        if args.workers > 1:
+            cmd += ["--workers", str(args.workers)]
+    return cmd
+
+
+def _server_env(args) -> dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("RATE_LIMIT_RPM", "0")
+    for item in args.env:
+        key, _, value = item.partition("=")
+        env[key] = value
+    return env
+
+
+def _wait_port(port: int, proc: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"서버가 시작 중 종료되었습니다 (exit {proc.returncode})")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise SystemExit(f"서버 포트 {port}가 {timeout}초 안에 열리지 않았습니다")
+
+
+def _percentile(sorted_values: list[float], q: float) -> float | None:
+    """nearest-rank 분위수."""
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[idx]
+
+
+def _summarize(samples: list[tuple[str, float, int, bool]], wall: float) -> dict:
+    def stats(rows):
+        lat = sorted(r[1] * 1000 for r in rows)
+        total_bytes = sum(r[2] for r in rows)
+        return {
+            "requests": len(rows),
+            "errors": sum(1 for r in rows if not r[3]),
+            "p50_ms": round(_percentile(lat, 0.50), 3) if lat else None,
+            "p95_ms": round(_percentile(lat, 0.95), 3) if lat else None,
+            "p99_ms": round(_percentile(lat, 0.99), 3) if lat else None,
+            "max_ms": round(lat[-1], 3) if lat else None,
+            "mean_ms": round(sum(lat) / len(lat), 3) if lat else None,
+            "bytes_total": total_bytes,
+            "bytes_avg": round(total_bytes / len(rows), 1) if rows else None,
+            "throughput_rps": round(len(rows) / wall, 2) if wall > 0 else None,
+        }
+
+    tools = {}
+    for name in sorted({s[0] for s in samples}):
+        tools[name] = stats([s for s in samples if s[0] == name])
+    return {"overall": stats(samples), "tools": tools}
+
+
+class Workload:
+    """시드 고정 요청 생성기. 테이블 목록은 시작 시 list_tables로 가져온다."""
+
+    def __init__(self, args, tables: list[str]) -> None:
+        self.args = args
+        self.tables = tables
+        self.rng = random.Random(args.seed)
+        mix = _mix(args.mix)
+        self.names = [m[0] for m in mix]
+        self.weights = [m[1] for m in mix]
+
+    def next(self) -> tuple[str, dict]:
+        tool = self.rng.choices(self.names, self.weights)[0]
+        schema = self.args.schema
+        if tool == "get_table_metadata":
+            return tool, {"schema_name": schema, "table_name": self.rng.choice(self.tables)}
+        if tool == "get_tables_metadata":
+            names = self.rng.sample(self.tables, min(self.args.batch, len(self.tables)))
+            return tool, {"schema_name": schema, "table_names": names}
+        if tool == "list_tables":
+            # 절반은 첫 페이지, 절반은 이름 접두어 검색
+            args = {"schema_name": schema, "page_size": self.args.page_size}
+            if self.rng.random() < 0.5:
+                args["name_prefix"] = self.rng.choice(self.tables)[:4]
+            return tool, args
+        if tool == "get_schema_overview":
+            return tool, {"schema_name": schema}
+        return tool, {}
+
+
+async def _call(client: Client, tool: str, tool_args: dict) -> tuple[float, int, bool]:
+    start = time.perf_counter()
+    try:
+        result = await client.call_tool(tool, tool_args, raise_on_error=False)
+        text = result.content[0].text if result.content else ""
+        ok = not result.is_error and not _ERROR.match(text)
+    except Exception as e:
+        text, ok = str(e), False
+    return time.perf_counter() - start, len(text.encode("utf-8")), ok
+
+
+async def _fetch_tables(client: Client, schema: str) -> list[str]:
+    tables: list[str] = []
+    cursor = None
+    while True:
+        args = {"schema_name": schema, "page_size": 1000}
+        if cursor:
+            args["cursor"] = cursor
+        result = await client.call_tool("list_tables", args, raise_on_error=False)
+        text = result.content[0].text
+        data = json.loads(text)
+        if "error" in data:
+            raise SystemExit(f"list_tables 실패: {data['error']}")
+        page = data["tables"]
+        if isinstance(page, dict):  # OUTPUT_COLUMNAR
+            page = [dict(zip(page["columns"], row)) for row in page["rows"]]
+        tables += [t["table_name"] for t in page]
+        cursor = data.get("next_cursor")
+        if not cursor:
+            return tables
+
+
+async def _server_stats(client: Client) -> dict | None:
+    try:
+        result = await client.call_tool("server_stats", {}, raise_on_error=False)
+        return json.loads(result.content[0].text)
+    except Exception:
+        return None
+
+
+async def _run(args, make_client) -> dict:
+    async with make_client() as setup:
+        tables = await _fetch_tables(setup, args.schema)
+        if not tables:
+            raise SystemExit(f"스키마 {args.schema}에 테이블이 없습니다")
+        workload = Workload(args, tables)
+        for _ in range(args.warmup):
+            await _call(setup, *workload.next())
+
+        # stdio는 세션 하나를 공유(요청 다중화), HTTP는 동시 요청마다 세션(클라이언트)을 따로 연다
+        if args.transport == "stdio":
+            clients = [setup] * args.concurrency
+            extra = []
+        else:
+            extra = [make_client() for _ in range(args.concurrency)]
+            for c in extra:
+                await c.__aenter__()
+            clients = extra
+
+        remaining = args.requests
+        samples: list[tuple[str, float, int, bool]] = []
+
+        async def worker(client: Client) -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                tool, tool_args = workload.next()
+                elapsed, size, ok = await _call(client, tool, tool_args)
+                samples.append((tool, elapsed, size, ok))
+
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(worker(c) for c in clients))
+        finally:
+            wall = time.perf_counter() - started
+            for c in extra:
+                await c.__aexit__(None, None, None)
+        server = await _server_stats(setup)
+    return {"table_count": len(tables), "wall_seconds": round(wall, 3), **_summarize(samples, wall), "server_stats": server}
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def _print_report(result: dict) -> None:
+    cols = ("requests", "errors", "p50_ms", "p95_ms", "p99_ms", "max_ms", "bytes_avg", "throughput_rps")
+    print(f"{'tool':<22}" + "".join(f"{c:>15}" for c in cols))
+    rows = [*result["tools"].items(), ("(overall)", result["overall"])]
+    for name, stats in rows:
+        print(f"{name:<22}" + "".join(f"{str(stats[c]):>15}" for c in cols))
+    print(f"wall {result['wall_seconds']}s, tables {result['table_count']}")
+
+
+def _print_compare(result: dict, baseline: dict) -> None:
+    print(f"\n비교 대상: {baseline.get('meta', {}).get('git_commit')} ({baseline.get('meta', {}).get('timestamp')})")
+    print(f"{'tool':<22}{'metric':>16}{'before':>12}{'after':>12}{'change':>10}")
+    rows = [*result["tools"].items(), ("(overall)", result["overall"])]
+    for name, stats in rows:
+        before = baseline["overall"] if name == "(overall)" else baseline.get("tools", {}).get(name)
+        if not before:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "bytes_avg", "throughput_rps"):
+            a, b = before.get(metric), stats.get(metric)
+            change = f"{(b - a) / a * 100:+.1f}%" if a and b is not None else "-"
+            print(f"{name:<22}{metric:>16}{str(a):>12}{str(b):>12}{change:>10}")
+
+
+def main():
+    args = parse_args()
+    env = _server_env(args)
+    proc = None
+    if args.transport == "stdio":
+        if args.url:
+            raise SystemExit("--url은 --transport http에서만 사용합니다")
+        cmd = _server_command(args, None)
+
+        def make_client():
+            return Client(
+                StdioTransport(command=cmd[0], args=cmd[1:], env=env, cwd=str(ROOT), log_file=Path(args.server_log))
+            )
+    else:
+        url = args.url
+        if url is None:
+            port = args.port or _free_port()
+            log = open(args.server_log, "ab")
+            proc = subprocess.Popen(_server_command(args, port), cwd=ROOT, env=env, stdout=log, stderr=log)
+            _wait_port(port, proc)
+            url = f"http://127.0.0.1:{port}/mcp"
+
+        def make_client():
+            return Client(StreamableHttpTransport(url))
+
+    try:
+        result = asyncio.run(_run(args, make_client))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+            log.close()
+
+    result = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "backend": f"fake:{args.fake}" if args.fake else "mysql",
+            "args": vars(args),
+        },
+        **result,
+    }
+    _print_report(result)
+    if args.compare:
+        _print_compare(result, json.loads(Path(args.compare).read_text(encoding="utf-8")))
+    if args.out:
+        Path(args.out).write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"결과 저장: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
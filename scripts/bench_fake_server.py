@@ -0,0 +1,61 @@
+"""
+가짜 information_schema(SQLite)에 연결된 MCP 서버 실행. MySQL 없이 벤치마크할 때 사용.
+
+fake 파일은 scripts/bench_schema.py fake로 생성합니다. --rtt-ms로 쿼리마다 네트워크 왕복 지연을 흉내 내며,
+그 외 인자(--http PORT 등)는 python -m src.server에 그대로 전달합니다.
+--workers N(2 이상)이면 워커 프로세스마다 fake를 설치한 뒤 HTTP 앱을 만듭니다.
+
+실행 예:
+  python scripts/bench_fake_server.py bench_fake.db
+  python scripts/bench_fake_server.py bench_fake.db --rtt-ms 0.5 --http 8000
+  python scripts/bench_fake_server.py bench_fake.db --http 8000 --workers 4
+"""
+import argparse
+import os
+import runpy
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import bench_schema  # noqa: E402
+
+
+def create_http_app():
+    """--workers 워커용 app factory. 부모가 넘긴 환경 변수로 fake를 설치한 뒤 서버 앱 생성."""
+    bench_schema.install_fake(os.environ["BENCH_FAKE_PATH"], float(os.environ.get("BENCH_FAKE_RTT_MS", "0")))
+    from src import server
+
+    return server.create_http_app()
+
+
+def main():
+    p = argparse.ArgumentParser(description="fake information_schema로 MCP 서버 실행")
+    p.add_argument("fake", help="bench_schema.py fake로 만든 SQLite 파일")
+    p.add_argument("--rtt-ms", type=float, default=0.0, help="쿼리당 흉내 낼 왕복 지연(ms, 기본: 0)")
+    p.add_argument("--workers", type=int, default=1, help="HTTP 워커 프로세스 수 (기본: 1)")
+    p.add_argument("--http", type=int, default=None, metavar="PORT")
+    p.add_argument("--host", default="127.0.0.1")
+    args, rest = p.parse_known_args()
+    if not Path(args.fake).is_file():
+        p.error(f"fake 파일이 없습니다: {args.fake}")
+    if args.workers > 1:
+        if args.http is None:
+            p.error("--workers는 --http와 함께 사용합니다.")
+        os.environ["BENCH_FAKE_PATH"] = str(Path(args.fake).resolve())
+        os.environ["BENCH_FAKE_RTT_MS"] = str(args.rtt_ms)
+        from src import server
+
+        server.serve_workers(args.host, args.http, args.workers, app="bench_fake_server:create_http_app")
+        return
+    if args.http is not None:
+        rest += ["--http", str(args.http), "--host", args.host]
+    bench_schema.install_fake(args.fake, args.rtt_ms)
+    sys.argv = ["src.server", *rest]
+    runpy.run_module("src.server", run_name="__main__", alter_sys=True)
+
+
+if __name__ == "__main__":
+    main()
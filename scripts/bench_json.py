@@ -0,0 +1,127 @@
+"""
+Tool 응답 인코딩별 크기·직렬화 시간 측정 스크립트.
+
+--schema를 주면 .env의 DB에서 실제 메타데이터를 가져와 측정하고, 생략하면 합성 메타데이터를 사용합니다.
+
+실행 예:
+  python scripts/bench_json.py
+  python scripts/bench_json.py --tables 50 --columns 30
+  python scripts/bench_json.py --schema mydb --tables 50 --out bench_json.json
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import serialization  # noqa: E402
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Tool 응답 JSON 인코딩별 바이트·직렬화 시간 비교")
+    p.add_argument("--schema", default=None, help="실제 DB 스키마 (미지정 시 합성 데이터)")
+    p.add_argument("--tables", type=int, default=50, help="get_tables_metadata 테이블 수 (기본: 50)")
+    p.add_argument("--columns", type=int, default=20, help="합성 데이터 테이블당 컬럼 수 (기본: 20)")
+    p.add_argument("--repeat", type=int, default=50, help="인코딩별 반복 횟수 (기본: 50)")
+    p.add_argument("--out", default=None, help="결과를 JSON 파일로 저장")
+    return p.parse_args()
+
+
+def synthetic_table(i: int, columns: int) -> dict:
+    name = f"table_{i:04d}"
+    return {
+        "table": {
+            "table_name": name,
+            "engine": "InnoDB",
+            "table_collation": "utf8mb4_0900_ai_ci",
+            "table_comment": f"합성 테이블 {i}",
+            "row_format": "Dynamic",
+        },
+        "columns": [
+            {
+                "column_name": "id" if c == 0 else f"col_{c:03d}",
+                "data_type": "bigint unsigned" if c == 0 else "varchar(255)",
+                "nullable": "NO" if c == 0 else "YES",
+                "default_value": None,
+                "extra": "auto_increment" if c == 0 else "",
+                "column_comment": f"컬럼 {c} 설명",
+            }
+            for c in range(columns)
+        ],
+        "primary_key": ["id"],
+        "unique_keys": [{"constraint_name": f"uq_{name}", "columns": ["col_001", "col_002"]}],
+        "indexes": [{"index_name": f"ix_{name}_col_003", "columns": ["col_003"], "non_unique": True}],
+        "foreign_keys": [],
+        "check_constraints": [],
+    }
+
+
+def load_payloads(args) -> dict:
+    if args.schema:
+        from src import metadata
+
+        listing = metadata.list_tables(args.schema, page_size=args.tables)
+        names = [t["table_name"] for t in listing["tables"]]
+        return {
+            "list_tables": listing,
+            "get_table_metadata": metadata.get_table_metadata(args.schema, names[0]),
+            "get_tables_metadata": metadata.get_tables_metadata(args.schema, names),
+            "get_schema_overview": metadata.get_schema_overview(args.schema),
+        }
+    tables = [synthetic_table(i, args.columns) for i in range(args.tables)]
+    return {
+        "list_tables": {
+            "tables": [
+                {"schema": "bench", "table_name": t["table"]["table_name"], "table_comment": t["table"]["table_comment"]}
+                for t in tables
+            ],
+            "next_cursor": None,
+        },
+        "get_table_metadata": tables[0],
+        "get_tables_metadata": tables,
+        "get_schema_overview": {
+            "schema": "bench",
+            "tables": [
+                {"table_name": t["table"]["table_name"], "table_comment": t["table"]["table_comment"]} for t in tables
+            ],
+            "relationships": [],
+        },
+    }
+
+
+def encodings() -> list[dict]:
+    out = []
+    backends = ["json"] + (["orjson"] if serialization.orjson is not None else [])
+    for backend in backends:
+        for style in serialization.STYLES:
+            for columnar in (False, True):
+                out.append({"backend": backend, "style": style, "columnar": columnar})
+    return out
+
+
+def main():
+    args = parse_args()
+    payloads = load_payloads(args)
+    results = []
+    for tool, payload in payloads.items():
+        for enc in encodings():
+            text = serialization.dumps(payload, **enc)
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                serialization.dumps(payload, **enc)
+            elapsed_ms = (time.perf_counter() - start) * 1000 / args.repeat
+            results.append({"tool": tool, **enc, "bytes": len(text.encode("utf-8")), "ms": round(elapsed_ms, 3)})
+
+    print(f"{'tool':<22}{'backend':<8}{'style':<9}{'columnar':<10}{'bytes':>10}{'ms':>10}")
+    for r in results:
+        print(f"{r['tool']:<22}{r['backend']:<8}{r['style']:<9}{str(r['columnar']):<10}{r['bytes']:>10}{r['ms']:>10.3f}")
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"저장: {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
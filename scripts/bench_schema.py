@@ -0,0 +1,389 @@
+"""
+벤치마크용 합성 스키마 생성기와 가짜 information_schema 백엔드.
+
+크기·폭·인덱스·FK 밀도를 지정해 합성 스키마를 만들고, 다음 중 하나로 내보냅니다.
+  - mysql: .env의 MySQL/MariaDB에 CREATE DATABASE/TABLE로 적재
+  - ddl:   CREATE TABLE 문을 표준 출력으로
+  - fake:  information_schema 뷰를 흉내 낸 SQLite 파일 (MySQL 없이 벤치마크)
+
+fake 파일은 scripts/bench_fake_server.py로 서버에 연결합니다 (db 연결을 FakeConnection으로 교체).
+
+실행 예:
+  python scripts/bench_schema.py fake --out bench_fake.db --schema bench --tables 2000 --columns 30 --fks 3
+  python scripts/bench_schema.py mysql --schema bench --tables 500 --columns 40 --indexes 4 --fks 2
+  python scripts/bench_schema.py ddl --tables 10 > bench.sql
+"""
+import argparse
+import itertools
+import random
+import re
+import sqlite3
+import sys
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+_TYPES = ("int", "bigint", "varchar(64)", "varchar(255)", "datetime", "decimal(12,2)", "tinyint(1)", "text", "json")
+
+
+@dataclass
+class Column:
+    name: str
+    column_type: str
+    nullable: bool
+    default: str | None
+    extra: str
+    comment: str
+
+
+@dataclass
+class Table:
+    name: str
+    comment: str
+    columns: list[Column]
+    uniques: list[tuple[str, list[str]]] = field(default_factory=list)
+    indexes: list[tuple[str, list[str]]] = field(default_factory=list)
+    fks: list[tuple[str, str, str]] = field(default_factory=list)  # (제약명, 컬럼, 참조 테이블)
+    checks: list[tuple[str, str]] = field(default_factory=list)
+
+
+def generate(
+    tables: int, columns: int, indexes: int, fks: int, checks: bool = True, seed: int = 42
+) -> list[Table]:
+    """합성 스키마 생성. 테이블 i의 FK는 앞쪽 테이블만 참조하고(DAG), 일부는 뒤쪽을 참조해 순환도 만든다."""
+    rng = random.Random(seed)
+    out: list[Table] = []
+    for i in range(tables):
+        name = f"t_{i:05d}"
+        cols = [Column("id", "bigint unsigned", False, None, "auto_increment", "기본 키")]
+        for c in range(1, columns):
+            ctype = rng.choice(_TYPES)
+            cols.append(Column(f"c_{c:03d}", ctype, rng.random() < 0.6, None, "", f"{name} 컬럼 {c} 설명"))
+        table = Table(name, f"합성 테이블 {i}", cols)
+        fk_targets = set()
+        for _ in range(fks if i > 0 else 0):
+            # 10%는 뒤쪽 테이블을 참조해 FK 순환을 만든다
+            target = rng.randrange(tables) if rng.random() < 0.1 else rng.randrange(i)
+            if target == i or target in fk_targets:
+                continue
+            fk_targets.add(target)
+            ref = f"t_{target:05d}"
+            col = f"{ref}_id"
+            table.columns.append(Column(col, "bigint unsigned", True, None, "", f"{ref} 참조"))
+            table.fks.append((f"fk_{name}_{ref}", col, ref))
+        plain = [c.name for c in cols[1:] if c.column_type not in ("text", "json")]
+        if len(plain) >= 2:
+            table.uniques.append((f"uq_{name}", plain[:2]))
+        for k in range(min(indexes, max(0, len(plain) - 2))):
+            table.indexes.append((f"ix_{name}_{k}", [plain[2 + k]]))
+        if checks and i % 5 == 0:
+            table.checks.append((f"ck_{name}", "(`id` > 0)"))
+        out.append(table)
+    return out
+
+
+def render_ddl(schema: str, tables: list[Table], with_checks: bool = True) -> list[str]:
+    """MySQL CREATE 문 목록 (FOREIGN_KEY_CHECKS=0 전제)."""
+    stmts = [f"CREATE DATABASE IF NOT EXISTS `{schema}`"]
+    for t in tables:
+        lines = []
+        for c in t.columns:
+            null = "NULL" if c.nullable else "NOT NULL"
+            extra = f" {c.extra.upper()}" if c.extra else ""
+            lines.append(f"  `{c.name}` {c.column_type} {null}{extra} COMMENT '{c.comment}'")
+        lines.append("  PRIMARY KEY (`id`)")
+        for name, cols in t.uniques:
+            lines.append(f"  UNIQUE KEY `{name}` ({', '.join(f'`{c}`' for c in cols)})")
+        for name, cols in t.indexes:
+            lines.append(f"  KEY `{name}` ({', '.join(f'`{c}`' for c in cols)})")
+        for name, col, ref in t.fks:
+            lines.append(f"  CONSTRAINT `{name}` FOREIGN KEY (`{col}`) REFERENCES `{ref}` (`id`)")
+        if with_checks:
+            for name, clause in t.checks:
+                lines.append(f"  CONSTRAINT `{name}` CHECK {clause}")
+        body = ",\n".join(lines)
+        stmts.append(f"CREATE TABLE `{schema}`.`{t.name}` (\n{body}\n) ENGINE=InnoDB COMMENT='{t.comment}'")
+    return stmts
+
+
+def load_mysql(schema: str, tables: list[Table], with_checks: bool, drop: bool) -> None:
+    """.env의 DB에 합성 스키마 적재 (쓰기 권한이 있는 계정 필요)."""
+    from src import db
+
+    with db.get_connection() as conn:
+        with conn.cursor() as cur:
+            if drop:
+                cur.execute(f"DROP DATABASE IF EXISTS `{schema}`")
+            cur.execute("SET FOREIGN_KEY_CHECKS = 0")
+            for i, stmt in enumerate(render_ddl(schema, tables, with_checks)):
+                cur.execute(stmt)
+                if i and i % 500 == 0:
+                    print(f"  {i}/{len(tables)} 테이블 생성", file=sys.stderr)
+
+
+# ---- 가짜 information_schema (SQLite) ----
+
+_FAKE_DDL = """
+CREATE TABLE information_schema.TABLES (TABLE_SCHEMA, TABLE_NAME, TABLE_TYPE, ENGINE, TABLE_COLLATION,
+    TABLE_COMMENT, ROW_FORMAT, CREATE_TIME, UPDATE_TIME);
+CREATE TABLE information_schema.COLUMNS (TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, COLUMN_TYPE,
+    IS_NULLABLE, COLUMN_DEFAULT, EXTRA, COLUMN_COMMENT);
+CREATE TABLE information_schema.TABLE_CONSTRAINTS (CONSTRAINT_SCHEMA, TABLE_SCHEMA, TABLE_NAME, CONSTRAINT_NAME,
+    CONSTRAINT_TYPE);
+CREATE TABLE information_schema.KEY_COLUMN_USAGE (CONSTRAINT_SCHEMA, TABLE_SCHEMA, TABLE_NAME, CONSTRAINT_NAME,
+    COLUMN_NAME, ORDINAL_POSITION, REFERENCED_TABLE_SCHEMA, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME);
+CREATE TABLE information_schema.STATISTICS (TABLE_SCHEMA, TABLE_NAME, INDEX_NAME, COLUMN_NAME, SEQ_IN_INDEX,
+    NON_UNIQUE);
+CREATE TABLE information_schema.REFERENTIAL_CONSTRAINTS (CONSTRAINT_SCHEMA, CONSTRAINT_NAME, TABLE_NAME,
+    REFERENCED_TABLE_NAME, UPDATE_RULE, DELETE_RULE);
+CREATE TABLE information_schema.CHECK_CONSTRAINTS (CONSTRAINT_SCHEMA, CONSTRAINT_NAME, TABLE_NAME, CHECK_CLAUSE);  -- TABLE_NAME은 MariaDB 전용
+"""
+
+_FAKE_INDEXES = [
+    ("TABLES", "TABLE_SCHEMA, TABLE_NAME"),
+    ("COLUMNS", "TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION"),
+    ("TABLE_CONSTRAINTS", "TABLE_SCHEMA, TABLE_NAME"),
+    ("KEY_COLUMN_USAGE", "TABLE_SCHEMA, TABLE_NAME"),
+    ("KEY_COLUMN_USAGE", "CONSTRAINT_SCHEMA, TABLE_NAME, CONSTRAINT_NAME"),
+    ("STATISTICS", "TABLE_SCHEMA, TABLE_NAME"),
+    ("REFERENTIAL_CONSTRAINTS", "CONSTRAINT_SCHEMA, CONSTRAINT_NAME"),
+    ("CHECK_CONSTRAINTS", "CONSTRAINT_SCHEMA, CONSTRAINT_NAME"),
+]
+
+
+def write_fake(path: str, schema: str, tables: list[Table]) -> None:
+    """합성 스키마를 information_schema 형태의 SQLite 파일로 저장."""
+    Path(path).unlink(missing_ok=True)
+    db = sqlite3.connect(path)
+    db.executescript(_FAKE_DDL.replace("information_schema.", ""))
+    for i, (tname, cols) in enumerate(_FAKE_INDEXES):
+        db.execute(f"CREATE INDEX ix_{i}_{tname.lower()} ON {tname} ({cols})")
+    created = "2024-01-01 00:00:00"
+    for t in tables:
+        db.execute(
+            "INSERT INTO TABLES VALUES (?, ?, 'BASE TABLE', 'InnoDB', 'utf8mb4_0900_ai_ci', ?, 'Dynamic', ?, NULL)",
+            (schema, t.name, t.comment, created),
+        )
+        db.executemany(
+            "INSERT INTO COLUMNS VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (schema, t.name, c.name, pos, c.column_type, "YES" if c.nullable else "NO", c.default, c.extra, c.comment)
+                for pos, c in enumerate(t.columns, 1)
+            ],
+        )
+        constraints = [("PRIMARY", "PRIMARY KEY", ["id"])] + [(n, "UNIQUE", cols) for n, cols in t.uniques]
+        constraints += [(n, "FOREIGN KEY", [col]) for n, col, _ in t.fks]
+        for name, ctype, cols in constraints:
+            db.execute("INSERT INTO TABLE_CONSTRAINTS VALUES (?, ?, ?, ?, ?)", (schema, schema, t.name, name, ctype))
+        for name, ctype, cols in constraints[: 1 + len(t.uniques)]:
+            for pos, col in enumerate(cols, 1):
+                db.execute(
+                    "INSERT INTO KEY_COLUMN_USAGE VALUES (?, ?, ?, ?, ?, ?, NULL, NULL, NULL)",
+                    (schema, schema, t.name, name, col, pos),
+                )
+                db.execute(
+                    "INSERT INTO STATISTICS VALUES (?, ?, ?, ?, ?, 0)", (schema, t.name, name, col, pos)
+                )
+        for name, col, ref in t.fks:
+            db.execute(
+                "INSERT INTO KEY_COLUMN_USAGE VALUES (?, ?, ?, ?, ?, 1, ?, ?, 'id')",
+                (schema, schema, t.name, name, col, schema, ref),
+            )
+            db.execute(
+                "INSERT INTO REFERENTIAL_CONSTRAINTS VALUES (?, ?, ?, ?, 'RESTRICT', 'RESTRICT')",
+                (schema, name, t.name, ref),
+            )
+            db.execute("INSERT INTO STATISTICS VALUES (?, ?, ?, ?, 1, 1)", (schema, t.name, name, col))
+        for name, cols in t.indexes:
+            for pos, col in enumerate(cols, 1):
+                db.execute("INSERT INTO STATISTICS VALUES (?, ?, ?, ?, ?, 1)", (schema, t.name, name, col, pos))
+        for name, clause in t.checks:
+            db.execute("INSERT INTO TABLE_CONSTRAINTS VALUES (?, ?, ?, ?, 'CHECK')", (schema, schema, t.name, name))
+            db.execute("INSERT INTO CHECK_CONSTRAINTS VALUES (?, ?, ?, ?)", (schema, name, t.name, clause))
+    db.commit()
+    db.close()
+
+
+_thread_ids = itertools.count(1)
+_PARAM = re.compile(r"%s")
+_SHOW_CREATE = re.compile(r"^\s*SHOW CREATE TABLE `([^`]+)`\.`([^`]+)`\s*$", re.IGNORECASE)
+_SET_SESSION = re.compile(r"^\s*SET SESSION (\w+) = (\S+)\s*$", re.IGNORECASE)
+
+
+def _literal(value) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+class FakeCursor:
+    """pymysql DictCursor 흉내. %s 파라미터를 SQLite ?로 바꿔 실행하고 rtt만큼 지연.
+
+    multi-statement(";\\n"로 이어 붙인 mogrify 결과)는 문별 결과 집합을 nextset()으로 넘긴다.
+    """
+
+    def __init__(self, conn: "FakeConnection") -> None:
+        self.connection = conn
+        self._sets: list[list[dict]] = []
+
+    def __enter__(self) -> "FakeCursor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._sets = []
+
+    def mogrify(self, query: str, args=None) -> str:
+        values = iter(args or ())
+        return _PARAM.sub(lambda _: _literal(next(values)), query)
+
+    def execute(self, query: str, args=None) -> int:
+        from src import db, metrics
+
+        if self.connection.rtt:
+            time.sleep(self.connection.rtt)
+        start = time.perf_counter()
+        statements = query.split(";\n") if args is None else [query]
+        self._sets = []
+        for stmt in statements:
+            show = _SHOW_CREATE.match(stmt)
+            if show:
+                self._sets.append(self._show_create(show.group(1), show.group(2)))
+                continue
+            cur = self.connection.db.execute(_PARAM.sub("?", stmt), tuple(args or ()))
+            names = [d[0] for d in cur.description]
+            self._sets.append([dict(zip(names, r)) for r in cur.fetchall()])
+        elapsed = time.perf_counter() - start + self.connection.rtt
+        call = metrics.current_call()
+        if call is not None:
+            call.add(statements=1, execute=elapsed)
+        db._observe_query(elapsed)
+        return -1
+
+    def _show_create(self, schema: str, table: str) -> list[dict]:
+        """SHOW CREATE TABLE 흉내: COLUMNS로 컬럼 정의만 담은 문. 없는 테이블은 pymysql과 같은 1146 오류."""
+        import pymysql
+
+        rows = self.connection.db.execute(
+            "SELECT COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE FROM COLUMNS "
+            "WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ? ORDER BY ORDINAL_POSITION",
+            (schema, table),
+        ).fetchall()
+        if not rows:
+            raise pymysql.err.ProgrammingError(1146, f"Table '{schema}.{table}' doesn't exist")
+        body = ",\n".join(f"  `{c}` {t}{' NOT NULL' if n == 'NO' else ''}" for c, t, n in rows)
+        return [{"Table": table, "Create Table": f"CREATE TABLE `{table}` (\n{body}\n) ENGINE=InnoDB"}]
+
+    def _take(self, rows: list[dict]) -> list[dict]:
+        from src import metrics
+
+        call = metrics.current_call()
+        if call is not None:
+            call.add(rows=len(rows))
+        return rows
+
+    def fetchall(self) -> list[dict]:
+        rows, self._sets[0] = self._sets[0], []
+        return self._take(rows)
+
+    def fetchone(self) -> dict | None:
+        if not self._sets[0]:
+            return None
+        return self._take([self._sets[0].pop(0)])[0]
+
+    def nextset(self) -> bool | None:
+        self._sets.pop(0)
+        return True if self._sets else None
+
+
+class FakeConnection:
+    """pymysql Connection 흉내. 연결마다 SQLite 파일을 읽기 전용으로 information_schema로 연결.
+
+    SET SESSION 문은 실행하지 않고 session(변수명 -> 값 문자열)에 기록한다.
+    """
+
+    def __init__(self, path: str, rtt_ms: float = 0.0, server_version: str = "8.0.36") -> None:
+        self.rtt = rtt_ms / 1000.0
+        self._thread_id = next(_thread_ids)
+        self._server_version = server_version
+        self.open = True
+        self.session: dict[str, str] = {}
+        self.db = sqlite3.connect("file::memory:", uri=True, check_same_thread=False)
+        self.db.execute("ATTACH DATABASE ? AS information_schema", (f"file:{path}?mode=ro",))
+        self.db.create_function("CONCAT_WS", -1, lambda sep, *a: sep.join(str(x) for x in a if x is not None))
+        self.db.create_function("CRC32", 1, lambda x: zlib.crc32(str(x).encode("utf-8")))
+
+    def cursor(self) -> FakeCursor:
+        return FakeCursor(self)
+
+    def query(self, sql: str) -> int:
+        session = _SET_SESSION.match(sql)
+        if session is None:
+            raise NotImplementedError(sql)
+        self.session[session.group(1).lower()] = session.group(2)
+        return 0
+
+    def ping(self, reconnect: bool = True) -> None:
+        if self.rtt:
+            time.sleep(self.rtt)
+
+    def thread_id(self) -> int:
+        return self._thread_id
+
+    def get_server_info(self) -> str:
+        return self._server_version
+
+    def close(self) -> None:
+        self.open = False
+        self.db.close()
+
+
+def install_fake(path: str, rtt_ms: float = 0.0) -> None:
+    """src.db가 MySQL 대신 fake 파일에 연결하도록 교체 (벤치마크 전용)."""
+    from src import db
+
+    def connect(target=None, endpoint=None):
+        if rtt_ms:
+            # 연결 수립(TCP + 인증) 왕복을 대략 3 RTT로 흉내
+            time.sleep(3 * rtt_ms / 1000.0)
+        return FakeConnection(path, rtt_ms)
+
+    db._connect = connect
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="벤치마크용 합성 스키마 생성")
+    p.add_argument("target", choices=("fake", "mysql", "ddl"), help="fake: SQLite 파일, mysql: .env DB에 적재, ddl: 출력")
+    p.add_argument("--schema", default="bench", help="스키마명 (기본: bench)")
+    p.add_argument("--tables", type=int, default=100, help="테이블 수 (기본: 100, 10 ~ 20000 권장)")
+    p.add_argument("--columns", type=int, default=20, help="테이블당 기본 컬럼 수 (기본: 20)")
+    p.add_argument("--indexes", type=int, default=3, help="테이블당 일반 인덱스 수 (기본: 3)")
+    p.add_argument("--fks", type=int, default=2, help="테이블당 FK 수 (기본: 2)")
+    p.add_argument("--no-checks", action="store_true", help="CHECK 제약 생략 (MySQL 8.0.16 미만)")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--out", default="bench_fake.db", help="fake 출력 파일 (기본: bench_fake.db)")
+    p.add_argument("--drop", action="store_true", help="mysql: 기존 스키마 삭제 후 생성")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    tables = generate(args.tables, args.columns, args.indexes, args.fks, not args.no_checks, args.seed)
+    if args.target == "ddl":
+        for stmt in render_ddl(args.schema, tables, not args.no_checks):
+            print(stmt + ";\n")
+    elif args.target == "fake":
+        write_fake(args.out, args.schema, tables)
+        print(f"fake information_schema 생성: {args.out} ({args.schema}, 테이블 {len(tables)}개)", file=sys.stderr)
+    else:
+        load_mysql(args.schema, tables, not args.no_checks, args.drop)
+        print(f"MySQL 적재 완료: {args.schema} (테이블 {len(tables)}개)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
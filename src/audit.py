@@ -1,9 +1,15 @@
 """감사 로그: 도구 호출·성공/거부·사유 기록. 비밀/토큰 미포함."""
+import asyncio
+import atexit
 import json
+import os
+import queue
 import sys
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 from . import config
 
@@ -21,6 +27,9 @@ def _build_record(
     table_count: int | None = None,
     reason: str | None = None,
     client_id: str | None = None,
+    meta_client_id: str | None = None,
+    target: str | None = None,
+    breaker: str | None = None,
 ) -> dict[str, Any]:
     rec: dict[str, Any] = {
         "ts": _timestamp_utc(),
@@ -37,17 +46,217 @@ def _build_record(
         rec["reason"] = reason
     if client_id is not None:
         rec["client_id"] = client_id
+    if meta_client_id is not None:
+        rec["meta_client_id"] = meta_client_id
+    if target is not None:
+        rec["target"] = target
+    if breaker is not None:
+        rec["breaker"] = breaker
     return rec
 
 
-def _write_line(line: str) -> None:
-    if config.AUDIT_LOG_PATH:
+class _AuditWriter:
+    """감사 로그 기록기. 요청 스레드는 큐에 넣기만 하고, 전용 스레드가 묶어서 파일에 쓴다.
+
+    파일 핸들은 열어 둔 채 재사용하며, 크기(AUDIT_ROTATE_BYTES) 또는 시간(AUDIT_ROTATE_SECONDS) 기준으로
+    path → path.1 → path.2 … 순으로 회전한다. 큐가 가득 차면 AUDIT_QUEUE_FULL_POLICY에 따라
+    버리거나(drop, dropped 증가) 자리가 날 때까지 기다린다(block). block은 이벤트 루프를 멈추지 않도록
+    이벤트 루프 스레드(async Tool 처리)에서는 적용하지 않고 drop으로 처리한다.
+    AUDIT_LOG_PER_PROCESS면 프로세스마다 다른 파일(audit.<pid>.log)에 쓰고 회전한다.
+    """
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue[str] = queue.Queue(maxsize=max(1, config.AUDIT_QUEUE_SIZE))
+        self._lock = threading.Lock()  # 파일 핸들·회전 보호 (동기 모드에서도 사용)
+        self._file: TextIO | None = None
+        self._file_size = 0
+        self._opened_at = 0.0
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._pending = 0  # 큐에 넣었지만 아직 기록하지 않은 줄 수
+        self._drained = threading.Condition()
+        self._stats = {"enqueued": 0, "written": 0, "dropped": 0, "rotations": 0, "write_errors": 0}
+
+    # ---- 파일 처리 (쓰기 스레드 또는 동기 모드에서 _lock 보유 상태로 호출) ----
+
+    @staticmethod
+    def _path() -> Path:
         path = Path(config.AUDIT_LOG_PATH)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "a", encoding="utf-8") as f:
-            f.write(line + "\n")
-    else:
-        print(line, file=sys.stderr, flush=True)
+        if config.AUDIT_LOG_PER_PROCESS:
+            path = path.with_name(f"{path.stem}.{os.getpid()}{path.suffix}")
+        return path
+
+    def _open(self) -> TextIO:
+        if self._file is None:
+            path = self._path()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(path, "a", encoding="utf-8")
+            self._file_size = self._file.tell()
+            self._opened_at = time.time()
+        return self._file
+
+    def _should_rotate(self, incoming: int) -> bool:
+        if self._file_size == 0:
+            return False
+        if config.AUDIT_ROTATE_BYTES > 0 and self._file_size + incoming > config.AUDIT_ROTATE_BYTES:
+            return True
+        return config.AUDIT_ROTATE_SECONDS > 0 and time.time() - self._opened_at >= config.AUDIT_ROTATE_SECONDS
+
+    def _rotate(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        path = self._path()
+        backups = max(0, config.AUDIT_ROTATE_BACKUPS)
+        if backups == 0:
+            path.unlink(missing_ok=True)
+        else:
+            path.with_name(f"{path.name}.{backups}").unlink(missing_ok=True)
+            for i in range(backups - 1, 0, -1):
+                src = path.with_name(f"{path.name}.{i}")
+                if src.exists():
+                    src.replace(path.with_name(f"{path.name}.{i + 1}"))
+            if path.exists():
+                path.replace(path.with_name(f"{path.name}.1"))
+        self._stats["rotations"] += 1
+
+    def _write_batch(self, lines: list[str]) -> None:
+        data = "".join(line + "\n" for line in lines)
+        with self._lock:
+            try:
+                if not config.AUDIT_LOG_PATH:
+                    sys.stderr.write(data)
+                    sys.stderr.flush()
+                else:
+                    size = len(data.encode("utf-8"))
+                    self._open()
+                    if self._should_rotate(size):
+                        self._rotate()
+                    f = self._open()
+                    f.write(data)
+                    f.flush()
+                    self._file_size += size
+                self._stats["written"] += len(lines)
+            except OSError:
+                # 감사 로그 실패가 Tool 처리를 막지 않도록 기록만 하고 계속
+                self._stats["write_errors"] += len(lines)
+                if self._file is not None:
+                    try:
+                        self._file.close()
+                    except OSError:
+                        pass
+                    self._file = None
+
+    # ---- 쓰기 스레드 ----
+
+    def _run(self) -> None:
+        batch_size = max(1, config.AUDIT_BATCH_SIZE)
+        interval = max(0.01, config.AUDIT_FLUSH_INTERVAL_MS / 1000)
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                first = self._queue.get(timeout=interval)
+            except queue.Empty:
+                continue
+            lines = [first]
+            deadline = time.monotonic() + interval
+            while len(lines) < batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    lines.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_batch(lines)
+            with self._drained:
+                self._pending -= len(lines)
+                self._drained.notify_all()
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                    self._thread.start()
+                    atexit.register(self.close)
+
+    # ---- 공개 메서드 ----
+
+    def submit(self, line: str) -> None:
+        if not config.AUDIT_ASYNC:
+            self._write_batch([line])
+            return
+        self._ensure_started()
+        with self._drained:
+            self._pending += 1
+        try:
+            try:
+                self._queue.put_nowait(line)
+            except queue.Full:
+                if config.AUDIT_QUEUE_FULL_POLICY != "block" or _on_event_loop():
+                    raise
+                self._queue.put(line)
+        except queue.Full:
+            with self._drained:
+                self._pending -= 1
+            with self._lock:
+                self._stats["dropped"] += 1
+            return
+        with self._lock:
+            self._stats["enqueued"] += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """이미 넣은 로그가 모두 기록될 때까지 기다린다 (쓰기 스레드는 계속 동작). 시간 안에 끝났으면 True."""
+        deadline = time.monotonic() + timeout
+        with self._drained:
+            while self._pending > 0 and self._thread is not None and self._thread.is_alive():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._drained.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """남은 로그를 모두 쓰고 쓰기 스레드를 멈춘 뒤 파일을 닫는다 (프로세스 종료 시 자동 호출)."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout)
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"queued": self._queue.qsize(), **self._stats}
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+_writer = _AuditWriter()
+
+
+def _write_line(line: str) -> None:
+    _writer.submit(line)
+
+
+def audit_stats() -> dict[str, Any]:
+    """감사 로그 기록기 통계 (대기 중, 기록, 버림, 회전 횟수 등)."""
+    return _writer.stats()
+
+
+def flush(timeout: float = 5.0) -> bool:
+    """대기 중인 감사 로그를 모두 기록할 때까지 기다린다. 이후에도 계속 기록할 수 있다."""
+    return _writer.flush(timeout)
+
+
+def close(timeout: float = 5.0) -> None:
+    """대기 중인 감사 로그를 모두 기록하고 쓰기 스레드와 파일을 닫는다. 이후 기록은 쓰이지 않는다."""
+    _writer.close(timeout)
 
 
 def log(
@@ -59,6 +268,9 @@ def log(
     table_count: int | None = None,
     reason: str | None = None,
     client_id: str | None = None,
+    meta_client_id: str | None = None,
+    target: str | None = None,
+    breaker: str | None = None,
 ) -> None:
     """감사 로그 1건 기록. AUDIT_ENABLED가 False면 무시."""
     if not config.AUDIT_ENABLED:
@@ -71,6 +283,9 @@ def log(
         table_count=table_count,
         reason=reason,
         client_id=client_id,
+        meta_client_id=meta_client_id,
+        target=target,
+        breaker=breaker,
     )
     if config.AUDIT_FORMAT == "json":
         line = json.dumps(rec, ensure_ascii=False)
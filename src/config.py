@@ -19,9 +19,35 @@ def _int(key: str, default: int) -> int:
         return default
 
 
+def _float(key: str, default: float) -> float:
+    raw = os.getenv(key)
+    if raw is None or raw.strip() == "":
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def _costs(key: str) -> dict[str, float]:
+    """"tool=비용,tool=비용" 형식. 잘못된 항목은 무시."""
+    out: dict[str, float] = {}
+    for item in os.getenv(key, "").split(","):
+        name, sep, value = item.partition("=")
+        if not sep or not name.strip():
+            continue
+        try:
+            out[name.strip()] = max(0.0, float(value))
+        except ValueError:
+            continue
+    return out
+
+
 def _bool(key: str, default: bool = False) -> bool:
     raw = os.getenv(key, "").strip().lower()
-    if raw in ("", "0", "false", "no"):
+    if raw == "":
+        return default
+    if raw in ("0", "false", "no"):
         return False
     if raw in ("1", "true", "yes"):
         return True
@@ -37,25 +63,145 @@ DB_NAME = os.getenv("DB_NAME", "")
 DB_SSL = _bool("DB_SSL", False)
 DB_CONNECT_TIMEOUT = _int("DB_CONNECT_TIMEOUT", 10)
 DB_QUERY_TIMEOUT = _int("DB_QUERY_TIMEOUT", 30)
+# 테이블 메타데이터 SELECT 3개를 multi-statement 한 번(왕복 1회)으로 전송. 연결에 CLIENT.MULTI_STATEMENTS 플래그 사용.
+DB_MULTI_STATEMENTS = _bool("DB_MULTI_STATEMENTS", False)
+
+# 여러 DB 대상(샤드 등). JSON 파일 경로. 비어 있으면 위 DB_* 값으로 대상 1개(default)만 사용.
+DB_TARGETS_FILE = os.getenv("DB_TARGETS_FILE", "").strip()
+FANOUT_TIMEOUT = max(0.0, _float("FANOUT_TIMEOUT", 10.0))  # 초. target="*" 조회 시 대상별 응답 대기 상한. 0 = 무제한
+# 같은 데이터를 가진 읽기 엔드포인트 "host[:port]" 쉼표 구분 (레플리카 등). 비어 있으면 DB_HOST:DB_PORT 하나.
+DB_ENDPOINTS: tuple[str, ...] = tuple(e.strip() for e in os.getenv("DB_ENDPOINTS", "").split(",") if e.strip())
+# 엔드포인트 선택: 지연 EWMA × (1 + 오류율 × ERROR_PENALTY)가 가장 낮은 곳. EXPLORE_RATE 비율은 무작위로 골라 지연을 갱신
+DB_ROUTING_EWMA_ALPHA = min(1.0, max(0.01, _float("DB_ROUTING_EWMA_ALPHA", 0.2)))
+DB_ROUTING_ERROR_PENALTY = max(0.0, _float("DB_ROUTING_ERROR_PENALTY", 10.0))
+DB_ROUTING_EXPLORE_RATE = min(1.0, max(0.0, _float("DB_ROUTING_EXPLORE_RATE", 0.05)))
+DB_ENDPOINT_COOLDOWN = max(0.0, _float("DB_ENDPOINT_COOLDOWN", 10.0))  # 초. 연결 실패·타임아웃 후 제외 시간
+DB_FAILOVER_RETRIES = max(0, _int("DB_FAILOVER_RETRIES", 1))  # 연결 실패·타임아웃 시 다른 엔드포인트로 재시도 횟수
+# 대상별 회로 차단기: 연결 실패·타임아웃이 FAILURE_THRESHOLD번 이어지면 OPEN_SECONDS 동안 DB에 가지 않고 바로 거절
+DB_BREAKER_ENABLED = _bool("DB_BREAKER_ENABLED", True)
+DB_BREAKER_FAILURE_THRESHOLD = max(1, _int("DB_BREAKER_FAILURE_THRESHOLD", 5))
+DB_BREAKER_OPEN_SECONDS = max(0.0, _float("DB_BREAKER_OPEN_SECONDS", 30.0))
+DB_BREAKER_HALF_OPEN_PROBES = max(1, _int("DB_BREAKER_HALF_OPEN_PROBES", 1))  # OPEN_SECONDS 후 동시에 시험할 호출 수
+# 적응형 쿼리 타임아웃: 최근 WINDOW번 연결 사용 시간의 PERCENTILE 분위수 × MULTIPLIER (MIN ~ DB_QUERY_TIMEOUT 사이)
+DB_ADAPTIVE_TIMEOUT = _bool("DB_ADAPTIVE_TIMEOUT", False)
+DB_ADAPTIVE_TIMEOUT_PERCENTILE = min(1.0, max(0.5, _float("DB_ADAPTIVE_TIMEOUT_PERCENTILE", 0.99)))
+DB_ADAPTIVE_TIMEOUT_MULTIPLIER = max(1.0, _float("DB_ADAPTIVE_TIMEOUT_MULTIPLIER", 5.0))
+DB_ADAPTIVE_TIMEOUT_MIN = max(0.1, _float("DB_ADAPTIVE_TIMEOUT_MIN", 2.0))  # 초
+DB_ADAPTIVE_TIMEOUT_WINDOW = max(10, _int("DB_ADAPTIVE_TIMEOUT_WINDOW", 500))
+DB_ADAPTIVE_TIMEOUT_MIN_SAMPLES = max(1, _int("DB_ADAPTIVE_TIMEOUT_MIN_SAMPLES", 50))  # 이보다 적으면 DB_QUERY_TIMEOUT
+
+# 커넥션 풀. DB_POOL_MAX_SIZE가 0이면 풀 미사용(호출마다 연결/해제).
+DB_POOL_MAX_SIZE = max(0, _int("DB_POOL_MAX_SIZE", 10))
+DB_POOL_MIN_SIZE = max(0, _int("DB_POOL_MIN_SIZE", 1))  # 유휴 정리 시에도 유지할 연결 수
+DB_POOL_IDLE_TIMEOUT = _int("DB_POOL_IDLE_TIMEOUT", 300)  # 초. 0 = 유휴 정리 안 함
+DB_POOL_MAX_LIFETIME = _int("DB_POOL_MAX_LIFETIME", 1800)  # 초. 0 = 수명 제한 없음
+DB_POOL_WAIT_TIMEOUT = _int("DB_POOL_WAIT_TIMEOUT", 10)  # 초. 풀 소진 시 대기 상한. 0 = 무한 대기
+DB_POOL_PING_INTERVAL = _int("DB_POOL_PING_INTERVAL", 0)  # 초. 이보다 오래 쉰 연결만 ping. 0 = 항상 ping
 
-# 처리량 제한: 분당 최대 Tool 호출 횟수. 0 또는 음수면 제한 없음. 미설정 시 60.
+# 처리량 제한: 클라이언트별 분당 최대 Tool 호출 횟수(토큰 버킷 충전 속도). 0 또는 음수면 제한 없음. 미설정 시 60.
 RATE_LIMIT_RPM = _int("RATE_LIMIT_RPM", 60)
 if RATE_LIMIT_RPM < 0:
     RATE_LIMIT_RPM = 0  # 0 = 제한 없음으로 통일
+RATE_LIMIT_BURST = max(0, _int("RATE_LIMIT_BURST", 0))  # 버킷 용량(순간 최대). 0 = RATE_LIMIT_RPM
+RATE_LIMIT_TOOL_COSTS = _costs("RATE_LIMIT_TOOL_COSTS")  # 예: get_schema_overview=2. 미지정 Tool은 1
+RATE_LIMIT_TABLE_COST = max(0.0, _float("RATE_LIMIT_TABLE_COST", 0.1))  # 여러 테이블 조회 시 추가 테이블당 비용
+RATE_LIMIT_MAX_CLIENTS = _int("RATE_LIMIT_MAX_CLIENTS", 10000)  # 보관할 클라이언트 버킷 수
+RATE_LIMIT_IDLE_SECONDS = _int("RATE_LIMIT_IDLE_SECONDS", 600)  # 이 시간 동안 안 쓴 버킷 정리
 
 # 리소스 보호
 MAX_TABLES_PER_REQUEST = _int("MAX_TABLES_PER_REQUEST", 50)
 MAX_IDENTIFIER_LENGTH = _int("MAX_IDENTIFIER_LENGTH", 64)
 MAX_LIST_TABLES_RESULT = _int("MAX_LIST_TABLES_RESULT", 500)  # 0 = 제한 없음
-MAX_CONCURRENT_REQUESTS = _int("MAX_CONCURRENT_REQUESTS", 0)  # 0 = 제한 없음
+MAX_CONCURRENT_REQUESTS = _int("MAX_CONCURRENT_REQUESTS", 0)  # 0 = DB 워커 수만큼
+REQUEST_QUEUE_TIMEOUT = _int("REQUEST_QUEUE_TIMEOUT", 30)  # 초. 실행 슬롯 대기 상한. 0 = 무한 대기
+DB_EXECUTOR_WORKERS = max(0, _int("DB_EXECUTOR_WORKERS", 0))  # DB 작업 스레드 수. 0 = DB_POOL_MAX_SIZE
+
+# 테이블·컬럼 검색 색인 (search_tables / search_columns)
+SEARCH_INDEX_MAX_BYTES = max(0, _int("SEARCH_INDEX_MAX_BYTES", 256 * 1024 * 1024))  # 추정 메모리 상한. 0 = 제한 없음
+SEARCH_INDEX_REFRESH_INTERVAL = _int("SEARCH_INDEX_REFRESH_INTERVAL", 30)  # 초. 스키마 지문 재확인 최소 간격
+SEARCH_MAX_RESULTS = max(1, _int("SEARCH_MAX_RESULTS", 200))  # limit 상한
+
+# FK 그래프 인덱스 (get_table_relations / find_join_path / get_load_order)
+FK_GRAPH_MAX_SCHEMAS = max(1, _int("FK_GRAPH_MAX_SCHEMAS", 32))  # 메모리에 보관할 스키마 그래프 수 (LRU)
+FK_GRAPH_MAX_DEPTH = max(1, _int("FK_GRAPH_MAX_DEPTH", 6))  # depth·max_hops 상한
+
+# 스키마 변경 비교(diff_schema)와 변경 감시(schema://{target}/{schema}/changes 리소스 구독)
+SCHEMA_DIFF_MAX_BASELINES = max(1, _int("SCHEMA_DIFF_MAX_BASELINES", 32))  # 보관할 기준점 수 (LRU)
+SCHEMA_WATCH_INTERVAL = max(0.0, _float("SCHEMA_WATCH_INTERVAL", 60.0))  # 초. 감시 비교 주기. 0 = 감시 안 함
+# 구독이 없어도 서버 시작 시부터 감시할 스키마 (기본 대상, 쉼표 구분)
+SCHEMA_WATCH_SCHEMAS: tuple[str, ...] = tuple(
+    s.strip() for s in os.getenv("SCHEMA_WATCH_SCHEMAS", "").split(",") if s.strip()
+)
+
+# 메타데이터 캐시 (프로세스 내 LRU/TTL, 스키마 지문으로 무효화)
+METADATA_CACHE_ENABLED = _bool("METADATA_CACHE_ENABLED", True)
+METADATA_CACHE_MAX_BYTES = _int("METADATA_CACHE_MAX_BYTES", 64 * 1024 * 1024)  # 0 = 제한 없음
+METADATA_CACHE_TTL = _int("METADATA_CACHE_TTL", 3600)  # 초. 0 = 만료 없음(지문 변경 시에만 무효화)
+METADATA_CACHE_FINGERPRINT_INTERVAL = _int("METADATA_CACHE_FINGERPRINT_INTERVAL", 30)  # 초
+# 지문에 TABLES뿐 아니라 COLUMNS·STATISTICS·제약 뷰 체크섬도 넣음. 테이블을 다시 만들지 않는 ALTER(INSTANT ADD COLUMN,
+# 코멘트·FK 규칙 변경 등)도 바로 반영하지만, 확인할 때마다 스키마 전체 정의 뷰를 스캔한다
+METADATA_CACHE_DEEP_FINGERPRINT = _bool("METADATA_CACHE_DEEP_FINGERPRINT", False)
+
+# 시작 시 캐시 미리 채우기(prewarm)와 백그라운드 갱신. SCHEMAS가 비어 있으면 ALLOWED_SCHEMAS(없으면 전체 사용자 스키마)
+PREWARM_ENABLED = _bool("PREWARM_ENABLED", False)
+PREWARM_SCHEMAS: tuple[str, ...] = tuple(s.strip() for s in os.getenv("PREWARM_SCHEMAS", "").split(",") if s.strip())
+PREWARM_REFRESH_INTERVAL = max(0.0, _float("PREWARM_REFRESH_INTERVAL", 300.0))  # 초. 지문 확인 주기. 0 = 갱신 안 함
+PREWARM_REFRESH_JITTER = min(1.0, max(0.0, _float("PREWARM_REFRESH_JITTER", 0.2)))  # 주기에 ±비율만큼 무작위
+PREWARM_CONCURRENCY = max(1, _int("PREWARM_CONCURRENCY", 1))  # 동시에 적재하는 스키마 수
+
+# 동시에 들어온 같은 메타데이터 조회를 DB 조회 1번으로 합침 (결과는 보관하지 않음)
+SINGLEFLIGHT_ENABLED = _bool("SINGLEFLIGHT_ENABLED", True)
+
+# get_tables_metadata 병렬 조회: CHUNK_SIZE개씩 나눠 최대 PARALLELISM개 연결에서 동시 조회. 1 = 순차
+METADATA_FETCH_PARALLELISM = max(1, _int("METADATA_FETCH_PARALLELISM", 1))
+METADATA_FETCH_CHUNK_SIZE = max(1, _int("METADATA_FETCH_CHUNK_SIZE", 25))
+
+# get_create_table 문 출처. show: SHOW CREATE TABLE 일괄 조회 | render: 테이블 메타데이터로 생성 (SHOW 권한이 없을 때 등)
+CREATE_TABLE_SOURCE = os.getenv("CREATE_TABLE_SOURCE", "show").strip().lower()
+if CREATE_TABLE_SOURCE not in ("show", "render"):
+    CREATE_TABLE_SOURCE = "show"
+
+# 응답 JSON 출력. STYLE: pretty(들여쓰기) | compact(공백 없음). BACKEND: auto | json | orjson
+OUTPUT_JSON_STYLE = os.getenv("OUTPUT_JSON_STYLE", "pretty").strip().lower()
+if OUTPUT_JSON_STYLE not in ("pretty", "compact"):
+    OUTPUT_JSON_STYLE = "pretty"
+OUTPUT_JSON_BACKEND = os.getenv("OUTPUT_JSON_BACKEND", "auto").strip().lower()
+if OUTPUT_JSON_BACKEND not in ("auto", "json", "orjson"):
+    OUTPUT_JSON_BACKEND = "auto"
+# columns 배열을 {"fields": [...], "rows": [[...]]} 열 지향 형식으로 출력
+OUTPUT_COLUMNAR = _bool("OUTPUT_COLUMNAR", False)
+
+# 오프라인 스냅샷 모드: 경로를 지정하면 DB 대신 스냅샷 파일로 응답. 파일이 교체되면 RELOAD_INTERVAL 내에 반영
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "").strip()
+SNAPSHOT_RELOAD_INTERVAL = _int("SNAPSHOT_RELOAD_INTERVAL", 5)  # 초. 0 = 교체 감지 안 함
+
+# 여러 워커 프로세스(--workers)가 함께 쓰는 상태(처리량 제한 버킷·메타데이터 캐시 L2) SQLite 파일.
+# 비어 있으면 사용 안 함. --workers 2 이상이면 지정하지 않아도 임시 파일을 만들어 사용
+SHARED_STATE_PATH = os.getenv("SHARED_STATE_PATH", "").strip()
+SHARED_CACHE_MAX_BYTES = max(0, _int("SHARED_CACHE_MAX_BYTES", 256 * 1024 * 1024))  # 0 = 제한 없음
+
+# 내장 지표 (HTTP 모드 /metrics, server_stats Tool)
+METRICS_ENABLED = _bool("METRICS_ENABLED", True)
 
 # 입력 검증: 허용 스키마 화이트리스트. 비어 있으면 모든 스키마 허용.
 _allowed = os.getenv("ALLOWED_SCHEMAS", "").strip()
 ALLOWED_SCHEMAS: tuple[str, ...] = tuple(s.strip() for s in _allowed.split(",") if s.strip())
 
 # 감사 로그
-AUDIT_ENABLED = _bool("AUDIT_ENABLED", True)
+AUDIT_ENABLED = _bool("AUDIT_ENABLED", False)  # 미설정 시 끔 (이전 버전과 같음)
 AUDIT_LOG_PATH = os.getenv("AUDIT_LOG_PATH", "").strip()  # 비어 있으면 stderr
 AUDIT_FORMAT = os.getenv("AUDIT_FORMAT", "json").strip().lower()
 if AUDIT_FORMAT not in ("json",):
     AUDIT_FORMAT = "json"
+AUDIT_ASYNC = _bool("AUDIT_ASYNC", True)  # 전용 스레드에서 묶어 쓰기. false면 호출 스레드에서 바로 기록
+AUDIT_QUEUE_SIZE = _int("AUDIT_QUEUE_SIZE", 10000)
+AUDIT_QUEUE_FULL_POLICY = os.getenv("AUDIT_QUEUE_FULL_POLICY", "drop").strip().lower()  # drop | block
+if AUDIT_QUEUE_FULL_POLICY not in ("drop", "block"):
+    AUDIT_QUEUE_FULL_POLICY = "drop"
+AUDIT_BATCH_SIZE = _int("AUDIT_BATCH_SIZE", 256)  # 한 번에 쓰는 최대 줄 수
+AUDIT_FLUSH_INTERVAL_MS = _int("AUDIT_FLUSH_INTERVAL_MS", 200)  # 묶음 대기 최대 시간
+AUDIT_ROTATE_BYTES = _int("AUDIT_ROTATE_BYTES", 0)  # 0 = 크기 기준 회전 안 함
+AUDIT_ROTATE_SECONDS = _int("AUDIT_ROTATE_SECONDS", 0)  # 0 = 시간 기준 회전 안 함 (예: 86400 = 하루)
+AUDIT_ROTATE_BACKUPS = _int("AUDIT_ROTATE_BACKUPS", 5)  # 보관할 회전 파일 수
+# 프로세스별 파일(audit.log → audit.<pid>.log). --workers에서는 자동으로 켜짐 (워커끼리 같은 파일을 회전하지 않도록)
+AUDIT_LOG_PER_PROCESS = _bool("AUDIT_LOG_PER_PROCESS", False)
@@ -1,45 +1,820 @@
-"""MySQL 읽기 전용 연결. SELECT만 사용."""
+"""MySQL 읽기 전용 연결. SELECT만 사용. 커넥션 풀로 연결을 재사용.
+
+대상에 읽기 엔드포인트가 여럿이면 지연·오류율 EWMA로 고르고, 연결 실패·타임아웃은 다른 엔드포인트에서 다시 시도한다(failover).
+연결 실패가 이어지면 대상의 회로 차단기가 열려 DB를 기다리지 않고 바로 거절한다.
+"""
 import contextlib
-from typing import Generator
+import contextvars
+import functools
+import math
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Generator, Iterable, TypeVar
 
 import pymysql
+from pymysql.constants import CLIENT
 from pymysql.cursors import DictCursor
 
-from . import config
+from . import config, metrics, targets
+from .targets import Target
 
 
 class DBConnectionError(Exception):
-    """DB 연결/쿼리 실패 시 사용."""
-    pass
+    """DB 연결/쿼리 실패 시 사용. retryable이면 다른 엔드포인트에서 다시 시도해도 되는 오류(연결 실패·타임아웃·끊김)."""
+
+    def __init__(self, message: str, *, endpoint: str | None = None, retryable: bool = False) -> None:
+        super().__init__(message)
+        self.endpoint = endpoint
+        self.retryable = retryable
+
+
+class CircuitOpenError(DBConnectionError):
+    """회로 차단기가 열려 DB에 연결하지 않고 거절. retry_after는 다시 시도해 볼 만한 시점까지 남은 초."""
+
+    def __init__(self, message: str, *, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _InstrumentedCursor(DictCursor):
+    """DictCursor + 현재 Tool 호출의 SQL 문 수·행 수·execute/fetch 시간 집계.
+
+    성공한 execute 시간은 적응형 타임아웃 표본(_observe_query)으로도 쓴다. 버퍼 커서라 결과 행 수신까지 execute에 포함된다.
+    """
+
+    def execute(self, query: str, args: Any = None) -> int:
+        call = metrics.current_call()
+        start = time.perf_counter()
+        try:
+            result = super().execute(query, args)
+        finally:
+            if call is not None:
+                call.add(statements=1, execute=time.perf_counter() - start)
+        _observe_query(time.perf_counter() - start)
+        return result
+
+    def fetchone(self) -> Any:
+        call = metrics.current_call()
+        if call is None:
+            return super().fetchone()
+        start = time.perf_counter()
+        row = super().fetchone()
+        call.add(rows=0 if row is None else 1, fetch=time.perf_counter() - start)
+        return row
+
+    def fetchall(self) -> Any:
+        call = metrics.current_call()
+        if call is None:
+            return super().fetchall()
+        start = time.perf_counter()
+        rows = super().fetchall()
+        call.add(rows=len(rows), fetch=time.perf_counter() - start)
+        return rows
+
+
+def _connect(target: Target, endpoint: "Endpoint") -> pymysql.connections.Connection:
+    """target의 endpoint에 새 MySQL 연결 생성. 풀 사용 여부와 무관하게 동일한 옵션 사용."""
+    return pymysql.connect(
+        host=endpoint.host,
+        port=endpoint.port,
+        user=target.user,
+        password=target.password,
+        database=target.database if target.database else None,
+        charset="utf8mb4",
+        connect_timeout=target.connect_timeout,
+        read_timeout=target.query_timeout,
+        write_timeout=target.query_timeout,
+        ssl=target.ssl,
+        # 재사용되는 연결이 첫 SELECT 시점의 스냅샷에 묶이지 않도록 autocommit 사용
+        autocommit=True,
+        cursorclass=_InstrumentedCursor,
+        client_flag=CLIENT.MULTI_STATEMENTS if config.DB_MULTI_STATEMENTS else 0,
+    )
+
+
+def _close_quietly(conn: pymysql.connections.Connection) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+class _PooledConnection:
+    """풀에 보관되는 연결과 생성/마지막 사용 시각, 세션에 설정한 적응형 타임아웃(초, 미설정이면 None)."""
+    __slots__ = ("conn", "created_at", "last_used_at", "session_timeout")
+
+    def __init__(self, conn: pymysql.connections.Connection) -> None:
+        now = time.monotonic()
+        self.conn = conn
+        self.created_at = now
+        self.last_used_at = now
+        self.session_timeout: float | None = None
+
+
+class Endpoint:
+    """읽기 엔드포인트 1개의 상태: 지연·오류율 EWMA, 연결 실패 후 제외 시각. connect_timeout은 소속 대상의 값(초)."""
+    __slots__ = (
+        "host", "port", "name", "connect_timeout", "latency", "error_rate", "down_until", "probe", "routed", "failures"
+    )
+
+    def __init__(self, host: str, port: int, connect_timeout: float) -> None:
+        self.host = host
+        self.port = port
+        self.name = f"{host}:{port}"
+        self.connect_timeout = connect_timeout
+        self.latency: float | None = None  # 초. 아직 측정 전이면 None (먼저 시도)
+        self.error_rate = 0.0
+        self.down_until = 0.0
+        self.probe = False  # 제외가 끝나면 한 번 먼저 시험
+        self.routed = 0
+        self.failures = 0
+
+    def score(self) -> float:
+        latency = self.latency
+        if latency is None:
+            # 한 번도 성공하지 못했으면 실패 전까지는 가장 먼저, 실패 후에는 연결 타임아웃만큼 느린 것으로 본다
+            latency = float(self.connect_timeout) if self.failures else 0.0
+        return latency * (1.0 + self.error_rate * config.DB_ROUTING_ERROR_PENALTY)
+
+
+class Router:
+    """대상 1개의 엔드포인트 선택. 제외 중이 아닌 곳 중 점수(지연 EWMA × (1 + 오류율 × 벌점))가 가장 낮은 곳.
+
+    DB_ROUTING_EXPLORE_RATE 비율만큼은 무작위로 골라, 한동안 안 쓴 엔드포인트의 지연도 갱신한다.
+    """
+
+    def __init__(self, target: Target) -> None:
+        self.endpoints = [Endpoint(host, port, target.connect_timeout) for host, port in target.endpoints]
+        self._lock = threading.Lock()
+        self._stats = {"retries": 0, "explorations": 0, "all_down": 0}
+
+    def choose(self, excluded: Iterable[str] = ()) -> Endpoint:
+        """이번 연결에 쓸 엔드포인트. excluded(이번 호출에서 이미 실패한 곳)는 다른 곳이 있으면 피한다."""
+        now = time.monotonic()
+        with self._lock:
+            candidates = [e for e in self.endpoints if e.name not in excluded] or self.endpoints
+            up = [e for e in candidates if e.down_until <= now]
+            if not up:
+                # 모두 제외 중이면 가장 먼저 풀리는 곳
+                self._stats["all_down"] += 1
+                chosen = min(candidates, key=lambda e: e.down_until)
+            elif any(e.probe for e in up):
+                chosen = next(e for e in up if e.probe)
+                chosen.probe = False
+            elif len(up) > 1 and random.random() < config.DB_ROUTING_EXPLORE_RATE:
+                self._stats["explorations"] += 1
+                chosen = random.choice(up)
+            else:
+                chosen = min(up, key=Endpoint.score)
+            chosen.routed += 1
+            return chosen
+
+    def observe(self, endpoint: Endpoint, seconds: float | None) -> None:
+        """연결 사용 1회 결과. seconds가 None이면 실패(연결 실패·타임아웃·끊김): 오류율을 올리고 잠시 제외."""
+        alpha = config.DB_ROUTING_EWMA_ALPHA
+        with self._lock:
+            if seconds is None:
+                endpoint.error_rate = (1 - alpha) * endpoint.error_rate + alpha
+                endpoint.failures += 1
+                if len(self.endpoints) > 1:
+                    endpoint.down_until = time.monotonic() + config.DB_ENDPOINT_COOLDOWN
+                    endpoint.probe = True
+                return
+            endpoint.error_rate *= 1 - alpha
+            if endpoint.latency is None:
+                endpoint.latency = seconds
+            else:
+                endpoint.latency = (1 - alpha) * endpoint.latency + alpha * seconds
+
+    def has_alternative(self, excluded: Iterable[str]) -> bool:
+        return any(e.name not in excluded for e in self.endpoints)
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self._stats["retries"] += 1
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            endpoints = {
+                e.name: {
+                    "latency_ms": None if e.latency is None else round(e.latency * 1000, 3),
+                    "error_rate": round(e.error_rate, 4),
+                    "score": round(e.score() * 1000, 3),
+                    "down": e.down_until > now,
+                    "routed": e.routed,
+                    "failures": e.failures,
+                }
+                for e in self.endpoints
+            }
+            return {
+                "endpoints": len(self.endpoints),
+                "down": sum(1 for e in self.endpoints if e.down_until > now),
+                **self._stats,
+                "routes": endpoints,
+            }
+
+
+class CircuitBreaker:
+    """대상 1개의 회로 차단기. closed → (연결 실패 failure_threshold번 연속) open → (open_seconds 후) half_open.
+
+    open이면 연결을 시도하지 않고 CircuitOpenError. half_open에서는 시험 호출 half_open_probes개만 통과시키고,
+    시험이 성공하면 closed, 실패하면 다시 open. 쿼리 오류(문법 등)는 서버가 응답한 것이므로 성공으로 본다.
+    """
+
+    def __init__(self, name: str, *, failure_threshold: int, open_seconds: float, half_open_probes: int) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0  # 연속 실패
+        self._opened_at = 0.0
+        self._probes = 0  # 진행 중인 시험 호출
+        self._stats = {"opened": 0, "rejected": 0, "probes": 0}
+
+    def _state_locked(self, now: float) -> str:
+        if self._state == "open" and now - self._opened_at >= self.open_seconds:
+            self._state = "half_open"
+        return self._state
+
+    def _reject_locked(self, now: float) -> CircuitOpenError:
+        self._stats["rejected"] += 1
+        retry_after = max(0.0, self._opened_at + self.open_seconds - now)
+        return CircuitOpenError(
+            f"DB 회로 차단 중 (대상 {self.name}, 연속 연결 실패 {self._failures}회). "
+            f"약 {math.ceil(retry_after)}초 후 다시 시도하세요.",
+            retry_after=round(retry_after, 3),
+        )
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state_locked(time.monotonic())
+
+    def check(self) -> None:
+        """막혀 있으면 CircuitOpenError. 시험 슬롯은 쓰지 않음 (실행 대기열에 들어가기 전 빠른 거절용)."""
+        now = time.monotonic()
+        with self._lock:
+            state = self._state_locked(now)
+            if state == "open" or (state == "half_open" and self._probes >= self.half_open_probes):
+                raise self._reject_locked(now)
+
+    def acquire(self) -> bool:
+        """연결 전 호출. 통과하면 이번 호출이 half_open 시험인지 반환, 막혀 있으면 CircuitOpenError."""
+        now = time.monotonic()
+        with self._lock:
+            state = self._state_locked(now)
+            if state == "closed":
+                return False
+            if state == "half_open" and self._probes < self.half_open_probes:
+                self._probes += 1
+                self._stats["probes"] += 1
+                return True
+            raise self._reject_locked(now)
+
+    def record(self, healthy: bool | None, probe: bool) -> None:
+        """호출 1건 결과. healthy가 None이면 판단 불가(풀 대기 초과·중단 등): 시험 슬롯만 반환."""
+        with self._lock:
+            if probe:
+                self._probes -= 1
+            if healthy is None:
+                return
+            if healthy:
+                self._failures = 0
+                if probe and self._state == "half_open":
+                    self._state = "closed"
+                return
+            self._failures += 1
+            if (probe and self._state == "half_open") or (
+                self._state == "closed" and self._failures >= self.failure_threshold
+            ):
+                self._state = "open"
+                self._opened_at = time.monotonic()
+                self._stats["opened"] += 1
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            state = self._state_locked(now)
+            return {
+                "state": state,
+                "open": int(state != "closed"),
+                "consecutive_failures": self._failures,
+                **self._stats,
+            }
+
+
+class LatencyWindow:
+    """대상 1개의 최근 쿼리 실행 시간(성공한 execute만). 적응형 쿼리 타임아웃 = 분위수 × 배수를 [하한, 상한]으로 자른 값."""
+
+    def __init__(self, size: int) -> None:
+        self._lock = threading.Lock()
+        self._samples: deque[float] = deque(maxlen=size)
+        self._sorted: list[float] | None = None  # 분위수 계산용 (표본이 바뀌면 다시 정렬)
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self._sorted = None
+
+    def _quantile_locked(self, q: float) -> float | None:
+        if not self._samples:
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self._samples)
+        return self._sorted[min(len(self._sorted) - 1, int(q * len(self._sorted)))]
+
+    def timeout(self, ceiling: float) -> float:
+        """현재 적응형 타임아웃(초). 표본이 DB_ADAPTIVE_TIMEOUT_MIN_SAMPLES보다 적으면 ceiling."""
+        with self._lock:
+            if len(self._samples) < config.DB_ADAPTIVE_TIMEOUT_MIN_SAMPLES:
+                return ceiling
+            value = self._quantile_locked(config.DB_ADAPTIVE_TIMEOUT_PERCENTILE) * config.DB_ADAPTIVE_TIMEOUT_MULTIPLIER
+        return min(ceiling, max(config.DB_ADAPTIVE_TIMEOUT_MIN, value))
+
+    def stats(self, ceiling: float) -> dict[str, Any]:
+        timeout = self.timeout(ceiling)
+        with self._lock:
+            p50, p99 = self._quantile_locked(0.5), self._quantile_locked(0.99)
+            return {
+                "samples": len(self._samples),
+                "p50_ms": None if p50 is None else round(p50 * 1000, 3),
+                "p99_ms": None if p99 is None else round(p99 * 1000, 3),
+                "timeout_seconds": round(timeout, 3),
+            }
+
+
+class ConnectionPool:
+    """엔드포인트 1개의 크기 제한 커넥션 풀. 유휴 정리, 재사용 전 ping, 최대 수명 재생성, 대기 타임아웃 지원."""
+
+    def __init__(
+        self,
+        target: Target,
+        endpoint: Endpoint,
+        *,
+        min_size: int,
+        max_size: int,
+        idle_timeout: float,
+        max_lifetime: float,
+        wait_timeout: float,
+        ping_interval: float,
+    ) -> None:
+        self.target = target
+        self.endpoint = endpoint
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.wait_timeout = wait_timeout
+        self.ping_interval = ping_interval
+        self._cond = threading.Condition()
+        self._idle: list[_PooledConnection] = []  # 끝이 가장 최근 반환 (LIFO)
+        self._total = 0  # 생성 중인 연결 포함
+        self._in_use = 0
+        self._waiting = 0
+        self._stats = {
+            "acquires": 0,
+            "waits": 0,
+            "wait_timeouts": 0,
+            "creations": 0,
+            "closes": 0,
+            "reconnects": 0,
+            "idle_evictions": 0,
+            "lifetime_recycles": 0,
+        }
+
+    def _expired(self, item: _PooledConnection, now: float) -> bool:
+        return self.max_lifetime > 0 and now - item.created_at >= self.max_lifetime
+
+    def _evict_idle_locked(self, now: float) -> list[_PooledConnection]:
+        """idle_timeout을 넘긴 유휴 연결을 min_size까지 제거 대상으로 분리."""
+        if self.idle_timeout <= 0:
+            return []
+        evicted: list[_PooledConnection] = []
+        keep: list[_PooledConnection] = []
+        # 오래된 것(앞쪽)부터 정리
+        for item in self._idle:
+            if self._total - len(evicted) > self.min_size and now - item.last_used_at >= self.idle_timeout:
+                evicted.append(item)
+            else:
+                keep.append(item)
+        if evicted:
+            self._idle = keep
+            self._total -= len(evicted)
+            self._stats["idle_evictions"] += len(evicted)
+            self._stats["closes"] += len(evicted)
+        return evicted
+
+    def _create(self) -> _PooledConnection:
+        """슬롯을 예약한 상태에서 호출. 실패하면 슬롯 반환."""
+        try:
+            item = _PooledConnection(_connect(self.target, self.endpoint))
+        except BaseException:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats["creations"] += 1
+        return item
+
+    def _prepare_for_reuse(self, item: _PooledConnection) -> _PooledConnection:
+        """최대 수명 초과 시 새 연결로 교체하고, 오래 쉬었으면 ping(필요 시 재연결)."""
+        now = time.monotonic()
+        if self._expired(item, now):
+            _close_quietly(item.conn)
+            with self._cond:
+                self._stats["lifetime_recycles"] += 1
+                self._stats["closes"] += 1
+            return self._create()
+        if self.ping_interval <= 0 or now - item.last_used_at >= self.ping_interval:
+            thread_id = item.conn.thread_id()
+            try:
+                item.conn.ping(reconnect=True)
+            except BaseException:
+                _close_quietly(item.conn)
+                with self._cond:
+                    self._total -= 1
+                    self._stats["closes"] += 1
+                    self._cond.notify()
+                raise
+            if item.conn.thread_id() != thread_id:
+                # ping이 끊긴 연결을 다시 맺은 경우: 수명 기준과 세션 변수도 새로 시작
+                item.created_at = time.monotonic()
+                item.session_timeout = None
+                with self._cond:
+                    self._stats["reconnects"] += 1
+        return item
+
+    def acquire(self) -> _PooledConnection:
+        """연결 1개 대여. 풀이 가득 차면 wait_timeout까지 대기 후 DBConnectionError."""
+        deadline = time.monotonic() + self.wait_timeout if self.wait_timeout > 0 else None
+        waited = False
+        with self._cond:
+            evicted = self._evict_idle_locked(time.monotonic())
+            while True:
+                if self._idle:
+                    item = self._idle.pop()
+                    create = False
+                    break
+                if self._total < self.max_size:
+                    self._total += 1
+                    item = None
+                    create = True
+                    break
+                if not waited:
+                    waited = True
+                    self._stats["waits"] += 1
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._stats["wait_timeouts"] += 1
+                    raise DBConnectionError(
+                        f"DB 커넥션 풀 대기 시간 초과 (대상 {self.target.name} {self.endpoint.name}, "
+                        f"최대 {self.max_size}개 사용 중, {self.wait_timeout}초)"
+                    )
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            self._in_use += 1
+            self._stats["acquires"] += 1
+        for old in evicted:
+            _close_quietly(old.conn)
+        try:
+            return self._create() if create else self._prepare_for_reuse(item)
+        except BaseException:
+            with self._cond:
+                self._in_use -= 1
+            raise
+
+    def release(self, item: _PooledConnection, *, discard: bool = False) -> None:
+        """연결 반납. discard면 닫고 슬롯만 반환."""
+        now = time.monotonic()
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._expired(item, now):
+                self._total -= 1
+                self._stats["closes"] += 1
+                close = True
+            else:
+                item.last_used_at = now
+                self._idle.append(item)
+                close = False
+            self._cond.notify()
+        if close:
+            _close_quietly(item.conn)
+
+    def close(self) -> None:
+        """유휴 연결 모두 닫기. 사용 중인 연결은 반납 시점에 그대로 풀로 돌아옴."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self._stats["closes"] += len(idle)
+            self._cond.notify_all()
+        for item in idle:
+            _close_quietly(item.conn)
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "min_size": self.min_size,
+                "total": self._total,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                **self._stats,
+            }
+
+
+_pools: dict[tuple[str, str], ConnectionPool] = {}  # (대상, 엔드포인트) -> 풀
+_routers: dict[str, Router] = {}
+_breakers: dict[str, CircuitBreaker] = {}
+_windows: dict[str, LatencyWindow] = {}
+_pool_lock = threading.Lock()
+
+# 현재 failover 범위에서 이미 실패한 엔드포인트 (범위 밖이면 None)
+_excluded: contextvars.ContextVar[set[str] | None] = contextvars.ContextVar("db_excluded_endpoints", default=None)
+
+
+def _get_router(target: Target) -> Router:
+    router = _routers.get(target.name)
+    if router is None:
+        with _pool_lock:
+            router = _routers.setdefault(target.name, Router(target))
+    return router
+
+
+def _get_breaker(target: Target) -> CircuitBreaker | None:
+    """대상의 회로 차단기 (DB_BREAKER_ENABLED가 아니면 None)."""
+    if not config.DB_BREAKER_ENABLED:
+        return None
+    breaker = _breakers.get(target.name)
+    if breaker is None:
+        with _pool_lock:
+            breaker = _breakers.setdefault(
+                target.name,
+                CircuitBreaker(
+                    target.name,
+                    failure_threshold=config.DB_BREAKER_FAILURE_THRESHOLD,
+                    open_seconds=config.DB_BREAKER_OPEN_SECONDS,
+                    half_open_probes=config.DB_BREAKER_HALF_OPEN_PROBES,
+                ),
+            )
+    return breaker
+
+
+def _get_window(target: Target) -> LatencyWindow:
+    window = _windows.get(target.name)
+    if window is None:
+        with _pool_lock:
+            window = _windows.setdefault(target.name, LatencyWindow(config.DB_ADAPTIVE_TIMEOUT_WINDOW))
+    return window
+
+
+def check_breaker(name: str) -> None:
+    """대상 name의 회로 차단기가 열려 있으면 CircuitOpenError (동시 실행 슬롯을 잡기 전 빠른 거절용)."""
+    target = targets.get(name)
+    breaker = None if target is None else _get_breaker(target)
+    if breaker is not None:
+        breaker.check()
+
+
+def breaker_state(name: str) -> str | None:
+    """대상 name의 회로 차단기 상태 (closed/open/half_open). 차단기 미사용·아직 사용 전이면 None."""
+    breaker = _breakers.get(name)
+    return None if breaker is None else breaker.state
+
+
+def _get_pool(target: Target, endpoint: Endpoint) -> ConnectionPool | None:
+    """대상의 pool_max_size > 0이면 그 대상·엔드포인트 전용 풀 반환 (최초 호출 시 생성). 대상끼리 연결을 나눠 쓰지 않는다."""
+    if target.pool_max_size <= 0:
+        return None
+    key = (target.name, endpoint.name)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pool_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(
+                    target,
+                    endpoint,
+                    min_size=target.pool_min_size,
+                    max_size=target.pool_max_size,
+                    idle_timeout=config.DB_POOL_IDLE_TIMEOUT,
+                    max_lifetime=config.DB_POOL_MAX_LIFETIME,
+                    wait_timeout=config.DB_POOL_WAIT_TIMEOUT,
+                    ping_interval=config.DB_POOL_PING_INTERVAL,
+                )
+    return pool
+
+
+def has_waiters(name: str) -> bool:
+    """대상 name의 풀 중 연결을 기다리는 요청이 있는지 (백그라운드 작업이 양보할지 판단용)."""
+    with _pool_lock:
+        pools = [pool for (t, _), pool in _pools.items() if t == name]
+    return any(pool.stats()["waiting"] > 0 for pool in pools)
+
+
+def pool_stats() -> dict[str, Any]:
+    """커넥션 풀 통계 (사용 중/유휴/대기/생성 수 등, 풀이 여럿이면 합계와 "대상@엔드포인트"별 값). 풀 미사용 시 enabled=False."""
+    if all(targets.get(name).pool_max_size <= 0 for name in targets.names()):
+        return {"enabled": False}
+    with _pool_lock:
+        pools = dict(_pools)
+    return {"enabled": True, **targets.merge_stats({f"{t}@{e}": pool.stats() for (t, e), pool in pools.items()})}
+
+
+def routing_stats() -> dict[str, Any]:
+    """엔드포인트 선택 통계: 엔드포인트별 지연 EWMA·오류율·점수·제외 여부·선택/실패 수, 재시도 수."""
+    for name in targets.names():
+        _get_router(targets.get(name))
+    with _pool_lock:
+        routers = dict(_routers)
+    per_target = {name: router.stats() for name, router in routers.items()}
+    merged = targets.merge_stats({name: {k: v for k, v in s.items() if k != "routes"} for name, s in per_target.items()})
+    merged.pop("targets", None)
+    return {**merged, "routes": {name: s["routes"] for name, s in per_target.items()}}
+
+
+def breaker_stats() -> dict[str, Any]:
+    """회로 차단기 통계: 열린 대상 수, 차단·거절·시험 횟수 합계와 대상별 상태."""
+    if not config.DB_BREAKER_ENABLED:
+        return {"enabled": False}
+    with _pool_lock:
+        breakers = dict(_breakers)
+    per_target = {name: breaker.stats() for name, breaker in breakers.items()}
+    merged = targets.merge_stats({name: {k: v for k, v in s.items() if k != "state"} for name, s in per_target.items()})
+    merged.pop("targets", None)
+    return {"enabled": True, **merged, "states": {name: s["state"] for name, s in per_target.items()}}
+
+
+def timeout_stats() -> dict[str, Any]:
+    """쿼리 타임아웃 통계: 대상별 관측 지연 분위수와 현재 적용 타임아웃(적응형이 아니면 DB_QUERY_TIMEOUT)."""
+    with _pool_lock:
+        windows = dict(_windows)
+    per_target = {name: window.stats(float(targets.get(name).query_timeout)) for name, window in windows.items()}
+    return {"adaptive": config.DB_ADAPTIVE_TIMEOUT, "targets": per_target}
+
+
+def _observe_query(seconds: float) -> None:
+    """성공한 쿼리 1개의 실행 시간을 현재 대상의 LatencyWindow에 기록 (연결을 쥐고 있던 시간은 넣지 않음)."""
+    _get_window(targets.current()).add(seconds)
+
+
+def _session_timeout_sql(server_version: str, seconds: float) -> str | None:
+    """세션 SELECT 실행 시간 상한을 거는 SET 문. 지원하지 않는 서버면 None.
+
+    MySQL 5.7.8+ max_execution_time(밀리초, SELECT에만 적용), MariaDB 10.1.1+ max_statement_time(초).
+    """
+    mariadb = "mariadb" in server_version.lower()
+    m = re.match(r"(\d+)\.(\d+)\.(\d+)", server_version.removeprefix("5.5.5-"))
+    version = tuple(int(x) for x in m.groups()) if m else (0, 0, 0)
+    if mariadb:
+        return f"SET SESSION max_statement_time = {seconds:.3f}" if version >= (10, 1, 1) else None
+    return f"SET SESSION max_execution_time = {math.ceil(seconds * 1000)}" if version >= (5, 7, 8) else None
+
+
+def _apply_session_timeout(conn: pymysql.connections.Connection, item: _PooledConnection | None, seconds: float) -> None:
+    """적응형 타임아웃을 세션 변수로 설정. 풀 연결은 값이 바뀔 때만 다시 보낸다.
+
+    소켓 read_timeout(대상 query_timeout)은 연결 생성 시 값 그대로 두어, SELECT가 아닌 문(SHOW 등)의 상한으로 남는다.
+    """
+    if item is not None and item.session_timeout == seconds:
+        return
+    sql = _session_timeout_sql(conn.get_server_info(), seconds)
+    if sql is None:
+        return
+    # 커서를 거치지 않아 타임아웃 표본·Tool 통계에 넣지 않음
+    conn.query(sql)
+    if item is not None:
+        item.session_timeout = seconds
+
+
+def close_pool() -> None:
+    """모든 풀의 유휴 연결 정리 (종료 시)."""
+    with _pool_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
+
+
+# 세션 실행 시간 상한 초과: MySQL ER_QUERY_TIMEOUT, MariaDB ER_STATEMENT_TIMEOUT
+_STATEMENT_TIMEOUT_ERRORS = (3024, 1969)
+
+
+def _to_db_error(e: pymysql.Error, endpoint: Endpoint, *, retryable: bool = False) -> DBConnectionError:
+    msg = str(e)
+    statement_timeout = bool(e.args) and e.args[0] in _STATEMENT_TIMEOUT_ERRORS
+    if statement_timeout or "timeout" in msg.lower() or "timed out" in msg.lower():
+        return DBConnectionError(f"DB 연결 또는 쿼리 타임아웃: {msg}", endpoint=endpoint.name, retryable=True)
+    return DBConnectionError(f"DB 연결 실패: {msg}", endpoint=endpoint.name, retryable=retryable)
 
 
 @contextlib.contextmanager
 def get_connection() -> Generator[pymysql.connections.Connection, None, None]:
-    """MySQL 연결 컨텍스트 매니저. 읽기 전용 사용만 가정."""
-    conn = None
+    """현재 대상(targets.use)의 MySQL 연결 컨텍스트 매니저. 읽기 전용 사용만 가정. 풀 사용 시 종료 시점에 반납.
+
+    엔드포인트는 Router가 고르고, 사용 시간(성공)·연결 실패/타임아웃/끊김(실패)을 그 엔드포인트 상태와
+    대상의 회로 차단기에 반영한다. 차단기가 열려 있으면 연결하지 않고 CircuitOpenError.
+    DB_ADAPTIVE_TIMEOUT이면 넘기기 전에 세션 실행 시간 상한을 맞춘다(_apply_session_timeout).
+    """
+    target = targets.current()
+    breaker = _get_breaker(target)
+    probe = breaker.acquire() if breaker is not None else False
+    healthy: bool | None = None  # 차단기에 알릴 결과. None = 판단 불가
     try:
-        conn = pymysql.connect(
-            host=config.DB_HOST,
-            port=config.DB_PORT,
-            user=config.DB_USER,
-            password=config.DB_PASSWORD,
-            database=config.DB_NAME if config.DB_NAME else None,
-            charset="utf8mb4",
-            connect_timeout=config.DB_CONNECT_TIMEOUT,
-            read_timeout=config.DB_QUERY_TIMEOUT,
-            write_timeout=config.DB_QUERY_TIMEOUT,
-            ssl=config.DB_SSL,
-            cursorclass=DictCursor,
-        )
-        yield conn
-    except pymysql.Error as e:
-        msg = str(e)
-        if "timeout" in msg.lower() or "timed out" in msg.lower():
-            raise DBConnectionError(f"DB 연결 또는 쿼리 타임아웃: {msg}") from e
-        raise DBConnectionError(f"DB 연결 실패: {msg}") from e
+        router = _get_router(target)
+        endpoint = router.choose(_excluded.get() or ())
+        pool = _get_pool(target, endpoint)
+        window = _get_window(target)
+        call = metrics.current_call()
+        start = time.perf_counter()
+        item = None
+        try:
+            if pool is None:
+                conn = _connect(target, endpoint)
+            else:
+                item = pool.acquire()
+                conn = item.conn
+        except pymysql.Error as e:
+            healthy = False
+            router.observe(endpoint, None)
+            raise _to_db_error(e, endpoint, retryable=True) from e
+        except DBConnectionError as e:
+            # 풀 대기 시간 초과: 엔드포인트 장애는 아니지만 다른 엔드포인트에서는 바로 될 수 있음
+            raise DBConnectionError(str(e), endpoint=endpoint.name, retryable=True) from e
+        if call is not None:
+            call.add(connect=time.perf_counter() - start)
+        discard = False
+        try:
+            if config.DB_ADAPTIVE_TIMEOUT:
+                # 0.1초 단위로 올림: 표본이 조금 바뀔 때마다 풀 연결에 SET을 다시 보내지 않도록
+                seconds = math.ceil(window.timeout(float(target.query_timeout)) * 10) / 10
+                _apply_session_timeout(conn, item, seconds)
+            yield conn
+        except (pymysql.OperationalError, pymysql.InterfaceError) as e:
+            # 끊겼거나 상태를 알 수 없는 연결은 풀에 되돌리지 않음
+            discard = True
+            healthy = False
+            router.observe(endpoint, None)
+            raise _to_db_error(e, endpoint, retryable=True) from e
+        except pymysql.Error as e:
+            healthy = True
+            raise _to_db_error(e, endpoint) from e
+        except BaseException as e:
+            # 쿼리 도중 중단(KeyboardInterrupt 등)된 연결은 상태를 알 수 없으므로 재사용하지 않음
+            discard = not isinstance(e, Exception)
+            raise
+        else:
+            healthy = True
+            router.observe(endpoint, time.perf_counter() - start)
+        finally:
+            if item is None:
+                _close_quietly(conn)
+            else:
+                pool.release(item, discard=discard)
     finally:
-        if conn:
-            try:
-                conn.close()
-            except Exception:
-                pass
+        if breaker is not None:
+            breaker.record(healthy, probe)
+
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def failover(fn: _F) -> _F:
+    """연결 1개로 끝나는 읽기 함수용. 연결 실패·타임아웃이면 실패한 엔드포인트를 빼고 다시 실행 (최대 DB_FAILOVER_RETRIES번).
+
+    information_schema SELECT만 하므로 몇 번 다시 실행해도 결과가 같다. 중첩 호출은 바깥 범위에서만 재시도.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if _excluded.get() is not None:
+            return fn(*args, **kwargs)
+        excluded: set[str] = set()
+        token = _excluded.set(excluded)
+        try:
+            attempt = 0
+            while True:
+                try:
+                    return fn(*args, **kwargs)
+                except DBConnectionError as e:
+                    router = _get_router(targets.current())
+                    if not e.retryable or e.endpoint is None or attempt >= config.DB_FAILOVER_RETRIES:
+                        raise
+                    excluded.add(e.endpoint)
+                    if not router.has_alternative(excluded):
+                        raise
+                    router.record_retry()
+                    attempt += 1
+        finally:
+            _excluded.reset(token)
+
+    return wrapper  # type: ignore[return-value]
@@ -0,0 +1,90 @@
+"""CREATE TABLE 문 (get_create_table).
+
+DB 모드는 SHOW CREATE TABLE 결과를 그대로 쓰고(metadata.get_create_tables), 스냅샷 모드나 CREATE_TABLE_SOURCE=render이면
+get_table_metadata 결과로 문을 만든다. 만든 문은 컬럼·키·인덱스·FK·CHECK·테이블 옵션을 담지만
+생성 컬럼 식, 파티션, AUTO_INCREMENT 시작값 등 메타데이터에 없는 항목은 빠진다.
+"""
+import re
+from typing import Any
+
+_CURRENT_TIMESTAMP = re.compile(r"^current_timestamp(\(\d*\))?$", re.IGNORECASE)
+# DEFAULT NULL을 표시하지 않는 타입 (SHOW CREATE TABLE과 같게)
+_NO_DEFAULT_NULL = re.compile(r"^(tiny|medium|long)?(text|blob)\b|^(json|geometry)", re.IGNORECASE)
+
+
+def quote_name(name: str) -> str:
+    return "`" + name.replace("`", "``") + "`"
+
+
+def _quote_value(value: Any) -> str:
+    return "'" + str(value).replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def _names(columns: list[str]) -> str:
+    return ",".join(quote_name(c) for c in columns)
+
+
+def _column(c: dict[str, Any]) -> str:
+    parts = [quote_name(c["column_name"]), c["data_type"]]
+    extra = (c.get("extra") or "").lower()
+    generated = "virtual generated" in extra or "stored generated" in extra
+    if c["nullable"] == "NO":
+        parts.append("NOT NULL")
+    default = c.get("default_value")
+    if default is None:
+        if c["nullable"] != "NO" and not generated and not _NO_DEFAULT_NULL.match(c["data_type"]):
+            parts.append("DEFAULT NULL")
+    elif "default_generated" in extra or _CURRENT_TIMESTAMP.match(str(default)):
+        expression = str(default)
+        parts.append(f"DEFAULT {expression if _CURRENT_TIMESTAMP.match(expression) else f'({expression})'}")
+    else:
+        parts.append(f"DEFAULT {_quote_value(default)}")
+    if "auto_increment" in extra:
+        parts.append("AUTO_INCREMENT")
+    on_update = re.search(r"on update (\S+)", extra)
+    if on_update:
+        parts.append(f"ON UPDATE {on_update.group(1).upper()}")
+    if c.get("column_comment"):
+        parts.append(f"COMMENT {_quote_value(c['column_comment'])}")
+    return " ".join(parts)
+
+
+def render_create_table(entry: dict[str, Any]) -> str:
+    """get_table_metadata 결과 1개로 CREATE TABLE 문 생성."""
+    table = entry["table"]
+    lines = [f"  {_column(c)}" for c in entry["columns"]]
+    if entry["primary_key"]:
+        lines.append(f"  PRIMARY KEY ({_names(entry['primary_key'])})")
+    for u in entry["unique_keys"]:
+        lines.append(f"  UNIQUE KEY {quote_name(u['constraint_name'])} ({_names(u['columns'])})")
+    for i in entry["indexes"]:
+        lines.append(f"  KEY {quote_name(i['index_name'])} ({_names(i['columns'])})")
+    for fk in entry["foreign_keys"]:
+        lines.append(
+            f"  CONSTRAINT {quote_name(fk['constraint_name'])} FOREIGN KEY ({_names(fk['columns'])}) "
+            f"REFERENCES {quote_name(fk['referenced_schema'])}.{quote_name(fk['referenced_table'])} "
+            f"({_names(fk['referenced_columns'])}) ON DELETE {fk['delete_rule']} ON UPDATE {fk['update_rule']}"
+        )
+    for ck in entry["check_constraints"]:
+        lines.append(f"  CONSTRAINT {quote_name(ck['constraint_name'])} CHECK {ck['check_clause']}")
+    options = []
+    if table.get("engine"):
+        options.append(f"ENGINE={table['engine']}")
+    collation = table.get("table_collation")
+    if collation:
+        options.append(f"DEFAULT CHARSET={collation.split('_')[0]} COLLATE={collation}")
+    if table.get("table_comment"):
+        options.append(f"COMMENT={_quote_value(table['table_comment'])}")
+    body = ",\n".join(lines)
+    return f"CREATE TABLE {quote_name(table['table_name'])} (\n{body}\n) {' '.join(options)}".rstrip()
+
+
+def response(schema_name: str, table_names: list[str], found: dict[str, str], source: str) -> dict[str, Any]:
+    """get_create_table 응답. 요청 순서, 없는 테이블은 error."""
+    tables = [
+        {"table_name": t, "create_table": found[t]}
+        if t in found
+        else {"table_name": t, "error": f"스키마 또는 테이블이 존재하지 않습니다: {schema_name}.{t}"}
+        for t in table_names
+    ]
+    return {"schema": schema_name, "source": source, "tables": tables}
@@ -0,0 +1,236 @@
+"""스키마 FK 그래프 인덱스: 이웃·N단계 연관 테이블·최단 조인 경로·적재 순서(순환 포함).
+
+get_schema_overview의 relationships로 스키마별 인접 리스트를 만들어 메모리에 보관한다.
+overview가 바뀌었을 때(스키마 지문 변경, 스냅샷 교체)만 다시 만들고, 그 외에는 information_schema를 다시 읽지 않는다.
+"""
+import threading
+from collections import OrderedDict, deque
+from typing import Any
+
+from . import config, targets
+from .metadata import MetadataError
+
+
+class FKGraph:
+    """한 스키마의 FK 그래프. 간선은 FK 제약 1개(복합 FK는 컬럼 쌍 여러 개), 방향은 자식 -> 부모(참조 대상)."""
+
+    def __init__(self, overview: dict[str, Any]) -> None:
+        self.schema = overview["schema"]
+        edges: dict[tuple[str, str], dict[str, Any]] = {}
+        for r in overview["relationships"]:
+            key = (r["from_table"], r["fk_name"])
+            edge = edges.get(key)
+            if edge is None:
+                edge = {"fk_name": r["fk_name"], "from_table": r["from_table"], "to_table": r["to_table"], "columns": []}
+                edges[key] = edge
+            edge["columns"].append([r["from_column"], r["to_column"]])
+        self.outgoing: dict[str, list[dict[str, Any]]] = {}
+        self.incoming: dict[str, list[dict[str, Any]]] = {}
+        for edge in edges.values():
+            self.outgoing.setdefault(edge["from_table"], []).append(edge)
+            self.incoming.setdefault(edge["to_table"], []).append(edge)
+        nodes = {t["table_name"] for t in overview["tables"]} | set(self.outgoing) | set(self.incoming)
+        self.nodes = sorted(nodes)
+        self._node_set = nodes
+        self.edge_count = len(edges)
+        self._lower = {n.lower(): n for n in self.nodes}
+        self._load_order: dict[str, Any] | None = None
+        self._steps_cache: dict[tuple[str, str], list[tuple[str, dict[str, Any], str]]] = {}
+
+    def resolve(self, table_name: str) -> str:
+        """테이블명 확인 (lower_case_table_names 환경을 위해 대소문자 무시 비교도 시도)."""
+        if table_name in self._node_set:
+            return table_name
+        found = self._lower.get(table_name.lower())
+        if found is None:
+            raise MetadataError(f"스키마 또는 테이블이 존재하지 않습니다: {self.schema}.{table_name}")
+        return found
+
+    def _steps(self, table: str, direction: str) -> list[tuple[str, dict[str, Any], str]]:
+        """(다음 테이블, 간선, 방향) 목록. 방향 out은 자식 -> 부모, in은 부모 -> 자식. 테이블·방향별로 한 번만 정렬."""
+        cached = self._steps_cache.get((table, direction))
+        if cached is not None:
+            return cached
+        steps = []
+        if direction in ("out", "both"):
+            steps += [(e["to_table"], e, "out") for e in self.outgoing.get(table, ())]
+        if direction in ("in", "both"):
+            steps += [(e["from_table"], e, "in") for e in self.incoming.get(table, ())]
+        steps.sort(key=lambda s: (s[0], s[1]["fk_name"]))
+        self._steps_cache[(table, direction)] = steps
+        return steps
+
+    def related(self, table_name: str, depth: int, direction: str) -> dict[str, Any]:
+        """직접 참조/피참조 FK와 depth단계 안의 연관 테이블(거리·처음 도달한 FK)."""
+        table = self.resolve(table_name)
+        distance = {table: 0}
+        related: list[dict[str, Any]] = []
+        queue = deque([table])
+        while queue:
+            current = queue.popleft()
+            if distance[current] >= depth:
+                continue
+            for nxt, edge, step in self._steps(current, direction):
+                if nxt in distance:
+                    continue
+                distance[nxt] = distance[current] + 1
+                related.append(
+                    {"table": nxt, "distance": distance[nxt], "from": current, "via": edge["fk_name"], "direction": step}
+                )
+                queue.append(nxt)
+        return {
+            "schema": self.schema,
+            "table": table,
+            "outgoing": self.outgoing.get(table, []) if direction in ("out", "both") else [],
+            "incoming": self.incoming.get(table, []) if direction in ("in", "both") else [],
+            "depth": depth,
+            "related": related,
+        }
+
+    def join_path(self, from_table: str, to_table: str, max_hops: int) -> dict[str, Any]:
+        """두 테이블 사이 FK 간선 수가 가장 적은 조인 경로 (방향 무시). 없으면 path=None."""
+        start, goal = self.resolve(from_table), self.resolve(to_table)
+        prev: dict[str, tuple[str, dict[str, Any], str] | None] = {start: None}
+        hops = {start: 0}
+        queue = deque([start])
+        while queue and goal not in prev:
+            current = queue.popleft()
+            if hops[current] >= max_hops:
+                continue
+            for nxt, edge, step in self._steps(current, "both"):
+                if nxt not in prev:
+                    prev[nxt] = (current, edge, step)
+                    hops[nxt] = hops[current] + 1
+                    queue.append(nxt)
+        result: dict[str, Any] = {"schema": self.schema, "from_table": start, "to_table": goal}
+        if goal not in prev:
+            return {**result, "hops": None, "path": None}
+        path: list[dict[str, Any]] = []
+        node = goal
+        while prev[node] is not None:
+            current, edge, step = prev[node]
+            left, right = (current, node) if step == "out" else (node, current)  # left = FK를 가진 자식
+            on = " AND ".join(f"{left}.{c} = {right}.{p}" for c, p in edge["columns"])
+            path.append(
+                {"from_table": current, "to_table": node, "fk_name": edge["fk_name"], "direction": step, "on": on}
+            )
+            node = current
+        path.reverse()
+        return {**result, "hops": len(path), "path": path}
+
+    def load_order(self) -> dict[str, Any]:
+        """부모(참조 대상)를 먼저 두는 적재 순서와 FK 순환 목록. 순환에 묶인 테이블은 순서상 한데 모음."""
+        if self._load_order is None:
+            components = self._components()
+            # 2개 이상 묶인 요소, 또는 자기 자신을 참조하는 테이블
+            cycles = [
+                c for c in components
+                if len(c) > 1 or any(e["to_table"] == c[0] for e in self.outgoing.get(c[0], ()))
+            ]
+            self._load_order = {
+                "schema": self.schema,
+                "order": [t for c in components for t in c],
+                "cycles": cycles,
+                "table_count": len(self.nodes),
+                "fk_count": self.edge_count,
+            }
+        return self._load_order
+
+    def _components(self) -> list[list[str]]:
+        """강결합 요소(Tarjan, 반복형). 자식 -> 부모 방향이라 부모 쪽 요소가 먼저 나온다."""
+        deps = {n: sorted({e["to_table"] for e in self.outgoing.get(n, ())}) for n in self.nodes}
+        index: dict[str, int] = {}
+        low: dict[str, int] = {}
+        stack: list[str] = []
+        on_stack: set[str] = set()
+        components: list[list[str]] = []
+        for root in self.nodes:
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(deps[root]))]
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in index:
+                        index[child] = low[child] = len(index)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(deps[child])))
+                        break
+                    if child in on_stack:
+                        low[node] = min(low[node], index[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(sorted(component))
+        return components
+
+
+class GraphCache:
+    """(대상, 스키마)별 FKGraph LRU. overview가 이전과 같으면(같은 객체 또는 같은 내용) 기존 그래프 재사용."""
+
+    def __init__(self, max_schemas: int) -> None:
+        self.max_schemas = max(1, max_schemas)
+        self._lock = threading.Lock()
+        self._graphs: OrderedDict[tuple[str, str], tuple[dict[str, Any], FKGraph]] = OrderedDict()
+        self._stats = {"hits": 0, "builds": 0, "evictions": 0}
+
+    def get(self, source: Any, schema_name: str) -> FKGraph:
+        overview = source.get_schema_overview(schema_name)
+        key = (targets.current_name(), schema_name)
+        with self._lock:
+            known = self._graphs.get(key)
+            # 메타데이터 캐시는 같은 객체를, 캐시 미사용·스냅샷은 같은 내용의 새 객체를 돌려준다
+            if known is not None and (
+                known[0] is overview
+                or (known[0]["relationships"] == overview["relationships"] and known[0]["tables"] == overview["tables"])
+            ):
+                self._graphs.move_to_end(key)
+                self._stats["hits"] += 1
+                return known[1]
+        graph = FKGraph(overview)
+        with self._lock:
+            self._graphs[key] = (overview, graph)
+            self._graphs.move_to_end(key)
+            self._stats["builds"] += 1
+            while len(self._graphs) > self.max_schemas:
+                self._graphs.popitem(last=False)
+                self._stats["evictions"] += 1
+        return graph
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"schemas": len(self._graphs), **self._stats}
+
+
+_graphs = GraphCache(config.FK_GRAPH_MAX_SCHEMAS)
+
+
+def get_table_relations(source: Any, schema_name: str, table_name: str, depth: int, direction: str) -> dict[str, Any]:
+    return _graphs.get(source, schema_name).related(table_name, depth, direction)
+
+
+def find_join_path(source: Any, schema_name: str, from_table: str, to_table: str, max_hops: int) -> dict[str, Any]:
+    return _graphs.get(source, schema_name).join_path(from_table, to_table, max_hops)
+
+
+def get_load_order(source: Any, schema_name: str) -> dict[str, Any]:
+    return _graphs.get(source, schema_name).load_order()
+
+
+def graph_stats() -> dict[str, Any]:
+    """FK 그래프 인덱스 통계 (보관 스키마 수, 재사용/생성 횟수)."""
+    return _graphs.stats()
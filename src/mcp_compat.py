@@ -0,0 +1,55 @@
+"""FastMCP 내부 API 어댑터 (리소스 구독).
+
+FastMCP 2.x는 resources/subscribe·unsubscribe 처리기 등록, 요청한 세션 조회, 세션 종료 알림, capabilities의
+resources.subscribe 표시를 공개 API로 제공하지 않아 하위 MCP 서버(FastMCP._mcp_server)와 세션 내부를 직접 쓴다.
+내부 API는 이 모듈에서만 쓰며, FastMCP를 올렸을 때 깨지면 tests/test_mcp_compat.py가 실패한다.
+"""
+from typing import Any, Awaitable, Callable
+
+from fastmcp import FastMCP
+from pydantic import AnyUrl
+
+# (URI, 요청한 세션)을 받는 구독·해제 처리기
+Handler = Callable[[str, Any], Awaitable[None]]
+
+
+def on_subscribe(mcp: FastMCP, handler: Handler) -> None:
+    """resources/subscribe 처리기 등록."""
+    server = mcp._mcp_server
+
+    @server.subscribe_resource()
+    async def subscribe(uri: AnyUrl) -> None:
+        await handler(str(uri), server.request_context.session)
+
+
+def on_unsubscribe(mcp: FastMCP, handler: Handler) -> None:
+    """resources/unsubscribe 처리기 등록."""
+    server = mcp._mcp_server
+
+    @server.unsubscribe_resource()
+    async def unsubscribe(uri: AnyUrl) -> None:
+        await handler(str(uri), server.request_context.session)
+
+
+def on_session_closed(session: Any, callback: Callable[[], None]) -> None:
+    """세션이 끝날 때(연결 종료·unsubscribe 없이 끊김 포함) callback 호출. 세션의 이벤트 루프에서 실행된다."""
+    session._exit_stack.callback(callback)
+
+
+def advertise_subscribe(mcp: FastMCP) -> None:
+    """initialize 응답의 capabilities에 resources.subscribe=true 표시 (기본 구현은 항상 false)."""
+    server = mcp._mcp_server
+    base = server.get_capabilities
+
+    def get_capabilities(*args: Any, **kwargs: Any) -> Any:
+        capabilities = base(*args, **kwargs)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+    server.get_capabilities = get_capabilities
+
+
+async def send_resource_updated(session: Any, uri: str) -> None:
+    """세션에 notifications/resources/updated 전송."""
+    await session.send_resource_updated(AnyUrl(uri))
@@ -1,213 +1,993 @@
 """Information Schema 기반 메타데이터 조회. SELECT만 사용."""
-from typing import Any
+import base64
+import contextvars
+import functools
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
 
-from . import config
-from .db import get_connection
+import pymysql
+
+from . import config, ddl, shared_state, targets
+from .db import failover, get_connection
+from .shared_state import SharedStore
+from .singleflight import SingleFlight
 
 # 시스템 스키마 제외용 (전체 목록 시)
 _SYSTEM_SCHEMAS = ("information_schema", "mysql", "performance_schema", "sys")
 
+# list_tables 전체 조회(스키마 미지정) 시 캐시/지문 키로 쓰는 스키마 이름
+_ALL_SCHEMAS = "*"
+
 
 class MetadataError(Exception):
     """스키마/테이블 없음 등 메타데이터 조회 오류."""
     pass
 
 
-def list_tables(schema_name: str | None = None) -> list[dict[str, Any]]:
-    """지정 스키마(또는 전체)의 테이블 목록 반환."""
-    with get_connection() as conn:
-        with conn.cursor() as cur:
-            if schema_name:
-                cur.execute(
-                    """
-                    SELECT TABLE_SCHEMA AS `schema`, TABLE_NAME AS table_name, TABLE_COMMENT AS table_comment
-                    FROM information_schema.TABLES
-                    WHERE TABLE_SCHEMA = %s AND TABLE_TYPE = 'BASE TABLE'
-                    ORDER BY TABLE_SCHEMA, TABLE_NAME
-                    """,
-                    (schema_name,),
-                )
-            else:
-                cur.execute(
-                    """
-                    SELECT TABLE_SCHEMA AS `schema`, TABLE_NAME AS table_name, TABLE_COMMENT AS table_comment
-                    FROM information_schema.TABLES
-                    WHERE TABLE_SCHEMA NOT IN (%s, %s, %s, %s) AND TABLE_TYPE = 'BASE TABLE'
-                    ORDER BY TABLE_SCHEMA, TABLE_NAME
-                    """,
-                    _SYSTEM_SCHEMAS,
-                )
-            rows = cur.fetchall()
-    result = [dict(row) for row in rows]
-    if config.MAX_LIST_TABLES_RESULT > 0 and len(result) > config.MAX_LIST_TABLES_RESULT:
-        result = result[: config.MAX_LIST_TABLES_RESULT]
-    return result
+# get_table(s)_metadata 결과 섹션과 컬럼 속성 (출력 순서)
+SECTIONS = ("table", "columns", "primary_key", "unique_keys", "indexes", "foreign_keys", "check_constraints")
+COLUMN_FIELDS = ("column_name", "data_type", "nullable", "default_value", "extra", "column_comment")
+_CONSTRAINT_TYPES = {
+    "primary_key": "PRIMARY KEY",
+    "unique_keys": "UNIQUE",
+    "foreign_keys": "FOREIGN KEY",
+    "check_constraints": "CHECK",
+}
+
+
+class Projection:
+    """테이블 메타데이터 중 필요한 부분만: 섹션(table은 항상 포함), 컬럼 이름 부분집합, 컬럼 속성 부분집합.
+
+    조회는 요청 섹션에 필요한 information_schema 쿼리만 실행한다 (예: columns만이면 SELECT 1개).
+    """
+    __slots__ = ("sections", "columns", "column_fields", "key")
+
+    def __init__(
+        self,
+        sections: list[str] | None = None,
+        columns: list[str] | None = None,
+        column_fields: list[str] | None = None,
+    ) -> None:
+        self.sections = frozenset(sections or SECTIONS) | {"table"}
+        self.columns = tuple(dict.fromkeys(columns)) if columns else None
+        # column_name은 항상 포함, 순서는 COLUMN_FIELDS 기준
+        self.column_fields = (
+            tuple(f for f in COLUMN_FIELDS if f == "column_name" or f in column_fields) if column_fields else None
+        )
+        # 캐시·single-flight 키 구분용
+        self.key = json.dumps([[s for s in SECTIONS if s in self.sections], self.columns, self.column_fields])
+
+    @property
+    def constraint_types(self) -> tuple[str, ...]:
+        return tuple(t for s, t in _CONSTRAINT_TYPES.items() if s in self.sections)
+
+    def apply(self, entry: dict[str, Any]) -> dict[str, Any]:
+        """전체(또는 이 projection으로 조회한) 항목에서 요청한 부분만 남긴 새 항목."""
+        out: dict[str, Any] = {}
+        for section in SECTIONS:
+            if section not in self.sections:
+                continue
+            value = entry[section]
+            if section == "columns":
+                if self.columns is not None:
+                    wanted = {c.lower() for c in self.columns}
+                    value = [c for c in value if c["column_name"].lower() in wanted]
+                if self.column_fields is not None:
+                    value = [{f: c[f] for f in self.column_fields} for c in value]
+            out[section] = value
+        return out
 
 
-def get_table_metadata(schema_name: str, table_name: str) -> dict[str, Any]:
-    """한 테이블에 대한 DDL 문서용 전체 메타데이터 반환."""
+# 변경 표시·스키마 지문에 넣는 DDL 항목 (뷰 이름, FROM 절, 스키마·테이블 컬럼, CRC32에 넣을 컬럼).
+# 데이터 변경(DML)으로 바뀌는 UPDATE_TIME·행 수는 넣지 않는다. CREATE_TIME만으로는 INSTANT ADD COLUMN, 코멘트 변경,
+# 이름이 같은 FK의 규칙·참조 대상 변경, CHECK 식 변경 등 테이블을 다시 만들지 않는 ALTER를 놓치므로 정의 뷰도 함께 본다
+_STAMP_VIEWS = (
+    (
+        "TABLES",
+        "information_schema.TABLES",
+        "TABLE_SCHEMA",
+        "TABLE_NAME",
+        "TABLE_TYPE, ENGINE, TABLE_COLLATION, CREATE_TIME, TABLE_COMMENT",
+    ),
+    (
+        "COLUMNS",
+        "information_schema.COLUMNS",
+        "TABLE_SCHEMA",
+        "TABLE_NAME",
+        "COLUMN_NAME, ORDINAL_POSITION, COLUMN_TYPE, IS_NULLABLE, COLUMN_DEFAULT, EXTRA, COLUMN_COMMENT",
+    ),
+    (
+        "STATISTICS",
+        "information_schema.STATISTICS",
+        "TABLE_SCHEMA",
+        "TABLE_NAME",
+        "INDEX_NAME, SEQ_IN_INDEX, COLUMN_NAME, NON_UNIQUE",
+    ),
+    (
+        "TABLE_CONSTRAINTS",
+        "information_schema.TABLE_CONSTRAINTS",
+        "TABLE_SCHEMA",
+        "TABLE_NAME",
+        "CONSTRAINT_NAME, CONSTRAINT_TYPE",
+    ),
+    (
+        "KEY_COLUMN_USAGE",
+        "information_schema.KEY_COLUMN_USAGE",
+        "TABLE_SCHEMA",
+        "TABLE_NAME",
+        "CONSTRAINT_NAME, COLUMN_NAME, ORDINAL_POSITION, REFERENCED_TABLE_SCHEMA, REFERENCED_TABLE_NAME,"
+        " REFERENCED_COLUMN_NAME",
+    ),
+    (
+        "REFERENTIAL_CONSTRAINTS",
+        "information_schema.REFERENTIAL_CONSTRAINTS",
+        "CONSTRAINT_SCHEMA",
+        "TABLE_NAME",
+        "CONSTRAINT_NAME, UPDATE_RULE, DELETE_RULE, REFERENCED_TABLE_NAME",
+    ),
+)
+
+
+def _check_stamp_view(features: dict[str, bool]) -> tuple[str, str, str, str, str]:
+    """CHECK 식 변경 표시. CHECK_CONSTRAINTS에는 (MySQL에서) 테이블명이 없어 TABLE_CONSTRAINTS와 JOIN."""
+    return (
+        "CHECK_CONSTRAINTS",
+        "information_schema.CHECK_CONSTRAINTS cc JOIN information_schema.TABLE_CONSTRAINTS tc"
+        " ON tc.CONSTRAINT_SCHEMA = cc.CONSTRAINT_SCHEMA AND tc.CONSTRAINT_NAME = cc.CONSTRAINT_NAME"
+        " AND tc.CONSTRAINT_TYPE = 'CHECK'" + (" AND tc.TABLE_NAME = cc.TABLE_NAME" if features["mariadb"] else ""),
+        "tc.TABLE_SCHEMA",
+        "tc.TABLE_NAME",
+        "cc.CONSTRAINT_NAME, cc.CHECK_CLAUSE",
+    )
+
+
+def _stamps_sql(
+    schema_name: str, table_names: list[str] | None, features: dict[str, bool], deep: bool = True
+) -> tuple[str, tuple[Any, ...]]:
+    """테이블별 변경 표시 (table_name, stamp): _STAMP_VIEWS 행 CRC32의 테이블별 합.
+
+    deep=False이거나 스키마 전체 목록 키(_ALL_SCHEMAS, 테이블 목록만 캐시)면 TABLES만 본다.
+    CHECK_CONSTRAINTS가 없는 서버(features)면 CHECK 식은 빼고 본다.
+    """
+    if schema_name == _ALL_SCHEMAS or not deep:
+        views = _STAMP_VIEWS[:1]
+    else:
+        views = _STAMP_VIEWS + ((_check_stamp_view(features),) if features["check_constraints"] else ())
+    parts, params = [], []
+    for view, source, schema_col, table_col, columns in views:
+        if schema_name == _ALL_SCHEMAS:
+            where, schema_params = f"{schema_col} NOT IN (%s, %s, %s, %s)", _SYSTEM_SCHEMAS
+        else:
+            where, schema_params = f"{schema_col} = %s", (schema_name,)
+        cond, names = _in_clause(table_col, table_names)
+        parts.append(
+            f"""
+                SELECT {schema_col} AS s, {table_col} AS t,
+                       CRC32(CONCAT_WS('|', {schema_col}, {table_col}, '{view}', {columns})) AS crc
+                FROM {source}
+                WHERE {where}{cond}"""
+        )
+        params += [*schema_params, *names]
+    union = "\n                UNION ALL".join(parts)
+    return f"SELECT t AS table_name, SUM(crc) AS stamp FROM ({union}\n            ) p GROUP BY s, t", tuple(params)
+
+
+@failover
+def _schema_fingerprint(schema_name: str) -> str:
+    """스키마 지문: 테이블 수 + 테이블별 TABLES 행 체크섬의 합 (TABLES 스캔 1회).
+
+    METADATA_CACHE_DEEP_FINGERPRINT면 정의 뷰 전체의 변경 표시(table_stamps) 합. 확인 주기마다 스키마 전체
+    COLUMNS·STATISTICS·제약 뷰를 스캔하므로 기본은 끔. 끄면 테이블을 다시 만들지 않는 ALTER는 지문에 안 잡히고,
+    TTL 또는 diff_schema·변경 감시가 그 테이블의 변경 표시로 찾아 무효화(invalidate_tables)할 때 반영된다.
+    """
     with get_connection() as conn:
+        features = _server_features(conn.get_server_info())
+        sql, params = _stamps_sql(schema_name, None, features, deep=config.METADATA_CACHE_DEEP_FINGERPRINT)
         with conn.cursor() as cur:
-            # 1. 테이블 존재 여부 및 테이블 정의
             cur.execute(
-                """
-                SELECT TABLE_NAME AS table_name, ENGINE AS engine, TABLE_COLLATION AS table_collation,
-                       TABLE_COMMENT AS table_comment, ROW_FORMAT AS row_format
-                FROM information_schema.TABLES
-                WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND TABLE_TYPE = 'BASE TABLE'
-                """,
-                (schema_name, table_name),
+                f"SELECT COUNT(*) AS table_count, COALESCE(SUM(stamp), 0) AS checksum FROM ({sql}) x", params
             )
-            table_row = cur.fetchone()
-            if not table_row:
-                raise MetadataError(f"스키마 또는 테이블이 존재하지 않습니다: {schema_name}.{table_name}")
+            row = cur.fetchone()
+    return f"{row['table_count']}:{row['checksum']}"
 
-            table_info = dict(table_row)
 
-            # 2. 컬럼
-            cur.execute(
-                """
-                SELECT COLUMN_NAME AS column_name, COLUMN_TYPE AS data_type, IS_NULLABLE AS nullable,
-                       COLUMN_DEFAULT AS default_value, EXTRA AS extra, COLUMN_COMMENT AS column_comment
-                FROM information_schema.COLUMNS
-                WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
-                ORDER BY ORDINAL_POSITION
-                """,
-                (schema_name, table_name),
-            )
-            columns = [dict(r) for r in cur.fetchall()]
+class _CacheEntry:
+    __slots__ = ("value", "size", "stored_at", "fingerprint")
 
-            # 3. PRIMARY KEY / UNIQUE (KEY_COLUMN_USAGE + TABLE_CONSTRAINTS)
-            cur.execute(
-                """
-                SELECT kcu.CONSTRAINT_NAME, tc.CONSTRAINT_TYPE, kcu.COLUMN_NAME, kcu.ORDINAL_POSITION
-                FROM information_schema.KEY_COLUMN_USAGE kcu
-                JOIN information_schema.TABLE_CONSTRAINTS tc
-                  ON kcu.TABLE_SCHEMA = tc.TABLE_SCHEMA AND kcu.TABLE_NAME = tc.TABLE_NAME
-                     AND kcu.CONSTRAINT_NAME = tc.CONSTRAINT_NAME
-                WHERE kcu.TABLE_SCHEMA = %s AND kcu.TABLE_NAME = %s
-                  AND tc.CONSTRAINT_TYPE IN ('PRIMARY KEY', 'UNIQUE')
-                ORDER BY tc.CONSTRAINT_TYPE, kcu.CONSTRAINT_NAME, kcu.ORDINAL_POSITION
-                """,
-                (schema_name, table_name),
-            )
-            pk_cols: list[str] = []
-            unique_keys: list[dict[str, Any]] = []  # [{ constraint_name, columns: [] }]
-            current_unique: dict[str, Any] | None = None
-            for r in cur.fetchall():
-                r = dict(r)
-                if r["CONSTRAINT_TYPE"] == "PRIMARY KEY":
-                    pk_cols.append(r["COLUMN_NAME"])
+    def __init__(self, value: Any, size: int, stored_at: float, fingerprint: str) -> None:
+        self.value = value
+        self.size = size
+        self.stored_at = stored_at
+        self.fingerprint = fingerprint
+
+
+class MetadataCache:
+    """(schema, table, tool) 키의 LRU/TTL 캐시. 스키마 지문이 바뀌면 해당 스키마 항목 전체 무효화.
+
+    지문은 스키마별로 fingerprint_interval초에 최대 1번만 DB에서 다시 확인한다.
+    반환값은 캐시에 보관된 객체 그대로이므로 호출자가 수정하면 안 된다.
+    shared가 있으면 여러 워커가 함께 쓰는 2단계 캐시로 사용: 메모리에 없으면 shared에서 찾고, 저장은 양쪽에 한다.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int,
+        ttl: float,
+        fingerprint_interval: float,
+        fingerprint_fn: Callable[[str], str] = _schema_fingerprint,
+        name: str = targets.DEFAULT_NAME,
+        shared: SharedStore | None = None,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.fingerprint_interval = fingerprint_interval
+        self.name = name
+        self._shared = shared
+        self._fingerprint_fn = fingerprint_fn
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str | None, str], _CacheEntry] = OrderedDict()
+        self._fingerprints: dict[str, tuple[str, float]] = {}  # schema -> (지문, 확인 시각)
+        self._generations: dict[str, int] = {}  # schema -> invalidate_tables 횟수 (지문이 놓친 변경 반영용)
+        self._bytes = 0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+            "fingerprint_checks": 0,
+            "shared_hits": 0,
+        }
+
+    def _drop_locked(self, key: tuple[str, str | None, str]) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def fingerprint(self, schema_name: str) -> str:
+        """스키마의 현재 지문. 마지막 확인 후 fingerprint_interval이 지났으면 DB에서 다시 계산."""
+        now = time.monotonic()
+        with self._lock:
+            known = self._fingerprints.get(schema_name)
+            if known is not None and now - known[1] < self.fingerprint_interval:
+                return known[0]
+        # 간격이 막 지난 시점에 몰린 호출은 지문 조회 1번을 함께 기다린다
+        return _share((schema_name, None, "fingerprint"), lambda: self._refresh(schema_name, known), "fingerprint")
+
+    def _refresh(self, schema_name: str, known: tuple[str, float] | None) -> str:
+        current = self._fingerprint_fn(schema_name)
+        with self._lock:
+            self._stats["fingerprint_checks"] += 1
+            self._fingerprints[schema_name] = (current, time.monotonic())
+            if known is not None and known[0] != current:
+                stale = [k for k, e in self._entries.items() if k[0] == schema_name and e.fingerprint != current]
+                for k in stale:
+                    self._drop_locked(k)
+                self._stats["invalidations"] += len(stale)
+        if self._shared is not None and known is not None and known[0] != current:
+            self._shared.cache_invalidate(self.name, schema_name, current)
+        return current
+
+    def _shared_key(self, key: tuple[str, str | None, str]) -> str:
+        return json.dumps([self.name, *key], ensure_ascii=False)
+
+    def get(
+        self, key: tuple[str, str | None, str], fingerprint: str | None = None, *, count_miss: bool = True
+    ) -> tuple[bool, Any, str]:
+        """(hit 여부, 값, 현재 지문) 반환. 미스여도 지문은 이후 put에 그대로 사용.
+
+        같은 스키마를 연달아 조회할 때는 fingerprint()로 얻은 지문을 넘겨 재확인을 생략할 수 있다.
+        count_miss=False는 다른 키로 다시 찾기 전 먼저 들여다보는 용도 (미스를 통계에 세지 않음).
+        """
+        current = fingerprint if fingerprint is not None else self.fingerprint(key[0])
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.fingerprint != current or (self.ttl > 0 and now - entry.stored_at >= self.ttl):
+                    self._drop_locked(key)
+                    self._stats["expirations"] += 1
                 else:
-                    if current_unique is None or current_unique["constraint_name"] != r["CONSTRAINT_NAME"]:
-                        current_unique = {"constraint_name": r["CONSTRAINT_NAME"], "columns": []}
-                        unique_keys.append(current_unique)
-                    current_unique["columns"].append(r["COLUMN_NAME"])
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return True, entry.value, current
+        if self._shared is not None:
+            text = self._shared.cache_get(self._shared_key(key), current, self.ttl)
+            if text is not None:
+                value = json.loads(text)
+                self._store(key, value, len(text), current)
+                with self._lock:
+                    self._stats["shared_hits"] += 1
+                return True, value, current
+        if count_miss:
+            with self._lock:
+                self._stats["misses"] += 1
+        return False, None, current
 
-            # 4. 인덱스 (STATISTICS, PK/UNIQUE 제외한 일반 인덱스)
-            cur.execute(
-                """
-                SELECT INDEX_NAME AS index_name, COLUMN_NAME AS column_name, SEQ_IN_INDEX AS seq,
-                       NON_UNIQUE AS non_unique
-                FROM information_schema.STATISTICS
-                WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
-                ORDER BY INDEX_NAME, SEQ_IN_INDEX
-                """,
-                (schema_name, table_name),
-            )
-            index_groups: dict[str, list[str]] = {}
-            for r in cur.fetchall():
-                r = dict(r)
-                name = r["index_name"]
-                if name not in index_groups:
-                    index_groups[name] = []
-                index_groups[name].append(r["column_name"])
-            indexes = [
-                {"index_name": name, "columns": cols, "non_unique": True}
-                for name, cols in index_groups.items()
-                if name != "PRIMARY" and not any(u["constraint_name"] == name for u in unique_keys)
+    def put(self, key: tuple[str, str | None, str], value: Any, fingerprint: str) -> None:
+        text = json.dumps(value, ensure_ascii=False, default=str)
+        size = len(text)
+        if self.max_bytes > 0 and size > self.max_bytes:
+            return
+        self._store(key, value, size, fingerprint)
+        if self._shared is not None:
+            self._shared.cache_put(self._shared_key(key), self.name, key[0], text, size, fingerprint)
+
+    def _store(self, key: tuple[str, str | None, str], value: Any, size: int, fingerprint: str) -> None:
+        """메모리(L1)에만 저장."""
+        if self.max_bytes > 0 and size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop_locked(key)
+            self._entries[key] = _CacheEntry(value, size, time.monotonic(), fingerprint)
+            self._bytes += size
+            while self.max_bytes > 0 and self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop_locked(oldest)
+                self._stats["evictions"] += 1
+
+    def invalidate_tables(self, schema_name: str, table_names: list[str], *, schema_entries: bool = True) -> None:
+        """테이블 정의가 바뀐 것을 지문보다 먼저 알았을 때: 그 테이블 항목 삭제.
+
+        schema_entries면 스키마 단위 항목(개요·목록 등)도 지우고 generation을 올린다 (바뀐 것이 확실할 때).
+        """
+        names = {t.lower() for t in table_names}
+        if self._shared is not None:
+            # 공유 키는 JSON 배열 [대상, 스키마, 테이블, 조회 종류...]
+            heads = [*table_names, *([None] if schema_entries else [])]
+            prefixes = [json.dumps([self.name, schema_name, t], ensure_ascii=False)[:-1] + ", " for t in heads]
+            self._shared.cache_invalidate_prefixes(self.name, schema_name, prefixes)
+        with self._lock:
+            if schema_entries:
+                self._generations[schema_name] = self._generations.get(schema_name, 0) + 1
+            stale = [
+                k
+                for k in self._entries
+                if k[0] == schema_name and (schema_entries if k[1] is None else k[1].lower() in names)
             ]
+            for k in stale:
+                self._drop_locked(k)
+            self._stats["invalidations"] += len(stale)
 
-            # 5. 외래키
-            cur.execute(
-                """
-                SELECT kcu.CONSTRAINT_NAME AS fk_name, kcu.COLUMN_NAME AS column_name,
-                       kcu.REFERENCED_TABLE_SCHEMA AS ref_schema, kcu.REFERENCED_TABLE_NAME AS ref_table,
-                       kcu.REFERENCED_COLUMN_NAME AS ref_column,
-                       rc.UPDATE_RULE AS update_rule, rc.DELETE_RULE AS delete_rule
-                FROM information_schema.KEY_COLUMN_USAGE kcu
-                JOIN information_schema.REFERENTIAL_CONSTRAINTS rc
-                  ON kcu.CONSTRAINT_NAME = rc.CONSTRAINT_NAME
-                     AND kcu.TABLE_SCHEMA = rc.CONSTRAINT_SCHEMA
-                WHERE kcu.TABLE_SCHEMA = %s AND kcu.TABLE_NAME = %s AND kcu.REFERENCED_TABLE_NAME IS NOT NULL
-                ORDER BY kcu.CONSTRAINT_NAME, kcu.ORDINAL_POSITION
-                """,
-                (schema_name, table_name),
-            )
-            fk_rows = cur.fetchall()
-            foreign_keys: list[dict[str, Any]] = []
-            fk_by_name: dict[str, dict[str, Any]] = {}
-            for r in fk_rows:
-                r = dict(r)
-                name = r["fk_name"]
-                if name not in fk_by_name:
-                    fk_by_name[name] = {
-                        "constraint_name": name,
-                        "columns": [],
-                        "referenced_schema": r["ref_schema"],
-                        "referenced_table": r["ref_table"],
-                        "referenced_columns": [],
-                        "update_rule": r["update_rule"],
-                        "delete_rule": r["delete_rule"],
-                    }
-                    foreign_keys.append(fk_by_name[name])
-                fk_by_name[name]["columns"].append(r["column_name"])
-                fk_by_name[name]["referenced_columns"].append(r["ref_column"])
-
-            # 6. CHECK 제약 (MySQL 8.0.16+)
-            check_constraints: list[dict[str, Any]] = []
-            try:
-                cur.execute(
-                    """
-                    SELECT CONSTRAINT_NAME AS constraint_name, CHECK_CLAUSE AS check_clause
-                    FROM information_schema.CHECK_CONSTRAINTS
-                    WHERE CONSTRAINT_SCHEMA = %s AND CONSTRAINT_NAME IN (
-                        SELECT CONSTRAINT_NAME FROM information_schema.TABLE_CONSTRAINTS
-                        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND CONSTRAINT_TYPE = 'CHECK'
-                    )
-                    """,
-                    (schema_name, schema_name, table_name),
-                )
-                check_constraints = [dict(r) for r in cur.fetchall()]
-            except Exception:
-                pass  # 구버전 MySQL이면 CHECK_CONSTRAINTS 없을 수 있음
+    def generation(self, schema_name: str) -> int:
+        with self._lock:
+            return self._generations.get(schema_name, 0)
+
+    def clear(self, schema_name: str | None = None) -> None:
+        if self._shared is not None:
+            if schema_name is None:
+                self._shared.cache_clear(self.name)
+            else:
+                self._shared.cache_invalidate(self.name, schema_name)
+        with self._lock:
+            if schema_name is None:
+                self._entries.clear()
+                self._fingerprints.clear()
+                self._bytes = 0
+                return
+            for k in [k for k in self._entries if k[0] == schema_name]:
+                self._drop_locked(k)
+            self._fingerprints.pop(schema_name, None)
 
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
             return {
-                "table": table_info,
-                "columns": columns,
-                "primary_key": pk_cols,
-                "unique_keys": unique_keys,
-                "indexes": indexes,
-                "foreign_keys": foreign_keys,
-                "check_constraints": check_constraints,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "schemas_tracked": len(self._fingerprints),
+                **self._stats,
             }
 
 
-def get_tables_metadata(schema_name: str, table_names: list[str]) -> list[dict[str, Any]]:
-    """여러 테이블에 대한 DDL 메타데이터를 한 번에 조회. 실패한 테이블은 error 필드로 표시."""
-    result: list[dict[str, Any]] = []
+# 동시에 들어온 같은 조회(캐시 미스 포함)는 DB 조회 1번을 공유. 캐시 사용 여부와 무관하게 동작
+_flight = SingleFlight("metadata")
+
+
+def _share(key: tuple[Any, ...], fn: Callable[[], Any], label: str) -> Any:
+    """현재 대상 안에서 같은 key로 진행 중인 조회가 있으면 그 결과를 함께 받는다."""
+    return _flight.do((targets.current_name(), *key), fn, label)
+
+
+# 대상(target)별 캐시. 스키마 이름이 같아도 대상이 다르면 다른 항목
+_caches: dict[str, MetadataCache] = {}
+_caches_lock = threading.Lock()
+
+
+def _target_cache() -> MetadataCache | None:
+    """현재 대상의 메타데이터 캐시 (최초 사용 시 생성). 캐시 미사용 시 None."""
+    if not config.METADATA_CACHE_ENABLED:
+        return None
+    name = targets.current_name()
+    cache = _caches.get(name)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(name)
+            if cache is None:
+                cache = _caches[name] = MetadataCache(
+                    max_bytes=config.METADATA_CACHE_MAX_BYTES,
+                    ttl=config.METADATA_CACHE_TTL,
+                    fingerprint_interval=config.METADATA_CACHE_FINGERPRINT_INTERVAL,
+                    name=name,
+                    shared=shared_state.store(),
+                )
+    return cache
+
+
+def cache_stats() -> dict[str, Any]:
+    """메타데이터 캐시 통계 (hit/miss/eviction 등, 대상이 여럿이면 합계와 대상별 값). 캐시 미사용 시 enabled=False."""
+    if not config.METADATA_CACHE_ENABLED:
+        return {"enabled": False}
+    with _caches_lock:
+        caches = dict(_caches)
+    return {"enabled": True, **targets.merge_stats({name: cache.stats() for name, cache in caches.items()})}
+
+
+def clear_cache(schema_name: str | None = None) -> None:
+    """현재 대상의 캐시 비우기. schema_name 지정 시 해당 스키마 항목만."""
+    cache = _target_cache()
+    if cache is not None:
+        cache.clear(schema_name)
+
+
+def invalidate_tables(schema_name: str, table_names: list[str]) -> None:
+    """현재 대상 캐시에서 정의가 바뀐 테이블(과 스키마 단위 항목) 무효화. diff_schema가 변경 표시로 찾은 테이블용."""
+    cache = _target_cache()
+    if cache is not None and table_names:
+        cache.invalidate_tables(schema_name, table_names)
+
+
+def _cached(tool: str, schema_name: str, table_name: str | None, loader: Callable[[], Any]) -> Any:
+    """캐시에 있으면 반환, 없으면 loader 실행 후 저장. 예외는 캐시하지 않음.
+
+    동시에 미스난 같은 조회는 loader 1번의 결과(또는 예외)를 함께 받는다.
+    """
+    key = (schema_name, table_name, tool)
+    cache = _target_cache()
+    if cache is None:
+        return _share(key, loader, tool)
+    hit, value, fingerprint = cache.get(key)
+    if hit:
+        return value
+
+    def load() -> Any:
+        value = loader()
+        cache.put(key, value, fingerprint)
+        return value
+
+    return _share(key, load, tool)
+
+
+def singleflight_stats() -> dict[str, Any]:
+    """동일 요청 합치기 통계 (실행 수, 합쳐진 요청 수, 진행 중 키 수)."""
+    return {"enabled": config.SINGLEFLIGHT_ENABLED, **_flight.stats()}
+
+
+def encode_list_cursor(schema_name: str, table_name: str) -> str:
+    """list_tables 다음 페이지 커서. 마지막 행의 (스키마, 테이블명)을 불투명 문자열로."""
+    raw = json.dumps([schema_name, table_name], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def list_tables(
+    schema_name: str | None = None,
+    *,
+    page_size: int | None = None,
+    after: tuple[str, str] | None = None,
+    name_prefix: str | None = None,
+    name_like: str | None = None,
+) -> dict[str, Any]:
+    """지정 스키마(또는 전체)의 테이블 목록을 (스키마, 테이블명) 순 키셋 페이지로 반환.
+
+    after는 직전 페이지 마지막 행의 (스키마, 테이블명). 필터·페이지 조건은 모두 SQL WHERE/LIMIT로 처리하며,
+    스키마 미지정 시 ALLOWED_SCHEMAS가 설정돼 있으면 그 스키마만 대상으로 한다.
+    반환: {"tables": [...], "next_cursor": 다음 페이지 커서 또는 None}
+    """
+    limit = page_size or config.MAX_LIST_TABLES_RESULT
+    if config.MAX_LIST_TABLES_RESULT > 0:
+        limit = min(limit, config.MAX_LIST_TABLES_RESULT) if limit > 0 else config.MAX_LIST_TABLES_RESULT
+    variant = json.dumps([limit, after, name_prefix, name_like])
+    return _cached(
+        "list_tables",
+        schema_name or _ALL_SCHEMAS,
+        variant,
+        lambda: _load_table_list(schema_name, limit, after, name_prefix, name_like),
+    )
+
+
+def escape_like(value: str) -> str:
+    """LIKE 패턴에서 문자 그대로 비교하도록 \\, %, _ 이스케이프."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+@failover
+def _load_table_list(
+    schema_name: str | None,
+    limit: int,
+    after: tuple[str, str] | None,
+    name_prefix: str | None,
+    name_like: str | None,
+) -> dict[str, Any]:
+    where = ["TABLE_TYPE = 'BASE TABLE'"]
+    params: list[Any] = []
+    if schema_name:
+        where.append("TABLE_SCHEMA = %s")
+        params.append(schema_name)
+    elif config.ALLOWED_SCHEMAS:
+        where.append(f"TABLE_SCHEMA IN ({', '.join(['%s'] * len(config.ALLOWED_SCHEMAS))})")
+        params.extend(config.ALLOWED_SCHEMAS)
+    else:
+        where.append("TABLE_SCHEMA NOT IN (%s, %s, %s, %s)")
+        params.extend(_SYSTEM_SCHEMAS)
+    if name_prefix:
+        where.append("TABLE_NAME LIKE %s")
+        params.append(escape_like(name_prefix) + "%")
+    if name_like:
+        where.append("TABLE_NAME LIKE %s")
+        params.append(name_like)
+    if after is not None:
+        where.append("(TABLE_SCHEMA > %s OR (TABLE_SCHEMA = %s AND TABLE_NAME > %s))")
+        params.extend((after[0], after[0], after[1]))
+    sql = f"""
+        SELECT TABLE_SCHEMA AS `schema`, TABLE_NAME AS table_name, TABLE_COMMENT AS table_comment
+        FROM information_schema.TABLES
+        WHERE {" AND ".join(where)}
+        ORDER BY TABLE_SCHEMA, TABLE_NAME
+        """
+    if limit > 0:
+        # 다음 페이지 존재 여부 확인용으로 1행 더 조회
+        sql += " LIMIT %s"
+        params.append(limit + 1)
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql, tuple(params))
+            rows = cur.fetchall()
+    tables = [dict(row) for row in rows]
+    next_cursor = None
+    if limit > 0 and len(tables) > limit:
+        tables = tables[:limit]
+        next_cursor = encode_list_cursor(tables[-1]["schema"], tables[-1]["table_name"])
+    return {"tables": tables, "next_cursor": next_cursor}
+
+
+def _in_clause(column: str, values: list[str] | None) -> tuple[str, tuple[str, ...]]:
+    """values가 있으면 `AND column IN (...)` 조건과 파라미터, None이면 스키마 전체 스캔."""
+    if values is None:
+        return "", ()
+    return f" AND {column} IN ({', '.join(['%s'] * len(values))})", tuple(values)
+
+
+@functools.lru_cache(maxsize=16)
+def _server_features(version: str) -> dict[str, bool]:
+    """서버 버전 문자열(연결 핸드셰이크 값이라 추가 왕복 없음)로 information_schema 지원 기능 판단.
+
+    CHECK_CONSTRAINTS: MySQL 8.0.16+, MariaDB 10.2.22+. MariaDB는 CHECK 제약명이 테이블 단위라 TABLE_NAME도 비교.
+    """
+    mariadb = "mariadb" in version.lower()
+    # MariaDB는 복제 호환용 "5.5.5-" 접두어가 붙을 수 있음
+    m = re.match(r"(\d+)\.(\d+)\.(\d+)", version.removeprefix("5.5.5-"))
+    ver = tuple(int(x) for x in m.groups()) if m else (0, 0, 0)
+    return {"mariadb": mariadb, "check_constraints": ver >= ((10, 2, 22) if mariadb else (8, 0, 16))}
+
+
+def _supported_types(types: tuple[str, ...], features: dict[str, bool]) -> tuple[str, ...]:
+    """조회할 제약 종류 중 서버가 지원하는 것만 (CHECK_CONSTRAINTS가 없는 서버면 CHECK 제외)."""
+    if features["check_constraints"]:
+        return types
+    return tuple(t for t in types if t != "CHECK")
+
+
+def _table_columns_sql(
+    schema_name: str, table_names: list[str] | None, column_names: tuple[str, ...] | None = None
+) -> tuple[str, tuple[Any, ...]]:
+    """테이블 정의 + 컬럼 (TABLES JOIN COLUMNS, 컬럼 행마다 테이블 정보 반복).
+
+    column_names가 있으면 그 컬럼만. 해당 컬럼이 없는 테이블도 컬럼 NULL 행 1개로 남긴다(LEFT JOIN).
+    """
+    cond, params = _in_clause("t.TABLE_NAME", table_names)
+    join, column_params = "JOIN", ()
+    column_cond = ""
+    if column_names is not None:
+        column_cond, column_params = _in_clause("c.COLUMN_NAME", list(column_names))
+        join = "LEFT JOIN"
+    return (
+        f"""
+        SELECT t.TABLE_NAME AS table_name, t.ENGINE AS engine, t.TABLE_COLLATION AS table_collation,
+               t.TABLE_COMMENT AS table_comment, t.ROW_FORMAT AS row_format,
+               c.COLUMN_NAME AS column_name, c.COLUMN_TYPE AS data_type, c.IS_NULLABLE AS nullable,
+               c.COLUMN_DEFAULT AS default_value, c.EXTRA AS extra, c.COLUMN_COMMENT AS column_comment
+        FROM information_schema.TABLES t
+        {join} information_schema.COLUMNS c
+          ON c.TABLE_SCHEMA = t.TABLE_SCHEMA AND c.TABLE_NAME = t.TABLE_NAME{column_cond}
+        WHERE t.TABLE_SCHEMA = %s AND t.TABLE_TYPE = 'BASE TABLE'{cond}
+        ORDER BY t.TABLE_NAME, c.ORDINAL_POSITION
+        """,
+        (*column_params, schema_name, *params),
+    )
+
+
+def _tables_sql(schema_name: str, table_names: list[str] | None) -> tuple[str, tuple[Any, ...]]:
+    """테이블 정의만 (컬럼 섹션이 필요 없을 때 존재 확인 겸용)."""
+    cond, params = _in_clause("TABLE_NAME", table_names)
+    return (
+        f"""
+        SELECT TABLE_NAME AS table_name, ENGINE AS engine, TABLE_COLLATION AS table_collation,
+               TABLE_COMMENT AS table_comment, ROW_FORMAT AS row_format
+        FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = %s AND TABLE_TYPE = 'BASE TABLE'{cond}
+        ORDER BY TABLE_NAME
+        """,
+        (schema_name, *params),
+    )
+
+
+def _constraints_sql(
+    schema_name: str,
+    table_names: list[str] | None,
+    features: dict[str, bool],
+    types: tuple[str, ...] = tuple(_CONSTRAINT_TYPES.values()),
+) -> tuple[str, tuple[Any, ...]]:
+    """PK/UNIQUE/FK/CHECK 제약 (TABLE_CONSTRAINTS 기준으로 KEY_COLUMN_USAGE·REFERENTIAL_CONSTRAINTS·CHECK_CONSTRAINTS LEFT JOIN).
+
+    types에 없는 제약 종류는 조회하지 않고, FK·CHECK가 빠지면 해당 뷰 JOIN도 생략.
+    types는 서버가 지원하는 종류만(_supported_types) 1개 이상이어야 한다.
+    """
+    cond, params = _in_clause("tc.TABLE_NAME", table_names)
+    type_list = ", ".join(f"'{t}'" for t in types)
+    rc_col, rc_join = "NULL AS update_rule, NULL AS delete_rule", ""
+    if "FOREIGN KEY" in types:
+        rc_col = "rc.UPDATE_RULE AS update_rule, rc.DELETE_RULE AS delete_rule"
+        rc_join = (
+            "LEFT JOIN information_schema.REFERENTIAL_CONSTRAINTS rc"
+            " ON tc.CONSTRAINT_TYPE = 'FOREIGN KEY' AND rc.CONSTRAINT_SCHEMA = tc.CONSTRAINT_SCHEMA"
+            " AND rc.TABLE_NAME = tc.TABLE_NAME AND rc.CONSTRAINT_NAME = tc.CONSTRAINT_NAME"
+        )
+    if "CHECK" in types:
+        check_col = "cc.CHECK_CLAUSE"
+        check_join = (
+            "LEFT JOIN information_schema.CHECK_CONSTRAINTS cc"
+            " ON tc.CONSTRAINT_TYPE = 'CHECK' AND cc.CONSTRAINT_SCHEMA = tc.CONSTRAINT_SCHEMA"
+            " AND cc.CONSTRAINT_NAME = tc.CONSTRAINT_NAME"
+            + (" AND cc.TABLE_NAME = tc.TABLE_NAME" if features["mariadb"] else "")
+        )
+    else:
+        check_col, check_join = "NULL", ""
+    return (
+        f"""
+        SELECT tc.TABLE_NAME AS _table, tc.CONSTRAINT_NAME AS constraint_name, tc.CONSTRAINT_TYPE AS constraint_type,
+               kcu.COLUMN_NAME AS column_name, kcu.REFERENCED_TABLE_SCHEMA AS ref_schema,
+               kcu.REFERENCED_TABLE_NAME AS ref_table, kcu.REFERENCED_COLUMN_NAME AS ref_column,
+               {rc_col}, {check_col} AS check_clause
+        FROM information_schema.TABLE_CONSTRAINTS tc
+        LEFT JOIN information_schema.KEY_COLUMN_USAGE kcu
+          ON kcu.CONSTRAINT_SCHEMA = tc.CONSTRAINT_SCHEMA AND kcu.TABLE_NAME = tc.TABLE_NAME
+             AND kcu.CONSTRAINT_NAME = tc.CONSTRAINT_NAME
+        {rc_join}
+        {check_join}
+        WHERE tc.TABLE_SCHEMA = %s{cond}
+          AND tc.CONSTRAINT_TYPE IN ({type_list})
+        ORDER BY tc.TABLE_NAME, tc.CONSTRAINT_TYPE, tc.CONSTRAINT_NAME, kcu.ORDINAL_POSITION
+        """,
+        (schema_name, *params),
+    )
+
+
+def _indexes_sql(schema_name: str, table_names: list[str] | None) -> tuple[str, tuple[Any, ...]]:
+    """일반(비고유) 인덱스 컬럼 (STATISTICS). PK·UNIQUE는 NON_UNIQUE = 0이라 제외된다."""
+    cond, params = _in_clause("TABLE_NAME", table_names)
+    return (
+        f"""
+        SELECT TABLE_NAME AS _table, INDEX_NAME AS index_name, COLUMN_NAME AS column_name
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = %s AND NON_UNIQUE = 1{cond}
+        ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX
+        """,
+        (schema_name, *params),
+    )
+
+
+def _run_pipelined(cur: Any, statements: list[tuple[str, tuple[Any, ...]]]) -> list[list[dict[str, Any]]]:
+    """여러 SELECT를 multi-statement 한 번(왕복 1회)으로 보내고 결과 집합을 차례로 읽음. DB_MULTI_STATEMENTS 전용."""
+    cur.execute(";\n".join(cur.mogrify(sql, params) for sql, params in statements))
+    results = [cur.fetchall()]
+    while cur.nextset():
+        results.append(cur.fetchall())
+    return results
+
+
+def _fetch_tables_metadata(
+    cur: Any, schema_name: str, table_names: list[str] | None, projection: Projection | None = None
+) -> dict[str, dict[str, Any]]:
+    """테이블 N개의 메타데이터를 SELECT 3개(테이블+컬럼, 제약, 인덱스)로 가져와 테이블명별로 묶어 반환.
+
+    table_names가 None이면 스키마의 모든 BASE TABLE 대상. 존재하지 않는 테이블은 결과에 없음.
+    DB_MULTI_STATEMENTS면 문들을 왕복 1회로 보내고, 아니면 첫 결과가 비었을 때 나머지를 생략.
+    projection이 있으면 필요한 문만 실행하고, 조회하지 않은 섹션은 빈 목록으로 둔다(잘라내기는 projection.apply).
+    """
+    features = _server_features(cur.connection.get_server_info())
+    if projection is None:
+        first = _table_columns_sql(schema_name, table_names)
+        types: tuple[str, ...] = tuple(_CONSTRAINT_TYPES.values())
+        want_indexes = True
+    else:
+        if "columns" in projection.sections:
+            first = _table_columns_sql(schema_name, table_names, projection.columns)
+        else:
+            first = _tables_sql(schema_name, table_names)
+        types = projection.constraint_types
+        want_indexes = "indexes" in projection.sections
+    # 지원하지 않는 종류를 먼저 빼야 남은 종류가 없을 때 제약 조회를 생략한다 (빈 IN () 방지)
+    types = _supported_types(types, features)
+    constraint_rows: list[dict[str, Any]] = []
+    index_rows: list[dict[str, Any]] = []
+    if config.DB_MULTI_STATEMENTS:
+        statements = [first]
+        if types:
+            statements.append(_constraints_sql(schema_name, table_names, features, types))
+        if want_indexes:
+            statements.append(_indexes_sql(schema_name, table_names))
+        results = iter(_run_pipelined(cur, statements))
+        table_rows = next(results)
+        if types:
+            constraint_rows = next(results)
+        if want_indexes:
+            index_rows = next(results)
+    else:
+        cur.execute(*first)
+        table_rows = cur.fetchall()
+        if not table_rows:
+            return {}
+        # 이후 조회는 실제 존재하는 테이블로 한정 (전체 스캔이면 그대로 전체)
+        found = None if table_names is None else list(dict.fromkeys(r["table_name"] for r in table_rows))
+        if types:
+            cur.execute(*_constraints_sql(schema_name, found, features, types))
+            constraint_rows = cur.fetchall()
+        if want_indexes:
+            cur.execute(*_indexes_sql(schema_name, found))
+            index_rows = cur.fetchall()
+
+    # 1. 테이블 정의 + 컬럼
+    result: dict[str, dict[str, Any]] = {}
+    for r in table_rows:
+        entry = result.get(r["table_name"])
+        if entry is None:
+            entry = {
+                "table": {k: r[k] for k in ("table_name", "engine", "table_collation", "table_comment", "row_format")},
+                "columns": [],
+                "primary_key": [],
+                "unique_keys": [],  # [{ constraint_name, columns: [] }]
+                "indexes": [],
+                "foreign_keys": [],
+                "check_constraints": [],
+            }
+            result[r["table_name"]] = entry
+        if r.get("column_name") is not None:
+            entry["columns"].append({k: r[k] for k in COLUMN_FIELDS})
+
+    # 2. 제약: 행은 (테이블, 제약 종류, 제약명, 컬럼 순서) 순
+    current: dict[str, Any] | None = None
+    current_key: tuple[str, str] | None = None
+    for r in constraint_rows:
+        entry = result.get(r["_table"])
+        if entry is None:
+            continue
+        ctype = r["constraint_type"]
+        if ctype == "PRIMARY KEY":
+            entry["primary_key"].append(r["column_name"])
+            continue
+        if ctype == "CHECK":
+            entry["check_constraints"].append(
+                {"constraint_name": r["constraint_name"], "check_clause": r["check_clause"]}
+            )
+            continue
+        key = (r["_table"], r["constraint_name"])
+        if current is None or current_key != key:
+            current_key = key
+            if ctype == "UNIQUE":
+                current = {"constraint_name": r["constraint_name"], "columns": []}
+                entry["unique_keys"].append(current)
+            else:
+                current = {
+                    "constraint_name": r["constraint_name"],
+                    "columns": [],
+                    "referenced_schema": r["ref_schema"],
+                    "referenced_table": r["ref_table"],
+                    "referenced_columns": [],
+                    "update_rule": r["update_rule"],
+                    "delete_rule": r["delete_rule"],
+                }
+                entry["foreign_keys"].append(current)
+        current["columns"].append(r["column_name"])
+        if ctype == "FOREIGN KEY":
+            current["referenced_columns"].append(r["ref_column"])
+
+    # 3. 인덱스 (PK/UNIQUE 제외한 일반 인덱스)
+    index_groups: dict[str, dict[str, list[str]]] = {}
+    for r in index_rows:
+        if r["_table"] not in result:
+            continue
+        groups = index_groups.setdefault(r["_table"], {})
+        groups.setdefault(r["index_name"], []).append(r["column_name"])
+    for name, groups in index_groups.items():
+        result[name]["indexes"] = [
+            {"index_name": index_name, "columns": cols, "non_unique": True} for index_name, cols in groups.items()
+        ]
+
+    return result
+
+
+def _lookup(found: dict[str, dict[str, Any]], table_name: str) -> dict[str, Any] | None:
+    """요청한 테이블명으로 결과 조회. lower_case_table_names 환경을 위해 대소문자 무시 비교도 시도."""
+    entry = found.get(table_name)
+    if entry is None:
+        lowered = table_name.lower()
+        entry = next((v for k, v in found.items() if k.lower() == lowered), None)
+    return entry
+
+
+def _projected_tool(projection: Projection | None) -> str:
+    """캐시·single-flight 키의 tool 부분. 전체 조회는 기존 키 그대로, 부분 조회는 projection별로 구분."""
+    return "get_table_metadata" if projection is None else f"get_table_metadata|{projection.key}"
+
+
+def get_table_metadata(schema_name: str, table_name: str, projection: Projection | None = None) -> dict[str, Any]:
+    """한 테이블에 대한 DDL 문서용 메타데이터 반환. projection이 있으면 요청한 부분만 (전체 항목이 캐시에 있으면 거기서 잘라냄)."""
+    if projection is not None:
+        cache = _target_cache()
+        if cache is not None:
+            hit, value, _ = cache.get((schema_name, table_name, "get_table_metadata"), count_miss=False)
+            if hit:
+                return projection.apply(value)
+    return _cached(
+        _projected_tool(projection),
+        schema_name,
+        table_name,
+        lambda: _load_table_metadata(schema_name, table_name, projection),
+    )
+
+
+def _load_table_metadata(schema_name: str, table_name: str, projection: Projection | None = None) -> dict[str, Any]:
+    entry = _fetch_chunk(schema_name, [table_name], projection).get(table_name)
+    if entry is None:
+        raise MetadataError(f"스키마 또는 테이블이 존재하지 않습니다: {schema_name}.{table_name}")
+    return entry
+
+
+@failover
+def _fetch_chunk(
+    schema_name: str, table_names: list[str], projection: Projection | None = None
+) -> dict[str, dict[str, Any]]:
+    """연결 1개로 테이블 묶음 조회. 결과 키는 요청한 테이블명."""
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            fetched = _fetch_tables_metadata(cur, schema_name, table_names, projection)
+    found: dict[str, dict[str, Any]] = {}
     for table_name in table_names:
+        entry = _lookup(fetched, table_name)
+        if entry is not None:
+            found[table_name] = entry if projection is None else projection.apply(entry)
+    return found
+
+
+_fanout_executor: ThreadPoolExecutor | None = None
+if config.METADATA_FETCH_PARALLELISM > 1:
+    _fanout_executor = ThreadPoolExecutor(
+        max_workers=config.METADATA_FETCH_PARALLELISM, thread_name_prefix="metadata-fanout"
+    )
+
+
+def _fetch_missing(
+    schema_name: str, table_names: list[str], projection: Projection | None = None
+) -> tuple[dict[str, dict[str, Any]], dict[str, str]]:
+    """테이블 메타데이터 조회. (찾은 항목, 실패한 테이블별 오류 메시지) 반환.
+
+    METADATA_FETCH_PARALLELISM > 1이면 METADATA_FETCH_CHUNK_SIZE개씩 나눠 여러 연결에서 동시에 조회하고,
+    한 묶음의 실패는 그 묶음의 테이블에만 오류로 남긴다.
+    """
+    chunk_size = max(1, config.METADATA_FETCH_CHUNK_SIZE)
+    if _fanout_executor is None or len(table_names) <= chunk_size:
+        return _fetch_chunk(schema_name, table_names, projection), {}
+    chunks = [table_names[i : i + chunk_size] for i in range(0, len(table_names), chunk_size)]
+    # 지표(CallStats) 등 contextvars를 병렬 조회 스레드에도 전달
+    futures = [
+        _fanout_executor.submit(contextvars.copy_context().run, _fetch_chunk, schema_name, chunk, projection)
+        for chunk in chunks
+    ]
+    found: dict[str, dict[str, Any]] = {}
+    errors: dict[str, str] = {}
+    for chunk, future in zip(chunks, futures):
         try:
-            result.append(get_table_metadata(schema_name, table_name))
-        except MetadataError as e:
-            result.append({"error": str(e), "schema": schema_name, "table_name": table_name})
+            found.update(future.result())
         except Exception as e:
-            result.append({"error": str(e), "schema": schema_name, "table_name": table_name})
+            errors.update((table_name, str(e)) for table_name in chunk)
+    return found, errors
+
+
+def get_tables_metadata(
+    schema_name: str, table_names: list[str], projection: Projection | None = None
+) -> list[dict[str, Any]]:
+    """여러 테이블에 대한 DDL 메타데이터를 한 번에 조회. 실패한 테이블은 error 필드로 표시.
+
+    테이블 수와 무관하게 연결 1개(병렬 조회 시 묶음당 1개), information_schema 뷰별 쿼리 1회로 처리.
+    캐시 사용 시 get_table_metadata와 같은 테이블별 캐시 항목을 공유하고, 미스난 테이블만 조회한다.
+    projection이 있으면 전체 항목 캐시에서 잘라내고, 나머지만 필요한 쿼리로 조회한다.
+    결과는 요청 순서를 유지한다.
+    """
+    tool = _projected_tool(projection)
+    if not table_names:
+        return []
+    found: dict[str, dict[str, Any]] = {}
+    errors: dict[str, str] = {}
+    try:
+        missing = list(dict.fromkeys(table_names))
+        fingerprint = ""
+        cache = _target_cache()
+        if cache is not None:
+            missing = []
+            fingerprint = cache.fingerprint(schema_name)
+            for table_name in dict.fromkeys(table_names):
+                if projection is not None:
+                    hit, value, _ = cache.get(
+                        (schema_name, table_name, "get_table_metadata"), fingerprint, count_miss=False
+                    )
+                    if hit:
+                        found[table_name] = projection.apply(value)
+                        continue
+                hit, value, _ = cache.get((schema_name, table_name, tool), fingerprint)
+                if hit:
+                    found[table_name] = value
+                else:
+                    missing.append(table_name)
+        if missing:
+
+            def load() -> tuple[dict[str, dict[str, Any]], dict[str, str]]:
+                fetched, errors = _fetch_missing(schema_name, missing, projection)
+                if cache is not None:
+                    for table_name, entry in fetched.items():
+                        cache.put((schema_name, table_name, tool), entry, fingerprint)
+                return fetched, errors
+
+            # 같은 테이블 묶음(같은 projection)이 동시에 미스나면 조회 1번을 공유
+            fetched, errors = _share((schema_name, tuple(missing), tool, "batch"), load, "get_tables_metadata")
+            found.update(fetched)
+    except Exception as e:
+        return [{"error": str(e), "schema": schema_name, "table_name": t} for t in table_names]
+    result: list[dict[str, Any]] = []
+    for table_name in table_names:
+        entry = found.get(table_name)
+        if entry is not None:
+            result.append(entry)
+            continue
+        result.append({
+            "error": errors.get(table_name, f"스키마 또는 테이블이 존재하지 않습니다: {schema_name}.{table_name}"),
+            "schema": schema_name,
+            "table_name": table_name,
+        })
     return result
 
 
+@failover
+def get_schema_tables_metadata(schema_name: str) -> dict[str, dict[str, Any]]:
+    """스키마의 모든 BASE TABLE 메타데이터를 뷰별 1회 전체 스캔으로 조회 (스냅샷 등 일괄 작업용). 키는 테이블명."""
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            return _fetch_tables_metadata(cur, schema_name, None)
+
+
 def get_schema_overview(schema_name: str) -> dict[str, Any]:
     """한 스키마의 테이블 목록과 FK 관계 요약 반환 (DDL 문서 목차·개요용)."""
+    return _cached("get_schema_overview", schema_name, None, lambda: _load_schema_overview(schema_name))
+
+
+@failover
+def _load_schema_overview(schema_name: str) -> dict[str, Any]:
     with get_connection() as conn:
         with conn.cursor() as cur:
             cur.execute(
@@ -250,3 +1030,262 @@ def get_schema_overview(schema_name: str) -> dict[str, Any]:
                 })
 
             return {"schema": schema_name, "tables": tables, "relationships": relationships}
+
+
+def warm_schema(schema_name: str) -> tuple[str, int]:
+    """현재 대상의 스키마 1개를 캐시에 미리 적재: 테이블별 메타데이터(뷰별 전체 스캔 1회), 개요, 테이블 목록 첫 페이지.
+
+    (적재에 쓴 스키마 지문, 테이블 수) 반환. 지문을 먼저 확인하므로 적재 도중 스키마가 바뀌면 다음 확인 때 무효화된다.
+    """
+    cache = _target_cache()
+    if cache is None:
+        raise MetadataError("메타데이터 캐시를 사용하지 않아 미리 적재할 수 없습니다.")
+    fingerprint = cache.fingerprint(schema_name)
+    version = schema_fingerprint(schema_name)
+    entries = get_schema_tables_metadata(schema_name)
+    for table_name, entry in entries.items():
+        cache.put((schema_name, table_name, "get_table_metadata"), entry, fingerprint)
+    get_schema_overview(schema_name)
+    list_tables(schema_name)
+    return version, len(entries)
+
+
+# SHOW CREATE TABLE을 multi-statement 한 번에 보낼 테이블 수
+_SHOW_BATCH = 200
+
+
+def _show_create_sequential(cur: Any, schema_name: str, table_names: list[str]) -> dict[str, str]:
+    """SHOW CREATE TABLE을 테이블마다 실행. 그 사이 삭제된 테이블(ER_NO_SUCH_TABLE 등)은 건너뛴다."""
+    found: dict[str, str] = {}
+    for table_name in table_names:
+        try:
+            cur.execute(f"SHOW CREATE TABLE {ddl.quote_name(schema_name)}.{ddl.quote_name(table_name)}")
+        except pymysql.err.ProgrammingError:
+            continue
+        row = cur.fetchone()
+        if row is not None and "Create Table" in row:
+            found[table_name] = row["Create Table"]
+    return found
+
+
+@failover
+def _fetch_create_tables(schema_name: str, table_names: list[str]) -> dict[str, str]:
+    """연결 1개로 테이블명 -> SHOW CREATE TABLE 결과.
+
+    먼저 TABLES에서 실제 이름을 확인하고(없는 테이블·뷰 제외), DB_MULTI_STATEMENTS면 _SHOW_BATCH개씩 왕복 1회로 보낸다.
+    묶음 중간에 오류가 나면(그 사이 삭제된 테이블 등) 그 묶음의 남은 테이블은 하나씩 다시 실행한다.
+    """
+    cond, params = _in_clause("TABLE_NAME", table_names)
+    found: dict[str, str] = {}
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT TABLE_NAME AS table_name
+                FROM information_schema.TABLES
+                WHERE TABLE_SCHEMA = %s AND TABLE_TYPE = 'BASE TABLE'{cond}
+                ORDER BY TABLE_NAME
+                """,
+                (schema_name, *params),
+            )
+            names = [r["table_name"] for r in cur.fetchall()]
+            if not config.DB_MULTI_STATEMENTS:
+                return _show_create_sequential(cur, schema_name, names)
+            for i in range(0, len(names), _SHOW_BATCH):
+                batch = names[i : i + _SHOW_BATCH]
+                done = 0
+                try:
+                    cur.execute(";\n".join(
+                        f"SHOW CREATE TABLE {ddl.quote_name(schema_name)}.{ddl.quote_name(t)}" for t in batch
+                    ))
+                    while True:
+                        row = cur.fetchone()
+                        if row is not None and "Create Table" in row:
+                            found[batch[done]] = row["Create Table"]
+                        done += 1
+                        if done == len(batch) or not cur.nextset():
+                            break
+                except pymysql.err.ProgrammingError:
+                    found.update(_show_create_sequential(cur, schema_name, batch[done:]))
+    return found
+
+
+def check_table_count(table_names: list[str]) -> None:
+    """일괄 조회 테이블 수 상한 (MAX_TABLES_PER_REQUEST). 스키마 전체를 한 번에 읽는 경로를 막는다."""
+    if len(table_names) > config.MAX_TABLES_PER_REQUEST:
+        raise MetadataError(f"한 번에 조회 가능한 테이블 수는 {config.MAX_TABLES_PER_REQUEST}개 이하여야 합니다.")
+
+
+def get_create_tables(schema_name: str, table_names: list[str]) -> dict[str, Any]:
+    """테이블 N개(MAX_TABLES_PER_REQUEST개 이하)의 CREATE TABLE 문. 요청 순서, 없는 테이블은 error 항목.
+
+    CREATE_TABLE_SOURCE=show(기본)면 SHOW CREATE TABLE을 연결 1개로 일괄 조회하고, render면 테이블 메타데이터로 만든다.
+    캐시 사용 시 테이블별로 캐시하며, 무효화는 다른 메타데이터와 같은 스키마 지문 기준.
+    스키마 전체는 list_tables 페이지 단위로 나눠 부른다 (server.get_create_table).
+    """
+    check_table_count(table_names)
+    if config.CREATE_TABLE_SOURCE == "render":
+        return _render_create_tables(schema_name, table_names)
+    tool = "get_create_table"
+    found: dict[str, str] = {}
+    cache = _target_cache()
+    fingerprint = ""
+    missing = list(dict.fromkeys(table_names))
+    if cache is not None:
+        fingerprint = cache.fingerprint(schema_name)
+        requested, missing = missing, []
+        for table_name in requested:
+            hit, value, _ = cache.get((schema_name, table_name, tool), fingerprint)
+            if hit:
+                found[table_name] = value
+            else:
+                missing.append(table_name)
+    if missing:
+
+        def load() -> dict[str, str]:
+            fetched = _fetch_create_tables(schema_name, missing)
+            if cache is not None:
+                for table_name, statement in fetched.items():
+                    cache.put((schema_name, table_name, tool), statement, fingerprint)
+            return fetched
+
+        fetched = _share((schema_name, tuple(missing), tool, "batch"), load, tool)
+        for table_name in missing:
+            statement = _lookup(fetched, table_name)
+            if statement is not None:
+                found[table_name] = statement
+    return ddl.response(schema_name, table_names, found, "show")
+
+
+def _render_create_tables(schema_name: str, table_names: list[str]) -> dict[str, Any]:
+    """CREATE_TABLE_SOURCE=render: get_tables_metadata(캐시 공유) 결과로 CREATE TABLE 문을 만든다."""
+    found: dict[str, str] = {}
+    for table_name, entry in zip(table_names, get_tables_metadata(schema_name, table_names)):
+        if "error" not in entry:
+            found[table_name] = ddl.render_create_table(entry)
+        elif not entry["error"].startswith("스키마 또는 테이블이 존재하지 않습니다"):
+            raise MetadataError(entry["error"])
+    return ddl.response(schema_name, table_names, found, "rendered")
+
+
+def list_schemas() -> list[str]:
+    """테이블이 있는 사용자 스키마 목록 (ALLOWED_SCHEMAS가 있으면 그 목록)."""
+    if config.ALLOWED_SCHEMAS:
+        return list(config.ALLOWED_SCHEMAS)
+    return _share((_ALL_SCHEMAS, None, "list_schemas"), _load_schemas, "list_schemas")
+
+
+@failover
+def _load_schemas() -> list[str]:
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT DISTINCT TABLE_SCHEMA AS schema_name
+                FROM information_schema.TABLES
+                WHERE TABLE_SCHEMA NOT IN (%s, %s, %s, %s)
+                ORDER BY TABLE_SCHEMA
+                """,
+                _SYSTEM_SCHEMAS,
+            )
+            return [r["schema_name"] for r in cur.fetchall()]
+
+
+def schema_fingerprint(schema_name: str) -> str:
+    """스키마 지문. 캐시 사용 시 캐시가 확인한 값을 재사용(METADATA_CACHE_FINGERPRINT_INTERVAL).
+
+    invalidate_tables로 지문이 놓친 변경을 반영했으면 그 횟수를 덧붙여, 지문으로 갱신 여부를 정하는
+    검색 색인·prewarm도 다시 만들게 한다.
+    """
+    cache = _target_cache()
+    if cache is not None:
+        fingerprint, generation = cache.fingerprint(schema_name), cache.generation(schema_name)
+        return fingerprint if generation == 0 else f"{fingerprint}+{generation}"
+    return _share((schema_name, None, "fingerprint"), lambda: _schema_fingerprint(schema_name), "fingerprint")
+
+
+def version_token(*parts: Any) -> str:
+    """응답 버전 토큰: 현재 대상과 parts(조회 종류·이름·지문)의 짧은 해시. 클라이언트는 if_none_match로 그대로 돌려준다."""
+    raw = "\x1f".join(str(p) for p in (targets.current_name(), *parts))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def content_version(value: Any, *parts: Any) -> str:
+    """응답 본문 value의 버전 토큰 (내용 해시). 내용이 같으면 같은 토큰이다."""
+    raw = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return version_token(*parts, hashlib.sha256(raw.encode("utf-8")).hexdigest())
+
+
+@failover
+def _load_table_stamps(schema_name: str, table_names: list[str] | None) -> dict[str, int]:
+    """테이블별 변경 표시 (정의 뷰 전체). METADATA_CACHE_DEEP_FINGERPRINT면 합계가 곧 스키마 지문."""
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(*_stamps_sql(schema_name, table_names, _server_features(conn.get_server_info())))
+            return {r["table_name"]: int(r["stamp"]) for r in cur.fetchall()}
+
+
+def table_stamps(schema_name: str, table_names: list[str] | None = None) -> dict[str, int]:
+    """테이블명 -> 변경 표시. table_names가 있으면 그 테이블 행만 읽는다 (캐시하지 않음, 동시 조회는 1번으로 합침)."""
+    key = (schema_name, None if table_names is None else tuple(table_names), "table_stamps")
+    return _share(key, lambda: _load_table_stamps(schema_name, table_names), "table_stamps")
+
+
+def revalidate_tables(schema_name: str, table_names: list[str]) -> None:
+    """if_none_match 비교 전: 테이블별 변경 표시(요청한 테이블 행만 읽는 쿼리 1개)를 캐시 항목과 함께 기억한 값과 비교.
+
+    다르면(정의가 바뀜) 그 테이블과 스키마 단위 캐시 항목을 지우고, 기억한 값이 없으면 그 테이블 항목만 지운다
+    (캐시 항목이 언제 읽은 것인지 알 수 없으므로). 스키마 지문이 놓치는 ALTER(컬럼 추가, FK 규칙·CHECK 식 변경 등)도
+    응답 내용에 반영되어 version이 달라진다. 캐시 미사용 시 본문을 항상 DB에서 읽으므로 할 일 없음.
+    """
+    cache = _target_cache()
+    if cache is None or not table_names:
+        return
+    stamps = table_stamps(schema_name, table_names)
+    fingerprint = cache.fingerprint(schema_name)
+    changed, unknown = [], []
+    for table_name, stamp in stamps.items():
+        hit, seen, _ = cache.get((schema_name, table_name.lower(), "table_stamp"), fingerprint, count_miss=False)
+        if not hit:
+            unknown.append(table_name)
+        elif seen != stamp:
+            changed.append(table_name)
+    if changed:
+        cache.invalidate_tables(schema_name, changed)
+    if unknown:
+        cache.invalidate_tables(schema_name, unknown, schema_entries=False)
+    for table_name in (*changed, *unknown):
+        cache.put((schema_name, table_name.lower(), "table_stamp"), stamps[table_name], fingerprint)
+
+
+@failover
+def search_rows(schema_name: str) -> tuple[list[tuple[str, str]], list[tuple[str, str, str, str]]]:
+    """검색 인덱스용 일괄 조회: (테이블명, 코멘트) 목록과 (테이블명, 컬럼명, 타입, 코멘트) 목록. 연결 1개, SELECT 2개."""
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT TABLE_NAME AS table_name, TABLE_COMMENT AS table_comment
+                FROM information_schema.TABLES
+                WHERE TABLE_SCHEMA = %s AND TABLE_TYPE = 'BASE TABLE'
+                ORDER BY TABLE_NAME
+                """,
+                (schema_name,),
+            )
+            tables = [(r["table_name"], r["table_comment"] or "") for r in cur.fetchall()]
+            cur.execute(
+                """
+                SELECT c.TABLE_NAME AS table_name, c.COLUMN_NAME AS column_name, c.COLUMN_TYPE AS data_type,
+                       c.COLUMN_COMMENT AS column_comment
+                FROM information_schema.COLUMNS c
+                JOIN information_schema.TABLES t ON t.TABLE_SCHEMA = c.TABLE_SCHEMA AND t.TABLE_NAME = c.TABLE_NAME
+                WHERE c.TABLE_SCHEMA = %s AND t.TABLE_TYPE = 'BASE TABLE'
+                ORDER BY c.TABLE_NAME, c.ORDINAL_POSITION
+                """,
+                (schema_name,),
+            )
+            columns = [
+                (r["table_name"], r["column_name"], r["data_type"] or "", r["column_comment"] or "")
+                for r in cur.fetchall()
+            ]
+    return tables, columns
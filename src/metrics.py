@@ -0,0 +1,264 @@
+"""서버 내장 지표: Tool별 지연 히스토그램, SQL 문/행 수, 단계별 시간, 제한·대기 통계.
+
+호출 1건의 SQL 통계는 contextvars로 전달되는 CallStats에 모은다. DB 작업 스레드로 넘길 때는
+contextvars.copy_context().run으로 감싸 같은 CallStats를 공유한다.
+"""
+import bisect
+import contextvars
+import math
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+from . import config
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000, 10000, 100000)
+
+
+class Histogram:
+    """Prometheus 방식 누적 버킷 히스토그램 (레이블 조합별)."""
+
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...], label_names: tuple[str, ...]) -> None:
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        self.label_names = label_names
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, ...], list[Any]] = {}  # labels -> [버킷별 개수, 합, 개수]
+
+    def observe(self, value: float, *labels: str) -> None:
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._series[labels] = series
+            series[0][idx] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self) -> dict[tuple[str, ...], tuple[list[int], float, int]]:
+        with self._lock:
+            return {k: (list(v[0]), v[1], v[2]) for k, v in self._series.items()}
+
+    def quantile(self, q: float, counts: list[int], total: int) -> float | None:
+        """버킷 경계 선형 보간으로 근사한 분위수."""
+        if total == 0:
+            return None
+        rank = q * total
+        seen = 0
+        for i, c in enumerate(counts):
+            if c and seen + c >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * ((rank - seen) / c)
+            seen += c
+        return self.buckets[-1]
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, (counts, total_sum, total) in sorted(self.snapshot().items()):
+            base = _labels(self.label_names, labels)
+            cumulative = 0
+            for bound, c in zip(self.buckets, counts):
+                cumulative += c
+                yield f"{self.name}_bucket{_labels(self.label_names + ('le',), labels + (_fmt(bound),))} {cumulative}"
+            yield f"{self.name}_bucket{_labels(self.label_names + ('le',), labels + ('+Inf',))} {total}"
+            yield f"{self.name}_sum{base} {_fmt(total_sum)}"
+            yield f"{self.name}_count{base} {total}"
+
+
+class Counter:
+    """레이블 조합별 누적 카운터."""
+
+    def __init__(self, name: str, help_text: str, label_names: tuple[str, ...]) -> None:
+        self.name = name
+        self.help = help_text
+        self.label_names = label_names
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + value
+
+    def snapshot(self) -> dict[tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in sorted(self.snapshot().items()):
+            yield f"{self.name}{_labels(self.label_names, labels)} {_fmt(value)}"
+
+
+def _fmt(value: float) -> str:
+    if isinstance(value, float) and (math.isinf(value) or math.isnan(value)):
+        return str(value)
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+TOOL_REQUESTS = Counter("mcp_tool_requests_total", "Tool 호출 수 (결과·사유별)", ("tool", "status", "reason"))
+TOOL_DURATION = Histogram("mcp_tool_duration_seconds", "Tool 호출 전체 지연(초)", LATENCY_BUCKETS, ("tool",))
+TOOL_STATEMENTS = Histogram("mcp_tool_sql_statements", "호출당 실행한 SQL 문 수", COUNT_BUCKETS, ("tool",))
+TOOL_ROWS = Histogram("mcp_tool_rows_fetched", "호출당 가져온 행 수", COUNT_BUCKETS, ("tool",))
+PHASE_SECONDS = Counter(
+    "mcp_tool_phase_seconds_total", "단계별 누적 시간(초): connect/execute/fetch/shape/encode", ("tool", "phase")
+)
+ADMISSION_WAIT = Histogram("mcp_admission_wait_seconds", "동시 실행 슬롯 대기 시간(초)", LATENCY_BUCKETS, ())
+COALESCED = Counter("mcp_coalesced_requests_total", "진행 중인 같은 조회에 합쳐진 요청 수", ("key",))
+
+_HISTOGRAMS = (TOOL_DURATION, TOOL_STATEMENTS, TOOL_ROWS, ADMISSION_WAIT)
+_COUNTERS = (TOOL_REQUESTS, PHASE_SECONDS, COALESCED)
+
+
+class CallStats:
+    """Tool 호출 1건 동안의 SQL 문 수, 행 수, 단계별 시간. 병렬 조회 스레드에서도 갱신되므로 잠금 사용.
+
+    work는 DB 작업 스레드에서 보낸 총 시간, encode는 JSON 직렬화 시간.
+    """
+    __slots__ = ("_lock", "started", "statements", "rows", "connect", "execute", "fetch", "work", "encode")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.statements = 0
+        self.rows = 0
+        self.connect = 0.0
+        self.execute = 0.0
+        self.fetch = 0.0
+        self.work: float | None = None
+        self.encode: float | None = None
+
+    def add(self, *, statements: int = 0, rows: int = 0, connect: float = 0.0, execute: float = 0.0, fetch: float = 0.0) -> None:
+        with self._lock:
+            self.statements += statements
+            self.rows += rows
+            self.connect += connect
+            self.execute += execute
+            self.fetch += fetch
+
+
+_current: contextvars.ContextVar[CallStats | None] = contextvars.ContextVar("mcp_call_stats", default=None)
+
+
+def current_call() -> CallStats | None:
+    """현재 Tool 호출의 CallStats. 지표 비활성 또는 Tool 밖이면 None."""
+    return _current.get()
+
+
+def start_call() -> CallStats | None:
+    """현재 컨텍스트에 새 CallStats를 연결. 이후 copy_context()로 넘긴 스레드에서도 같은 객체를 갱신."""
+    if not config.METRICS_ENABLED:
+        return None
+    stats = CallStats()
+    _current.set(stats)
+    return stats
+
+
+def timed_run(fn: Callable[..., Any], *args: Any) -> Any:
+    """fn을 실행하고 소요 시간을 현재 CallStats.work에 기록. DB 작업 스레드에서 호출."""
+    start = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        call = _current.get()
+        if call is not None:
+            call.work = time.perf_counter() - start
+
+
+def record_call(tool: str, status: str, reason: str | None, call: CallStats | None) -> None:
+    """Tool 호출 1건 기록. 가공(shape) 시간 = DB 스레드 총 시간 - connect/execute/fetch."""
+    if call is None:
+        return
+    TOOL_REQUESTS.inc(1, tool, status, reason or "")
+    TOOL_DURATION.observe(time.perf_counter() - call.started, tool)
+    if call.work is None:
+        return  # 검증·처리량 제한 등으로 DB 작업 전에 끝난 호출
+    TOOL_STATEMENTS.observe(call.statements, tool)
+    TOOL_ROWS.observe(call.rows, tool)
+    PHASE_SECONDS.inc(call.connect, tool, "connect")
+    PHASE_SECONDS.inc(call.execute, tool, "execute")
+    PHASE_SECONDS.inc(call.fetch, tool, "fetch")
+    PHASE_SECONDS.inc(max(0.0, call.work - call.connect - call.execute - call.fetch), tool, "shape")
+    if call.encode is not None:
+        PHASE_SECONDS.inc(call.encode, tool, "encode")
+
+
+def record_admission_wait(seconds: float) -> None:
+    if config.METRICS_ENABLED:
+        ADMISSION_WAIT.observe(seconds)
+
+
+def record_coalesced(key: str) -> None:
+    """single-flight로 합쳐진(DB를 다시 조회하지 않은) 요청 1건. key는 Tool 이름 등 조회 종류."""
+    if config.METRICS_ENABLED:
+        COALESCED.inc(1, key)
+
+
+def _gauges(prefix: str, stats: dict[str, Any]) -> Iterable[str]:
+    for key, value in stats.items():
+        if isinstance(value, bool):
+            value = int(value)
+        if isinstance(value, (int, float)):
+            name = f"mcp_{prefix}_{key}"
+            yield f"# TYPE {name} gauge"
+            yield f"{name} {_fmt(value)}"
+
+
+def render_prometheus(components: dict[str, dict[str, Any]]) -> str:
+    """Prometheus 텍스트 형식. components는 {접두어: 통계 dict} (풀·캐시·제한기 등 수치 항목을 gauge로)."""
+    lines: list[str] = []
+    for metric in _COUNTERS + _HISTOGRAMS:
+        lines.extend(metric.render())
+    for prefix, stats in components.items():
+        lines.extend(_gauges(prefix, stats))
+    return "\n".join(lines) + "\n"
+
+
+def summary() -> dict[str, Any]:
+    """server_stats용 요약: Tool별 호출 수·오류 수·지연 분위수(근사)·평균 SQL 문/행 수·단계별 시간."""
+    tools: dict[str, dict[str, Any]] = {}
+    for (tool, status, reason), count in TOOL_REQUESTS.snapshot().items():
+        t = tools.setdefault(tool, {"calls": 0, "rejected": {}})
+        t["calls"] += int(count)
+        if status != "success":
+            t["rejected"][reason] = t["rejected"].get(reason, 0) + int(count)
+    for (tool,), (counts, total_sum, total) in TOOL_DURATION.snapshot().items():
+        t = tools.setdefault(tool, {"calls": 0, "rejected": {}})
+        t["latency_ms"] = {
+            "avg": round(total_sum / total * 1000, 3) if total else None,
+            **{
+                f"p{int(q * 100)}": (round(v * 1000, 3) if (v := TOOL_DURATION.quantile(q, counts, total)) is not None else None)
+                for q in (0.5, 0.95, 0.99)
+            },
+        }
+    for hist, key in ((TOOL_STATEMENTS, "avg_sql_statements"), (TOOL_ROWS, "avg_rows_fetched")):
+        for (tool,), (_, total_sum, total) in hist.snapshot().items():
+            tools.setdefault(tool, {"calls": 0, "rejected": {}})[key] = round(total_sum / total, 2) if total else None
+    for (tool, phase), seconds in PHASE_SECONDS.snapshot().items():
+        tools.setdefault(tool, {"calls": 0, "rejected": {}}).setdefault("phase_seconds", {})[phase] = round(seconds, 6)
+    wait = ADMISSION_WAIT.snapshot().get(())
+    admission = None
+    if wait is not None:
+        counts, total_sum, total = wait
+        p99 = ADMISSION_WAIT.quantile(0.99, counts, total)
+        admission = {
+            "count": total,
+            "avg_ms": round(total_sum / total * 1000, 3) if total else None,
+            "p99_ms": round(p99 * 1000, 3) if p99 is not None else None,
+        }
+    return {"enabled": config.METRICS_ENABLED, "tools": tools, "admission_wait": admission}
@@ -0,0 +1,176 @@
+"""캐시 미리 채우기(prewarm)와 백그라운드 갱신.
+
+서버 시작 시 대상·스키마마다 metadata.warm_schema를 한 번 실행해 첫 요청부터 캐시가 맞도록 하고,
+이후 PREWARM_REFRESH_INTERVAL(± PREWARM_REFRESH_JITTER)마다 스키마 지문을 확인해 바뀐 스키마만 다시 적재한다.
+적재는 PREWARM_CONCURRENCY개까지만 동시에 하며, 대상 풀에 연결을 기다리는 요청이 있거나 회로 차단기가
+닫혀 있지 않으면 그 스키마는 다음 주기로 미룬다 (실시간 요청과 연결을 다투지 않도록).
+여러 워커(--workers)로 실행하면 공유 저장소의 임대(lease)를 잡은 워커 하나만 적재하고, 나머지는 공유 캐시(L2)로 받는다.
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from . import config, db, metadata, shared_state, targets
+
+
+class _SchemaState:
+    """스키마 1개의 마지막 적재 결과. checked_at은 캐시가 최신임을 마지막으로 확인한 시각."""
+    __slots__ = ("fingerprint", "tables", "checked_at", "error")
+
+    def __init__(self) -> None:
+        self.fingerprint: str | None = None
+        self.tables = 0
+        self.checked_at: float | None = None
+        self.error: str | None = None
+
+
+class Prewarmer:
+    """시작 시 적재 1회 + 주기적 지문 확인·재적재를 하는 백그라운드 스레드."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._states: dict[tuple[str, str], _SchemaState] = {}
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._phase = "idle"  # idle → prewarm → waiting ↔ refresh (갱신 안 하면 done). 다른 워커가 맡으면 standby
+        self._total = 0
+        self._done = 0
+        self._prewarm_seconds: float | None = None
+        self._last_error: str | None = None
+        self._stats = {"warms": 0, "tables_warmed": 0, "checks": 0, "refreshes": 0, "deferred": 0, "errors": 0}
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="prewarm", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        started = time.monotonic()
+        self._pass("prewarm")
+        with self._lock:
+            self._prewarm_seconds = time.monotonic() - started
+        interval = config.PREWARM_REFRESH_INTERVAL
+        if interval <= 0:
+            if self._phase != "standby":
+                self._phase = "done"
+            return
+        while True:
+            self._phase = "waiting"
+            jitter = config.PREWARM_REFRESH_JITTER
+            if self._stop.wait(interval * (1 + random.uniform(-jitter, jitter))):
+                return
+            self._pass("refresh")
+
+    def _schemas(self) -> list[tuple[str, str]]:
+        """(대상, 스키마) 목록. PREWARM_SCHEMAS > ALLOWED_SCHEMAS > 대상의 전체 사용자 스키마."""
+        pairs: list[tuple[str, str]] = []
+        for name in targets.names():
+            if config.PREWARM_SCHEMAS:
+                schemas = list(config.PREWARM_SCHEMAS)
+            else:
+                with targets.use(name):
+                    schemas = metadata.list_schemas()
+            pairs.extend((name, schema) for schema in schemas)
+        return pairs
+
+    def _pass(self, phase: str) -> None:
+        store = shared_state.store()
+        # 임대는 다음 주기 전에 끝나지 않도록 주기의 3배(최소 60초). 맡은 워커가 죽으면 만료 후 다른 워커가 이어받는다
+        if store is not None and not store.try_lease("prewarm", max(60.0, 3 * config.PREWARM_REFRESH_INTERVAL)):
+            self._phase = "standby"
+            return
+        self._phase = phase
+        try:
+            pairs = self._schemas()
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+                self._last_error = str(e)
+            return
+        with self._lock:
+            self._total = len(pairs)
+            self._done = 0
+        with ThreadPoolExecutor(max_workers=config.PREWARM_CONCURRENCY, thread_name_prefix="prewarm") as pool:
+            for target, schema in pairs:
+                pool.submit(self._warm, target, schema)
+
+    def _warm(self, target: str, schema: str) -> None:
+        """스키마 1개: 처음이면 적재, 이미 적재했으면 지문이 바뀐 경우만 다시 적재."""
+        key = (target, schema)
+        try:
+            if self._stop.is_set():
+                return
+            if db.breaker_state(target) not in (None, "closed") or db.has_waiters(target):
+                with self._lock:
+                    self._stats["deferred"] += 1
+                return
+            with self._lock:
+                state = self._states.setdefault(key, _SchemaState())
+                known = state.fingerprint
+            with targets.use(target):
+                if known is not None:
+                    fingerprint = metadata.schema_fingerprint(schema)
+                    with self._lock:
+                        self._stats["checks"] += 1
+                    if fingerprint == known:
+                        with self._lock:
+                            state.checked_at = time.monotonic()
+                        return
+                fingerprint, tables = metadata.warm_schema(schema)
+            with self._lock:
+                state.fingerprint, state.tables = fingerprint, tables
+                state.checked_at = time.monotonic()
+                state.error = None
+                self._stats["warms" if known is None else "refreshes"] += 1
+                self._stats["tables_warmed"] += tables
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+                self._last_error = self._states[key].error = f"{schema}: {e}"
+        finally:
+            with self._lock:
+                self._done += 1
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            staleness = {
+                (schema if not targets.is_multi() else f"{target}/{schema}"): (
+                    None if s.checked_at is None else round(now - s.checked_at, 1)
+                )
+                for (target, schema), s in self._states.items()
+            }
+            ages = [age for age in staleness.values() if age is not None]
+            return {
+                "enabled": True,
+                "phase": self._phase,
+                "schemas": self._total,
+                "schemas_done": self._done,
+                "progress": round(self._done / self._total, 4) if self._total else None,
+                "prewarm_seconds": None if self._prewarm_seconds is None else round(self._prewarm_seconds, 3),
+                "max_staleness_seconds": max(ages) if ages else None,
+                **self._stats,
+                "last_error": self._last_error,
+                "staleness_seconds": staleness,
+            }
+
+
+_prewarmer = Prewarmer()
+
+
+def start() -> None:
+    """PREWARM_ENABLED이고 메타데이터 캐시 사용 시 백그라운드 적재 시작 (DB 모드에서만 호출)."""
+    if config.PREWARM_ENABLED and config.METADATA_CACHE_ENABLED:
+        _prewarmer.start()
+
+
+def prewarm_stats() -> dict[str, Any]:
+    """미리 적재 진행률(전체/완료 스키마 수), 재적재·미룸·오류 횟수, 스키마별 마지막 확인 후 경과 시간(staleness)."""
+    if not config.PREWARM_ENABLED or not config.METADATA_CACHE_ENABLED:
+        return {"enabled": False}
+    return _prewarmer.stats()
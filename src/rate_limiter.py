@@ -1,35 +1,137 @@
-"""분당 Tool 호출 횟수 제한. 고정 1분 윈도우."""
+"""클라이언트별 Tool 호출 처리량 제한. 토큰 버킷(분당 RATE_LIMIT_RPM 충전, RATE_LIMIT_BURST 용량)."""
+import math
 import threading
 import time
+from collections import OrderedDict
+from typing import Any
 
-from . import config
+from . import config, shared_state
+from .shared_state import SharedStore
 
 
 class RateLimitExceeded(Exception):
-    """분당 한도 초과 시 발생."""
-    def __init__(self, message: str = "분당 요청 한도를 초과했습니다."):
+    """한도 초과 시 발생. retry_after는 다시 시도 가능할 때까지의 초."""
+    def __init__(self, message: str = "분당 요청 한도를 초과했습니다.", retry_after: float | None = None):
         self.message = message
+        self.retry_after = retry_after
         super().__init__(message)
 
 
-_lock = threading.Lock()
-_window_key: int = 0
-_count: int = 0
+class TokenBucketLimiter:
+    """클라이언트 식별자별 토큰 버킷. 버킷은 최대 max_clients개까지 LRU로 보관하고 idle_seconds 동안 안 쓰면 정리.
 
+    shared가 있으면 버킷을 공유 저장소에 두어 여러 워커 프로세스가 같은 한도를 쓴다.
+    """
 
-def check_and_consume() -> None:
-    """Tool 호출 1건으로 간주하고, 한도 내면 카운트 증가. 초과 시 RateLimitExceeded 발생."""
-    if config.RATE_LIMIT_RPM <= 0:
+    def __init__(
+        self,
+        *,
+        rate_per_minute: float,
+        burst: float,
+        max_clients: int,
+        idle_seconds: float,
+        shared: SharedStore | None = None,
+    ) -> None:
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1.0, burst)
+        self.max_clients = max(1, max_clients)
+        self.idle_seconds = idle_seconds
+        self._shared = shared
+        self._lock = threading.Lock()
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()  # client -> [tokens, 마지막 갱신 시각]
+        self._stats = {"allowed": 0, "rejected": 0, "evictions": 0}
+
+    def _evict_locked(self, now: float) -> None:
+        # 앞쪽일수록 오래 안 쓴 버킷. 오래 쉰 버킷은 이미 가득 찼으므로 지워도 동작이 같다.
+        while self._buckets:
+            client, (_, last) = next(iter(self._buckets.items()))
+            if len(self._buckets) <= self.max_clients and now - last < self.idle_seconds:
+                break
+            del self._buckets[client]
+            self._stats["evictions"] += 1
+
+    def consume(self, client_id: str, cost: float = 1.0) -> None:
+        """cost만큼 토큰 차감. 부족하면 RateLimitExceeded(retry_after 포함)."""
+        cost = min(max(cost, 0.0), self.capacity)
+        if self._shared is not None:
+            self._consume_shared(client_id, cost)
+            return
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(client_id)
+            if bucket is None:
+                bucket = [self.capacity, now]
+                self._buckets[client_id] = bucket
+            else:
+                bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+                self._buckets.move_to_end(client_id)
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                self._stats["allowed"] += 1
+                self._evict_locked(now)
+                return
+            self._stats["rejected"] += 1
+            short = cost - bucket[0]
+        raise self._exceeded(short)
+
+    def _consume_shared(self, client_id: str, cost: float) -> None:
+        short = self._shared.consume(client_id, cost, rate=self.rate, capacity=self.capacity)
+        with self._lock:
+            self._stats["allowed" if short is None else "rejected"] += 1
+            # 오래된 버킷 정리는 호출 256번마다 한 번
+            evict = (self._stats["allowed"] + self._stats["rejected"]) % 256 == 0
+        if evict:
+            removed = self._shared.evict_buckets(self.idle_seconds, self.max_clients)
+            with self._lock:
+                self._stats["evictions"] += removed
+        if short is not None:
+            raise self._exceeded(short)
+
+    def _exceeded(self, short: float) -> RateLimitExceeded:
+        retry_after = math.ceil(short / self.rate) if self.rate > 0 else None
+        return RateLimitExceeded(
+            f"요청 한도를 초과했습니다. (한도: {config.RATE_LIMIT_RPM}회/분, {retry_after}초 후 다시 시도하세요)",
+            retry_after=retry_after,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        clients = self._shared.bucket_count() if self._shared is not None else None
+        with self._lock:
+            return {"clients": len(self._buckets) if clients is None else clients, **self._stats}
+
+
+_limiter: TokenBucketLimiter | None = None
+if config.RATE_LIMIT_RPM > 0:
+    _limiter = TokenBucketLimiter(
+        rate_per_minute=config.RATE_LIMIT_RPM,
+        burst=config.RATE_LIMIT_BURST or config.RATE_LIMIT_RPM,
+        max_clients=config.RATE_LIMIT_MAX_CLIENTS,
+        idle_seconds=config.RATE_LIMIT_IDLE_SECONDS,
+        shared=shared_state.store(),
+    )
+
+
+def tool_cost(tool: str, table_count: int = 1) -> float:
+    """Tool 호출 1건의 비용. RATE_LIMIT_TOOL_COSTS(기본 1) + 두 번째 테이블부터 RATE_LIMIT_TABLE_COST씩."""
+    base = config.RATE_LIMIT_TOOL_COSTS.get(tool, 1.0)
+    return base + max(0, table_count - 1) * config.RATE_LIMIT_TABLE_COST
+
+
+def check_and_consume(client_id: str | None = None, cost: float = 1.0) -> None:
+    """Tool 호출 1건을 client_id 버킷에서 차감. 한도 초과 시 RateLimitExceeded 발생."""
+    if _limiter is None:
         return
-    now = time.time()
-    current_window = int(now // 60)
-    with _lock:
-        global _window_key, _count
-        if current_window != _window_key:
-            _window_key = current_window
-            _count = 0
-        _count += 1
-        if _count > config.RATE_LIMIT_RPM:
-            raise RateLimitExceeded(
-                f"분당 요청 한도를 초과했습니다. (한도: {config.RATE_LIMIT_RPM}회/분)"
-            )
+    _limiter.consume(client_id or "anonymous", cost)
+
+
+def blocking() -> bool:
+    """차감이 공유 저장소(SQLite 쓰기 트랜잭션) 호출이라 이벤트 루프 밖에서 실행해야 하는지."""
+    return _limiter is not None and _limiter._shared is not None
+
+
+def limiter_stats() -> dict[str, Any]:
+    """처리량 제한 통계 (버킷 수, 허용/거부 횟수). 제한 미사용 시 enabled=False."""
+    if _limiter is None:
+        return {"enabled": False}
+    return {"enabled": True, **_limiter.stats()}
@@ -0,0 +1,299 @@
+"""스키마 변경 비교(diff_schema)와 변경 감시(리소스 구독 알림).
+
+기준점(baseline)은 스키마의 테이블별 변경 표시(source.table_stamps)와 테이블별 요약 해시(섹션·항목 단위)다.
+처음 기준점은 스키마 전체 스캔(get_schema_tables_metadata)으로 만들고, 비교할 때는 변경 표시만 새로 읽어
+추가·삭제·표시가 바뀐 테이블을 고른 뒤 그 테이블만 get_tables_metadata(캐시 경로)로 다시 조회해 요약 해시를 비교한다
+(변경 표시에 데이터 변경은 들어가지 않고, 표시가 바뀌어도 요약 해시가 같으면 보고하지 않음).
+기본 스키마 지문은 TABLES만 보므로, 표시가 바뀐 테이블은 다시 조회하기 전에 캐시에서 무효화한다(invalidate_tables).
+기준점은 대상·스키마·version별로 SCHEMA_DIFF_MAX_BASELINES개까지 메모리에 보관하며(LRU, 워커마다 따로),
+바뀌지 않은 테이블의 요약은 이전 기준점과 공유한다.
+
+감시(SchemaWatcher)는 구독된(또는 SCHEMA_WATCH_SCHEMAS) 스키마를 SCHEMA_WATCH_INTERVAL마다 비교하고,
+바뀐 것이 있으면 마지막 변경 내역을 보관한 뒤 알림 함수(서버가 구독 세션에 resources/updated 전송)를 호출한다.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+from . import config, db, metadata, snapshot, targets
+from .db import DBConnectionError
+from .metadata import MetadataError
+
+# 이름으로 항목을 구분하는 섹션 -> 이름 필드. 나머지(table, primary_key)는 섹션 전체를 비교
+_ITEM_SECTIONS = {
+    "columns": "column_name",
+    "indexes": "index_name",
+    "unique_keys": "constraint_name",
+    "foreign_keys": "constraint_name",
+    "check_constraints": "constraint_name",
+}
+_WHOLE_SECTIONS = ("table", "primary_key")
+
+# 바뀐 테이블을 다시 조회할 때 get_tables_metadata 1회에 넘기는 테이블 수
+_FETCH_BATCH = 1000
+
+# get_tables_metadata의 "없는 테이블" 오류 메시지 접두어
+_NOT_FOUND = "스키마 또는 테이블이 존재하지 않습니다"
+
+
+def _hash(value: Any) -> str:
+    raw = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _digest(entry: dict[str, Any]) -> dict[str, Any]:
+    """테이블 메타데이터 요약: 섹션 전체 해시 또는 항목 이름 -> 해시. 컬럼 순서는 column_order로 따로."""
+    digest: dict[str, Any] = {s: _hash(entry.get(s)) for s in _WHOLE_SECTIONS}
+    for section, name_field in _ITEM_SECTIONS.items():
+        digest[section] = {item[name_field]: _hash(item) for item in entry.get(section) or ()}
+    digest["column_order"] = _hash([c["column_name"] for c in entry.get("columns") or ()])
+    return digest
+
+
+def _compare(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    """두 요약의 차이. 바뀐 섹션만 남긴다 (섹션 전체는 true, 항목 섹션은 added/dropped/modified 이름 목록)."""
+    changes: dict[str, Any] = {}
+    for section in (*_WHOLE_SECTIONS, "column_order"):
+        if old[section] != new[section]:
+            changes[section] = True
+    for section in _ITEM_SECTIONS:
+        before, after = old[section], new[section]
+        if before == after:
+            continue
+        part = {
+            "added": sorted(after.keys() - before.keys()),
+            "dropped": sorted(before.keys() - after.keys()),
+            "modified": sorted(k for k in before.keys() & after.keys() if before[k] != after[k]),
+        }
+        changes[section] = {k: v for k, v in part.items() if v}
+    return changes
+
+
+class _Baseline:
+    """한 시점의 스키마 상태. digests 값이 None이면 메타데이터를 만들 수 없는 테이블(뷰 등)."""
+    __slots__ = ("version", "stamps", "digests")
+
+    def __init__(self, version: str, stamps: dict[str, Any], digests: dict[str, dict[str, Any] | None]) -> None:
+        self.version = version
+        self.stamps = stamps
+        self.digests = digests
+
+
+class SchemaDiffer:
+    """대상·스키마별 기준점 LRU와 증분 비교."""
+
+    def __init__(self, max_baselines: int) -> None:
+        self.max_baselines = max(1, max_baselines)
+        self._lock = threading.Lock()
+        self._baselines: OrderedDict[tuple[str, str, str], _Baseline] = OrderedDict()
+        self._stats = {"baselines_built": 0, "diffs": 0, "tables_refetched": 0, "unknown_versions": 0}
+
+    def _remember(self, schema_name: str, baseline: _Baseline) -> None:
+        key = (targets.current_name(), schema_name, baseline.version)
+        with self._lock:
+            self._baselines[key] = baseline
+            self._baselines.move_to_end(key)
+            while len(self._baselines) > self.max_baselines:
+                self._baselines.popitem(last=False)
+
+    def _recall(self, schema_name: str, version: str) -> _Baseline | None:
+        key = (targets.current_name(), schema_name, version)
+        with self._lock:
+            baseline = self._baselines.get(key)
+            if baseline is not None:
+                self._baselines.move_to_end(key)
+            return baseline
+
+    def diff(self, source: Any, schema_name: str, since: str | None) -> dict[str, Any]:
+        """since(이전 응답의 version) 이후 바뀐 테이블. since가 None이면 기준점만 만들고 version 반환."""
+        base = None
+        if since is not None:
+            base = self._recall(schema_name, since)
+            if base is None:
+                with self._lock:
+                    self._stats["unknown_versions"] += 1
+                raise MetadataError(
+                    f"알 수 없는 version입니다 (만료되었거나 다른 서버 프로세스의 값): {since[:64]}. since 없이 다시 호출하세요."
+                )
+        stamps = source.table_stamps(schema_name)
+        version = metadata.version_token("diff_schema", schema_name, f"{len(stamps)}:{sum(stamps.values())}")
+        if base is None:
+            entries = source.get_schema_tables_metadata(schema_name)
+            digests = {t: (_digest(entries[t]) if t in entries else None) for t in stamps}
+            self._remember(schema_name, _Baseline(version, stamps, digests))
+            with self._lock:
+                self._stats["baselines_built"] += 1
+            return {"schema": schema_name, "version": version, "baseline": True, "table_count": len(stamps)}
+
+        candidates = sorted(t for t, s in stamps.items() if base.stamps.get(t) != s)
+        # 스키마 지문(기본은 TABLES만)이 놓친 ALTER일 수 있으므로 캐시된 항목을 버리고 다시 읽는다
+        source.invalidate_tables(schema_name, candidates)
+        fetched = self._fetch_digests(source, schema_name, candidates)
+        digests = {t: d for t, d in base.digests.items() if t in stamps}
+        digests.update(fetched)
+        added, changed = [], []
+        for table_name in candidates:
+            new = fetched[table_name]
+            if table_name not in base.stamps or base.digests.get(table_name) is None:
+                if new is not None:
+                    added.append(table_name)
+            elif new is None:
+                changed.append({"table_name": table_name, "dropped_metadata": True})
+            else:
+                changes = _compare(base.digests[table_name], new)
+                if changes:
+                    changed.append({"table_name": table_name, **changes})
+        dropped = sorted(t for t in base.stamps.keys() - stamps.keys() if base.digests.get(t) is not None)
+        self._remember(schema_name, _Baseline(version, stamps, digests))
+        with self._lock:
+            self._stats["diffs"] += 1
+        return {
+            "schema": schema_name,
+            "since": since,
+            "version": version,
+            "changed": bool(added or dropped or changed),
+            "added_tables": added,
+            "dropped_tables": dropped,
+            "changed_tables": changed,
+            "tables_checked": len(candidates),
+        }
+
+    def _fetch_digests(
+        self, source: Any, schema_name: str, table_names: list[str]
+    ) -> dict[str, dict[str, Any] | None]:
+        """get_tables_metadata(캐시·single-flight 경로)로 조회해 요약. 없는 테이블(뷰 등)은 None.
+
+        그 외 조회 오류가 있으면 기준점을 갱신하지 않도록 DBConnectionError.
+        """
+        digests: dict[str, dict[str, Any] | None] = {}
+        for i in range(0, len(table_names), _FETCH_BATCH):
+            batch = table_names[i : i + _FETCH_BATCH]
+            for table_name, entry in zip(batch, source.get_tables_metadata(schema_name, batch)):
+                if "error" not in entry:
+                    digests[table_name] = _digest(entry)
+                elif entry["error"].startswith(_NOT_FOUND):
+                    digests[table_name] = None
+                else:
+                    raise DBConnectionError(entry["error"])
+        with self._lock:
+            self._stats["tables_refetched"] += len(table_names)
+        return digests
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"baselines": len(self._baselines), **self._stats}
+
+
+_differ = SchemaDiffer(config.SCHEMA_DIFF_MAX_BASELINES)
+
+
+def diff_schema(source: Any, schema_name: str, since: str | None) -> dict[str, Any]:
+    return _differ.diff(source, schema_name, since)
+
+
+def resource_uri(target: str, schema_name: str) -> str:
+    """감시 결과 리소스 URI."""
+    return f"schema://{target}/{schema_name}/changes"
+
+
+class SchemaWatcher:
+    """감시 대상 (대상, 스키마)를 주기적으로 비교하는 백그라운드 스레드. 바뀌면 notify(대상, 스키마) 호출."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._watched: dict[tuple[str, str], str | None] = {}  # (대상, 스키마) -> 마지막 version
+        self._latest: dict[tuple[str, str], dict[str, Any]] = {}
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._notify: Callable[[str, str], None] | None = None
+        self._stats = {"polls": 0, "changes": 0, "deferred": 0, "errors": 0}
+        self._last_error: str | None = None
+
+    def watch(self, target: str, schema_name: str, notify: Callable[[str, str], None]) -> None:
+        """감시 추가(이미 있으면 그대로). 첫 호출 시 스레드 시작."""
+        with self._lock:
+            self._notify = notify
+            self._watched.setdefault((target, schema_name), None)
+            if self._thread is None and config.SCHEMA_WATCH_INTERVAL > 0:
+                self._thread = threading.Thread(target=self._run, name="schema-watch", daemon=True)
+                self._thread.start()
+
+    def unwatch(self, target: str, schema_name: str) -> None:
+        with self._lock:
+            self._watched.pop((target, schema_name), None)
+
+    def latest(self, target: str, schema_name: str) -> dict[str, Any] | None:
+        """마지막으로 감지한 변경 내역 (없으면 None)."""
+        with self._lock:
+            return self._latest.get((target, schema_name))
+
+    def _run(self) -> None:
+        while not self._stop.wait(config.SCHEMA_WATCH_INTERVAL):
+            with self._lock:
+                pairs = list(self._watched.items())
+            for (target, schema_name), since in pairs:
+                self._poll(target, schema_name, since)
+
+    def _poll(self, target: str, schema_name: str, since: str | None) -> None:
+        source = snapshot.current()
+        # 실시간 요청과 연결을 다투지 않도록, 대상이 바쁘거나 차단기가 닫혀 있지 않으면 다음 주기로
+        if source is None and (db.breaker_state(target) not in (None, "closed") or db.has_waiters(target)):
+            with self._lock:
+                self._stats["deferred"] += 1
+            return
+        try:
+            with targets.use(target):
+                try:
+                    result = _differ.diff(source or metadata, schema_name, since)
+                except MetadataError:
+                    if since is None:
+                        raise
+                    # 기준점이 LRU에서 밀려났으면 새로 만든다 (그 사이 변경은 보고하지 못함)
+                    result = _differ.diff(source or metadata, schema_name, None)
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+                self._last_error = f"{target}/{schema_name}: {e}"
+            return
+        with self._lock:
+            self._stats["polls"] += 1
+            if (target, schema_name) in self._watched:
+                self._watched[(target, schema_name)] = result["version"]
+            changed = result.get("changed", False)
+            if changed:
+                self._stats["changes"] += 1
+                self._latest[(target, schema_name)] = result
+            notify = self._notify
+        if changed and notify is not None:
+            notify(target, schema_name)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "interval": config.SCHEMA_WATCH_INTERVAL,
+                "watched": [resource_uri(t, s) for t, s in self._watched],
+                **self._stats,
+                "last_error": self._last_error,
+            }
+
+
+_watcher = SchemaWatcher()
+
+
+def watch(target: str, schema_name: str, notify: Callable[[str, str], None]) -> None:
+    _watcher.watch(target, schema_name, notify)
+
+
+def unwatch(target: str, schema_name: str) -> None:
+    _watcher.unwatch(target, schema_name)
+
+
+def latest_changes(target: str, schema_name: str) -> dict[str, Any] | None:
+    return _watcher.latest(target, schema_name)
+
+
+def diff_stats() -> dict[str, Any]:
+    """기준점 수, 비교·재조회 테이블 수, 감시 상태."""
+    return {**_differ.stats(), "watch": _watcher.stats()}
@@ -0,0 +1,371 @@
+"""테이블·컬럼 검색용 메모리 역색인 (search_tables / search_columns).
+
+스키마마다 TABLES·COLUMNS를 한 번 일괄 조회해 테이블명·컬럼명·타입·코멘트를 토큰 단위로 색인한다.
+스키마 지문이 바뀐 스키마만 다시 만들고, 전체 크기가 SEARCH_INDEX_MAX_BYTES를 넘으면 오래 안 쓴 스키마부터 버린다.
+
+토큰: 소문자, _·공백·기호와 camelCase 경계로 분리 (한글 등은 단어 단위). 매칭 방식:
+  exact     - 토큰 전체 일치
+  prefix    - 토큰 접두어 (정렬된 어휘 + 이분 탐색)
+  substring - 토큰 부분 문자열 (어휘를 이어 붙인 문자열에서 str.find)
+질의 토큰은 모두 맞아야 하며(AND), 점수 = 토큰별 최고 (일치 품질 × 필드 가중치) 합 + 이름 일치 가산점.
+"""
+import bisect
+import heapq
+import re
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any
+
+from . import config, targets
+from .singleflight import SingleFlight
+
+_WORD = re.compile(r"[^\W_]+")
+_CAMEL = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+_QUALITY = {"exact": 3, "prefix": 2, "substring": 1}
+_MAX_EXPANSION = 5000  # 질의 토큰 하나가 펼쳐지는 어휘 수 상한 (1~2글자 접두어 등)
+
+# 필드 가중치: 이름 > 코멘트 > 타입
+_COLUMN_FIELDS = (("name", 4), ("type", 1), ("comment", 2))
+_TABLE_FIELDS = (("name", 4), ("comment", 2))
+
+
+def tokenize(text: str) -> list[str]:
+    """검색 토큰 (중복 제거, 등장 순서 유지)."""
+    out: dict[str, None] = {}
+    for word in _WORD.findall(text):
+        if word.isascii():
+            for part in _CAMEL.findall(word):
+                out[part.lower()] = None
+        out[word.lower()] = None
+    return list(out)
+
+
+class _Postings:
+    """필드별 토큰 -> 문서 번호 배열 (문서 번호 오름차순)."""
+    __slots__ = ("fields", "_tokens")
+
+    def __init__(self, count: int) -> None:
+        self.fields: list[dict[str, array]] = [{} for _ in range(count)]
+        self._tokens: dict[str, list[str]] = {}  # 색인 중에만 쓰는 토큰화 결과 캐시 (같은 이름·타입이 반복됨)
+
+    def add(self, field: int, doc: int, text: str) -> None:
+        postings = self.fields[field]
+        terms = self._tokens.get(text)
+        if terms is None:
+            terms = self._tokens[text] = tokenize(text)
+        for term in terms:
+            docs = postings.get(term)
+            if docs is None:
+                docs = postings[term] = array("I")
+            docs.append(doc)
+
+    def nbytes(self) -> int:
+        return sum(len(docs) * docs.itemsize + len(term) + 120 for f in self.fields for term, docs in f.items())
+
+
+class SchemaIndex:
+    """한 스키마의 테이블·컬럼 역색인. 문서 번호는 (테이블명, 컬럼 순서) 정렬 순."""
+
+    def __init__(
+        self,
+        schema_name: str,
+        fingerprint: str,
+        tables: list[tuple[str, str]],
+        columns: list[tuple[str, str, str, str]],
+    ) -> None:
+        self.schema = schema_name
+        self.fingerprint = fingerprint
+        self.table_names = [t[0] for t in tables]
+        self.table_comments = [t[1] for t in tables]
+        table_ids = {name: i for i, name in enumerate(self.table_names)}
+        self.col_table = array("I")
+        self.col_names: list[str] = []
+        self.col_types: list[str] = []
+        self.col_comments: list[str] = []
+        self.table_postings = _Postings(len(_TABLE_FIELDS))
+        self.column_postings = _Postings(len(_COLUMN_FIELDS))
+        for doc, (name, comment) in enumerate(tables):
+            self.table_postings.add(0, doc, name)
+            self.table_postings.add(1, doc, comment)
+        shared: dict[str, str] = {}  # 반복되는 컬럼명·타입·코멘트 문자열을 한 객체로 공유
+        for table_name, column_name, data_type, comment in columns:
+            table_id = table_ids.get(table_name)
+            if table_id is None:
+                continue
+            doc = len(self.col_names)
+            self.col_table.append(table_id)
+            self.col_names.append(shared.setdefault(column_name, column_name))
+            self.col_types.append(shared.setdefault(data_type, data_type))
+            self.col_comments.append(shared.setdefault(comment, comment))
+            self.column_postings.add(0, doc, column_name)
+            self.column_postings.add(1, doc, data_type)
+            self.column_postings.add(2, doc, comment)
+        vocab = set()
+        for postings in (self.table_postings, self.column_postings):
+            postings._tokens.clear()
+            for f in postings.fields:
+                vocab.update(f)
+        self.vocab = sorted(vocab)
+        # 부분 문자열 검색용: "\n"으로 이어 붙인 어휘와 각 토큰 시작 위치
+        self._blob = "\n".join(self.vocab)
+        self._starts = array("I")
+        pos = 0
+        for term in self.vocab:
+            self._starts.append(pos)
+            pos += len(term) + 1
+        self.nbytes = (
+            self.table_postings.nbytes()
+            + self.column_postings.nbytes()
+            + len(self._blob) * 2
+            + len(self._starts) * 4
+            + sum(len(s) * 2 + 56 for s in self.table_names + self.table_comments)
+            + sum(len(s) * 2 + 56 for s in shared)
+            + len(self.col_names) * 3 * 8  # 문자열 참조
+            + len(self.col_table) * 4
+        )
+
+    def expand(self, token: str, match: str) -> list[tuple[str, int]]:
+        """질의 토큰과 맞는 어휘 (토큰, 품질) 목록. 정확히 같은 토큰은 항상 exact 품질."""
+        out: dict[str, int] = {}
+        i = bisect.bisect_left(self.vocab, token)
+        if i < len(self.vocab) and self.vocab[i] == token:
+            out[token] = _QUALITY["exact"]
+        if match in ("prefix", "substring"):
+            while i < len(self.vocab) and self.vocab[i].startswith(token) and len(out) < _MAX_EXPANSION:
+                out.setdefault(self.vocab[i], _QUALITY["prefix"])
+                i += 1
+        if match == "substring":
+            pos = self._blob.find(token)
+            while pos >= 0 and len(out) < _MAX_EXPANSION:
+                idx = bisect.bisect_right(self._starts, pos) - 1
+                out.setdefault(self.vocab[idx], _QUALITY["substring"])
+                nxt = idx + 1
+                if nxt >= len(self._starts):
+                    break
+                pos = self._blob.find(token, self._starts[nxt])
+        return list(out.items())
+
+    def match(self, postings: _Postings, weights: tuple[int, ...], tokens: list[str], match: str) -> dict[int, int]:
+        """모든 질의 토큰을 만족하는 문서 -> 점수.
+
+        문서 수가 적은 토큰부터 처리하고, 후보가 충분히 줄면 나머지 토큰은 문서 번호 배열을 이분 탐색해 확인한다.
+        """
+        plans = []
+        for token in tokens:
+            lists = []
+            for field, weight in enumerate(weights):
+                field_postings = postings.fields[field]
+                for term, quality in self.expand(token, match):
+                    docs = field_postings.get(term)
+                    if docs is not None:
+                        lists.append((docs, quality * weight))
+            if not lists:
+                return {}
+            plans.append((sum(len(d) for d, _ in lists), lists))
+        plans.sort(key=lambda p: p[0])
+        scores: dict[int, int] | None = None
+        for cost, lists in plans:
+            if scores is not None and len(scores) * len(lists) * 20 < cost:
+                scores = _probe(scores, lists)
+            else:
+                best: dict[int, int] = {}
+                get = best.get
+                for docs, score in lists:
+                    for doc in docs:
+                        if get(doc, 0) < score:
+                            best[doc] = score
+                scores = best if scores is None else {d: s + best[d] for d, s in scores.items() if d in best}
+            if not scores:
+                return {}
+        return scores or {}
+
+
+def _probe(scores: dict[int, int], lists: list[tuple[array, int]]) -> dict[int, int]:
+    """후보 문서마다 각 문서 번호 배열에서 이분 탐색. 하나라도 있으면 그중 최고 점수를 더함."""
+    out: dict[int, int] = {}
+    for doc, total in scores.items():
+        best = 0
+        for docs, score in lists:
+            if score > best:
+                i = bisect.bisect_left(docs, doc)
+                if i < len(docs) and docs[i] == doc:
+                    best = score
+        if best:
+            out[doc] = total + best
+    return out
+
+
+def _name_bonus(name: str, phrase: str) -> int:
+    lowered = name.lower()
+    if lowered == phrase:
+        return 10
+    return 3 if phrase in lowered else 0
+
+
+class SearchIndex:
+    """(대상, 스키마)별 SchemaIndex LRU. 지문 확인은 스키마마다 refresh_interval초에 한 번."""
+
+    def __init__(self, *, max_bytes: int, refresh_interval: float) -> None:
+        self.max_bytes = max_bytes
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        # (대상, 스키마) -> (색인, 지문 확인 시각)
+        self._indexes: OrderedDict[tuple[str, str], tuple[SchemaIndex, float]] = OrderedDict()
+        self._schemas: dict[str, tuple[Any, list[str], float]] = {}  # 대상 -> (source, 스키마 목록, 조회 시각)
+        self._bytes = 0
+        self._stats = {"builds": 0, "refreshes": 0, "evictions": 0, "oversize": 0, "queries": 0}
+        self._flight = SingleFlight("search_index")
+
+    def schemas(self, source: Any) -> list[str]:
+        now = time.monotonic()
+        target = targets.current_name()
+        with self._lock:
+            known = self._schemas.get(target)
+            if known is not None and known[0] is source and now - known[2] < self.refresh_interval:
+                return known[1]
+        names = source.list_schemas()
+        with self._lock:
+            self._schemas[target] = (source, names, time.monotonic())
+        return names
+
+    def get(self, source: Any, schema_name: str) -> SchemaIndex:
+        """현재 대상의 스키마 색인. 없거나 지문이 바뀌었으면 그 스키마만 다시 만든다."""
+        key = (targets.current_name(), schema_name)
+        now = time.monotonic()
+        with self._lock:
+            known = self._indexes.get(key)
+            if known is not None:
+                self._indexes.move_to_end(key)
+                if now - known[1] < self.refresh_interval:
+                    return known[0]
+        fingerprint = source.schema_fingerprint(schema_name)
+        if known is not None and known[0].fingerprint == fingerprint:
+            with self._lock:
+                if self._indexes.get(key) is known:
+                    self._indexes[key] = (known[0], time.monotonic())
+            return known[0]
+        # 같은 스키마 색인을 동시에 만들지 않도록 합친다 (조회·색인 1번)
+        return self._flight.do(
+            (*key, fingerprint), lambda: self._build(source, key, fingerprint, known), "search_index"
+        )
+
+    def _build(
+        self, source: Any, key: tuple[str, str], fingerprint: str, known: tuple[SchemaIndex, float] | None
+    ) -> SchemaIndex:
+        schema_name = key[1]
+        tables, columns = source.search_rows(schema_name)
+        index = SchemaIndex(schema_name, fingerprint, tables, columns)
+        with self._lock:
+            self._stats["refreshes" if known is not None else "builds"] += 1
+            old = self._indexes.pop(key, None)
+            if old is not None:
+                self._bytes -= old[0].nbytes
+            if self.max_bytes > 0 and index.nbytes > self.max_bytes:
+                # 상한보다 큰 스키마는 이번 질의에만 쓰고 보관하지 않음
+                self._stats["oversize"] += 1
+                return index
+            self._indexes[key] = (index, time.monotonic())
+            self._bytes += index.nbytes
+            while self.max_bytes > 0 and self._bytes > self.max_bytes:
+                _, (evicted, _) = self._indexes.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self._stats["evictions"] += 1
+        return index
+
+    def record_query(self) -> None:
+        with self._lock:
+            self._stats["queries"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+            self._schemas.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "schemas": len(self._indexes),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "columns": sum(len(i.col_names) for i, _ in self._indexes.values()),
+                "builds_coalesced": self._flight.stats()["coalesced"],
+                **self._stats,
+            }
+
+
+_index = SearchIndex(max_bytes=config.SEARCH_INDEX_MAX_BYTES, refresh_interval=config.SEARCH_INDEX_REFRESH_INTERVAL)
+
+
+def _search(
+    source: Any,
+    kind: str,
+    query: str,
+    schema_name: str | None,
+    match: str,
+    limit: int,
+) -> dict[str, Any]:
+    tokens = tokenize(query)
+    phrase = query.strip().lower()
+    schemas = [schema_name] if schema_name else _index.schemas(source)
+    hits: list[tuple[int, str, int, SchemaIndex]] = []  # (점수, 스키마, 문서 번호, 색인)
+    total = 0
+    for name in schemas:
+        index = _index.get(source, name)
+        if kind == "columns":
+            scores = index.match(index.column_postings, tuple(w for _, w in _COLUMN_FIELDS), tokens, match)
+            names = index.col_names
+        else:
+            scores = index.match(index.table_postings, tuple(w for _, w in _TABLE_FIELDS), tokens, match)
+            names = index.table_names
+        total += len(scores)
+        top = heapq.nsmallest(
+            limit, scores.items(), key=lambda kv: (-(kv[1] + _name_bonus(names[kv[0]], phrase)), kv[0])
+        )
+        hits.extend((score + _name_bonus(names[doc], phrase), name, doc, index) for doc, score in top)
+    hits.sort(key=lambda h: (-h[0], h[1], h[2]))
+    results = []
+    for score, name, doc, index in hits[:limit]:
+        if kind == "columns":
+            table_id = index.col_table[doc]
+            results.append({
+                "schema": name,
+                "table_name": index.table_names[table_id],
+                "column_name": index.col_names[doc],
+                "data_type": index.col_types[doc],
+                "column_comment": index.col_comments[doc],
+                "table_comment": index.table_comments[table_id],
+                "score": score,
+            })
+        else:
+            results.append({
+                "schema": name,
+                "table_name": index.table_names[doc],
+                "table_comment": index.table_comments[doc],
+                "score": score,
+            })
+    _index.record_query()
+    return {
+        "query": query,
+        "match": match,
+        "total_matches": total,
+        "truncated": total > len(results),
+        "results": results,
+    }
+
+
+def search_columns(source: Any, query: str, schema_name: str | None, match: str, limit: int) -> dict[str, Any]:
+    """컬럼명·타입·코멘트 검색. 결과에 테이블명·테이블 코멘트 포함."""
+    return _search(source, "columns", query, schema_name, match, limit)
+
+
+def search_tables(source: Any, query: str, schema_name: str | None, match: str, limit: int) -> dict[str, Any]:
+    """테이블명·테이블 코멘트 검색."""
+    return _search(source, "tables", query, schema_name, match, limit)
+
+
+def search_stats() -> dict[str, Any]:
+    """검색 색인 통계 (보관 스키마·컬럼 수, 추정 메모리, 생성/갱신/제거 횟수)."""
+    return _index.stats()
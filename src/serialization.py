@@ -0,0 +1,60 @@
+"""Tool 응답 JSON 직렬화. 출력 스타일(pretty/compact), 백엔드(json/orjson), 컬럼 배열 열 지향 인코딩."""
+import json
+from typing import Any
+
+from . import config
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+STYLES = ("pretty", "compact")
+BACKENDS = ("auto", "json", "orjson")
+
+
+def backend_name(backend: str | None = None) -> str:
+    """실제로 사용할 백엔드 이름. auto면 orjson이 설치돼 있을 때 orjson."""
+    backend = backend or config.OUTPUT_JSON_BACKEND
+    if backend == "orjson" or (backend == "auto" and orjson is not None):
+        return "orjson" if orjson is not None else "json"
+    return "json"
+
+
+def to_columnar(value: Any) -> Any:
+    """"columns"가 dict 배열이면 {"fields": [키...], "rows": [[값...], ...]}로 바꾼 사본 반환.
+
+    원본(캐시 객체일 수 있음)은 수정하지 않는다. 컬럼명 문자열 배열(unique_keys 등)은 그대로 둔다.
+    """
+    if isinstance(value, list):
+        return [to_columnar(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    out: dict[str, Any] = {}
+    for k, v in value.items():
+        if k == "columns" and isinstance(v, list) and v and all(isinstance(c, dict) for c in v):
+            fields = list(v[0])
+            if all(list(c) == fields for c in v):
+                out[k] = {"fields": fields, "rows": [list(c.values()) for c in v]}
+                continue
+        out[k] = to_columnar(v)
+    return out
+
+
+def dumps(
+    value: Any,
+    *,
+    style: str | None = None,
+    backend: str | None = None,
+    columnar: bool | None = None,
+) -> str:
+    """값을 JSON 문자열로. 인자를 생략하면 OUTPUT_JSON_* 설정 사용."""
+    style = style or config.OUTPUT_JSON_STYLE
+    if columnar if columnar is not None else config.OUTPUT_COLUMNAR:
+        value = to_columnar(value)
+    if backend_name(backend) == "orjson":
+        option = orjson.OPT_INDENT_2 if style == "pretty" else 0
+        return orjson.dumps(value, option=option, default=str).decode("utf-8")
+    if style == "pretty":
+        return json.dumps(value, ensure_ascii=False, indent=2, default=str)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
@@ -1,158 +1,828 @@
 """FastMCP 서버: MySQL 메타데이터 조회 도구."""
 import argparse
 import asyncio
-import json
+import contextvars
+import functools
+import os
+import tempfile
 import threading
-from typing import Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
 
 from fastmcp import FastMCP
+from fastmcp.server.dependencies import get_context, get_http_request
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
 
-from . import config, metadata
-from .db import DBConnectionError
+from . import (
+    config,
+    db,
+    fk_graph,
+    metadata,
+    mcp_compat,
+    metrics,
+    prewarm,
+    rate_limiter,
+    schema_diff,
+    search,
+    serialization,
+    shared_state,
+    snapshot,
+    targets,
+    versioning,
+)
+from .db import CircuitOpenError, DBConnectionError
 from .metadata import MetadataError
-from .rate_limiter import RateLimitExceeded, check_and_consume as rate_limit_check
+from .rate_limiter import (
+    RateLimitExceeded,
+    blocking as rate_limit_blocking,
+    check_and_consume as rate_limit_check,
+    tool_cost,
+)
 from .validation import (
     ValidationError,
+    validate_direction,
+    validate_graph_depth,
+    validate_list_cursor,
+    validate_name_like,
+    validate_name_prefix,
+    validate_page_size,
+    validate_projection,
     validate_schema_name,
+    validate_search_options,
+    validate_search_query,
     validate_table_name,
     validate_table_names_list,
+    validate_target,
+    validate_version,
+    validate_version_map,
 )
 from . import audit
 
 mcp = FastMCP("MySQL Metadata Server")
 
-# 동시 실행 제한(선택). 0이면 미사용.
-_concurrency_semaphore: threading.Semaphore | None = None
-if config.MAX_CONCURRENT_REQUESTS > 0:
-    _concurrency_semaphore = threading.Semaphore(config.MAX_CONCURRENT_REQUESTS)
+
+class ServerBusy(Exception):
+    """동시 실행 한도가 찬 상태로 대기 시간을 넘긴 경우."""
+    pass
+
+
+# DB 작업 전용 스레드 풀. 블로킹 PyMySQL I/O를 이벤트 루프 밖에서 실행.
+# 0이면 커넥션 풀 크기에 맞춤 (풀 미사용 시 10).
+_executor_workers = config.DB_EXECUTOR_WORKERS or config.DB_POOL_MAX_SIZE or 10
+_executor = ThreadPoolExecutor(max_workers=_executor_workers, thread_name_prefix="db-worker")
+
+# 동시 실행 제한. MAX_CONCURRENT_REQUESTS가 0이면 DB 워커 수만큼 (그 이상은 어차피 워커 대기).
+_concurrency_semaphore = asyncio.Semaphore(config.MAX_CONCURRENT_REQUESTS or _executor_workers)
+
+
+# 대상별 동시 실행 제한 (max_concurrent > 0인 대상만). 느린 대상 하나가 전체 슬롯을 차지하지 않도록
+_target_semaphores = {
+    name: asyncio.Semaphore(targets.get(name).max_concurrent)
+    for name in targets.names()
+    if targets.get(name).max_concurrent > 0
+}
+
+
+async def _acquire_concurrency(semaphore: asyncio.Semaphore, label: str = "서버") -> None:
+    """실행 슬롯 획득. REQUEST_QUEUE_TIMEOUT초 안에 못 얻으면 ServerBusy."""
+    timeout = config.REQUEST_QUEUE_TIMEOUT if config.REQUEST_QUEUE_TIMEOUT > 0 else None
+    try:
+        await asyncio.wait_for(semaphore.acquire(), timeout=timeout)
+    except asyncio.TimeoutError:
+        raise ServerBusy(
+            f"{label}가 처리 중인 요청이 많습니다. 잠시 후 다시 시도하세요. (대기 {config.REQUEST_QUEUE_TIMEOUT}초 초과)"
+        ) from None
+
+
+if config.SNAPSHOT_PATH:
+    snapshot.open_store(config.SNAPSHOT_PATH)
+
+
+def _source() -> Any:
+    """메타데이터 조회 대상. 스냅샷 모드면 스냅샷 파일, 아니면 DB(metadata 모듈). 두 쪽 함수 이름·반환 형식이 같다."""
+    return snapshot.current() or metadata
+
+
+def _client_id() -> str:
+    """처리량 제한·감사 로그용 클라이언트 식별자. HTTP 원격 주소 > MCP 세션 순으로 서버가 정한다.
+
+    요청 meta의 client_id는 클라이언트가 매번 바꿀 수 있어(새 버킷으로 제한 우회) 감사 로그(meta_client_id)에만 남긴다.
+    """
+    try:
+        ctx = get_context()
+    except RuntimeError:
+        return "anonymous"
+    try:
+        request = get_http_request()
+        if request.client is not None:
+            return f"ip:{request.client.host}"
+    except RuntimeError:
+        pass
+    try:
+        return f"session:{ctx.session_id}"
+    except RuntimeError:
+        return "anonymous"
+
+
+def _meta_client_id() -> str | None:
+    """요청 meta의 client_id (클라이언트가 보낸 값, 감사 로그용). 없으면 None."""
+    try:
+        client_id = get_context().client_id
+    except RuntimeError:
+        return None
+    return str(client_id)[:200] if client_id else None
+
+
+def _begin(**audit_fields: Any) -> dict[str, Any]:
+    """Tool 호출 시작: 지표 수집을 시작하고 client_id(·meta_client_id)를 채운 감사 로그 필드 반환."""
+    metrics.start_call()
+    return {**audit_fields, "client_id": _client_id(), "meta_client_id": _meta_client_id()}
+
+
+async def _execute(
+    tool: str, fn: Callable[..., Any], *args: Any, client_id: str, table_count: int = 1, target: str | None = None
+) -> Any:
+    """처리량 제한을 통과한 뒤 target(None이면 기본 대상)에서 fn 실행."""
+    await _rate_limit(client_id, tool_cost(tool, table_count))
+    return await _run(fn, *args, target=target)
+
+
+async def _rate_limit(client_id: str, cost: float) -> None:
+    """처리량 제한 차감. 워커끼리 공유하는 버킷(SQLite 쓰기 잠금)이면 이벤트 루프를 막지 않도록 스레드에서 실행."""
+    if rate_limit_blocking():
+        await asyncio.to_thread(rate_limit_check, client_id, cost)
+    else:
+        rate_limit_check(client_id, cost)
+
+
+async def _run(fn: Callable[..., Any], *args: Any, target: str | None) -> Any:
+    """대상·서버 동시 실행 제한을 통과한 뒤 fn을 DB 워커 스레드에서 실행. 워커에서는 target이 현재 대상.
+
+    대상의 회로 차단기가 열려 있으면 슬롯을 잡지 않고 바로 CircuitOpenError.
+    """
+    name = target or targets.default_name()
+    if snapshot.current() is None:
+        db.check_breaker(name)
+    semaphores = [_concurrency_semaphore]
+    if name in _target_semaphores:
+        semaphores.insert(0, _target_semaphores[name])
+    wait_start = time.perf_counter()
+    acquired: list[asyncio.Semaphore] = []
+    try:
+        for semaphore in semaphores:
+            await _acquire_concurrency(semaphore, "서버" if semaphore is _concurrency_semaphore else f"대상 {name}")
+            acquired.append(semaphore)
+    except BaseException:
+        for semaphore in acquired:
+            semaphore.release()
+        raise
+    metrics.record_admission_wait(time.perf_counter() - wait_start)
+    loop = asyncio.get_running_loop()
+
+    def release(_: Any) -> None:
+        for semaphore in acquired:
+            loop.call_soon_threadsafe(semaphore.release)
+
+    try:
+        # 현재 contextvars(지표 CallStats, 대상 등)를 워커 스레드로 전달
+        with targets.use(name):
+            context = contextvars.copy_context()
+        future = _executor.submit(context.run, metrics.timed_run, fn, *args)
+    except BaseException:
+        for semaphore in acquired:
+            semaphore.release()
+        raise
+    # 클라이언트가 취소해도 워커가 실제로 끝날 때 슬롯을 반납해 DB 동시 작업 수를 지킴
+    future.add_done_callback(release)
+    return await asyncio.wrap_future(future)
 
 
-def _acquire_concurrency() -> None:
-    if _concurrency_semaphore:
-        _concurrency_semaphore.acquire()
+async def _fan_out(
+    tool: str, fn: Callable[..., Any], *args: Any, client_id: str
+) -> tuple[dict[str, Any], dict[str, str]]:
+    """모든 대상에서 fn을 동시에 실행. (대상별 결과, 실패한 대상별 오류 메시지) 반환.
 
+    대상마다 fanout_timeout(기본 FANOUT_TIMEOUT)초까지 기다리고, 일부가 실패·시간 초과여도 나머지 결과는 반환한다.
+    모든 대상이 실패하면 첫 대상의 오류를 그대로 올린다. 처리량 비용은 대상 수를 테이블 수처럼 계산.
+    """
+    names = targets.names()
+    await _rate_limit(client_id, tool_cost(tool, len(names)))
 
-def _release_concurrency() -> None:
-    if _concurrency_semaphore:
-        _concurrency_semaphore.release()
+    async def one(name: str) -> Any:
+        timeout = targets.get(name).fanout_timeout or None
+        try:
+            return await asyncio.wait_for(_run(fn, *args, target=name), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise DBConnectionError(f"대상 {name} 응답 시간 초과 ({timeout}초)") from None
+
+    outcomes = await asyncio.gather(*(one(name) for name in names), return_exceptions=True)
+    results: dict[str, Any] = {}
+    failed: dict[str, str] = {}
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, BaseException):
+            if not isinstance(outcome, Exception):
+                raise outcome
+            failed[name] = str(outcome)
+        else:
+            results[name] = outcome
+    if not results:
+        raise outcomes[0]
+    return results, failed
 
 
 def _to_json(value: Any) -> str:
-    """Tool 반환값을 JSON 문자열로."""
-    return json.dumps(value, ensure_ascii=False, indent=2)
+    """Tool 반환값을 JSON 문자열로. 스타일·백엔드·열 지향 인코딩은 OUTPUT_* 설정을 따름."""
+    call = metrics.current_call()
+    if call is None:
+        return serialization.dumps(value)
+    start = time.perf_counter()
+    text = serialization.dumps(value)
+    call.encode = time.perf_counter() - start
+    return text
+
+
+def _breaker(audit_fields: dict[str, Any]) -> str | None:
+    """감사 로그용 회로 차단기 상태. 정상(closed)·스냅샷 모드·전체 대상 조회는 None (기록 생략)."""
+    target = audit_fields.get("target")
+    if snapshot.current() is not None or target == targets.FANOUT:
+        return None
+    state = db.breaker_state(target or targets.default_name())
+    return None if state == "closed" else state
+
+
+def _success(tool: str, result: Any, audit_fields: dict[str, Any], **extra: Any) -> str:
+    """성공 응답: 감사 로그 기록, JSON 변환, 지표 기록."""
+    audit.log(tool, "success", breaker=_breaker(audit_fields), **extra, **audit_fields)
+    text = _to_json(result)
+    metrics.record_call(tool, "success", None, metrics.current_call())
+    return text
+
+
+def _error_response(tool: str, e: Exception, audit_fields: dict[str, Any]) -> str:
+    """예외를 감사 로그 사유와 클라이언트용 error JSON으로 변환."""
+    if isinstance(e, ValidationError):
+        reason, message = "validation_failed", str(e)
+    elif isinstance(e, RateLimitExceeded):
+        reason, message = "rate_limit_exceeded", e.message
+    elif isinstance(e, ServerBusy):
+        reason, message = "server_busy", str(e)
+    elif isinstance(e, MetadataError):
+        reason, message = "not_found", str(e)
+    elif isinstance(e, CircuitOpenError):
+        reason, message = "circuit_open", str(e)
+    elif isinstance(e, DBConnectionError):
+        reason, message = "db_error", str(e)
+    else:
+        reason, message = "error", f"처리 중 오류: {e!s}"
+    audit.log(tool, "rejected", reason=reason, breaker=_breaker(audit_fields), **audit_fields)
+    metrics.record_call(tool, "rejected", reason, metrics.current_call())
+    if isinstance(e, (RateLimitExceeded, CircuitOpenError)) and e.retry_after is not None:
+        return _to_json({"error": message, "retry_after": e.retry_after})
+    return _to_json({"error": message})
 
 
 @mcp.tool()
-def list_tables(schema_name: str | None = None) -> str:
-    """지정 스키마(또는 생략 시 전체)의 테이블 목록을 반환합니다."""
+async def list_tables(
+    schema_name: str | None = None,
+    page_size: int | None = None,
+    cursor: str | None = None,
+    name_prefix: str | None = None,
+    name_like: str | None = None,
+    target: str | None = None,
+) -> str:
+    """지정 스키마(또는 생략 시 전체)의 테이블 목록을 페이지 단위로 반환합니다.
+
+    name_prefix(접두어)·name_like(LIKE 패턴, %/_ 사용)로 테이블명을 거를 수 있습니다.
+    응답의 next_cursor가 있으면 cursor로 넘겨 다음 페이지를 조회합니다.
+    target="*"이면 모든 DB 대상을 동시에 조회해 합칩니다 (테이블별 target, 대상별 next_cursors, failed_targets).
+    """
+    audit_fields = _begin(schema_name=schema_name, target=target)
     try:
+        validate_target(target, fanout=True)
         validate_schema_name(schema_name)
-        rate_limit_check()
-        _acquire_concurrency()
-        try:
-            result = metadata.list_tables(schema_name=schema_name or None)
-            audit.log("list_tables", "success", schema_name=schema_name)
-            return _to_json(result)
-        finally:
-            _release_concurrency()
-    except ValidationError as e:
-        audit.log("list_tables", "rejected", schema_name=schema_name, reason="validation_failed")
-        return _to_json({"error": str(e)})
-    except RateLimitExceeded as e:
-        audit.log("list_tables", "rejected", schema_name=schema_name, reason="rate_limit_exceeded")
-        return _to_json({"error": e.message})
-    except DBConnectionError as e:
-        audit.log("list_tables", "rejected", schema_name=schema_name, reason="db_error")
-        return _to_json({"error": str(e)})
+        validate_page_size(page_size)
+        validate_name_prefix(name_prefix)
+        validate_name_like(name_like)
+        after = validate_list_cursor(cursor)
+        load = functools.partial(
+            _source().list_tables,
+            schema_name or None,
+            page_size=page_size,
+            after=after,
+            name_prefix=name_prefix,
+            name_like=name_like,
+        )
+        if target == targets.FANOUT:
+            if after is not None:
+                raise ValidationError('target="*"에서는 cursor를 쓸 수 없습니다. next_cursors의 대상별 커서로 조회하세요.')
+            results, failed = await _fan_out("list_tables", load, client_id=audit_fields["client_id"])
+            result = targets.merge_table_lists(results, failed)
+        else:
+            result = await _execute("list_tables", load, client_id=audit_fields["client_id"], target=target)
+        return _success("list_tables", result, audit_fields)
     except Exception as e:
-        audit.log("list_tables", "rejected", schema_name=schema_name, reason="error")
-        return _to_json({"error": f"처리 중 오류: {e!s}"})
+        return _error_response("list_tables", e, audit_fields)
 
 
 @mcp.tool()
-def get_table_metadata(schema_name: str, table_name: str) -> str:
-    """한 테이블에 대한 DDL 문서 작성에 필요한 전체 메타데이터를 반환합니다."""
+async def get_table_metadata(
+    schema_name: str,
+    table_name: str,
+    target: str | None = None,
+    sections: list[str] | None = None,
+    columns: list[str] | None = None,
+    column_fields: list[str] | None = None,
+    if_none_match: str | None = None,
+) -> str:
+    """한 테이블에 대한 DDL 문서 작성에 필요한 전체 메타데이터를 반환합니다.
+
+    sections(table, columns, primary_key, unique_keys, indexes, foreign_keys, check_constraints),
+    columns(컬럼명 부분집합), column_fields(컬럼 속성 부분집합)로 필요한 부분만 받을 수 있습니다.
+    응답의 version을 다음 호출의 if_none_match로 넘기면, 바뀌지 않은 경우 본문 없이 not_modified만 반환합니다.
+    version은 응답 내용의 해시이며, if_none_match를 받으면 그 테이블의 정의(FK 규칙·참조 대상, CHECK 식 포함)가
+    바뀌었는지 먼저 확인합니다.
+    """
+    audit_fields = _begin(schema_name=schema_name, table_name=table_name, target=target)
     try:
+        validate_target(target)
         validate_schema_name(schema_name)
         validate_table_name(table_name)
-        rate_limit_check()
-        _acquire_concurrency()
-        try:
-            result = metadata.get_table_metadata(schema_name, table_name)
-            audit.log("get_table_metadata", "success", schema_name=schema_name, table_name=table_name)
-            return _to_json(result)
-        finally:
-            _release_concurrency()
-    except ValidationError as e:
-        audit.log("get_table_metadata", "rejected", schema_name=schema_name, table_name=table_name, reason="validation_failed")
-        return _to_json({"error": str(e)})
-    except RateLimitExceeded as e:
-        audit.log("get_table_metadata", "rejected", schema_name=schema_name, table_name=table_name, reason="rate_limit_exceeded")
-        return _to_json({"error": e.message})
-    except MetadataError as e:
-        audit.log("get_table_metadata", "rejected", schema_name=schema_name, table_name=table_name, reason="not_found")
-        return _to_json({"error": str(e)})
-    except DBConnectionError as e:
-        audit.log("get_table_metadata", "rejected", schema_name=schema_name, table_name=table_name, reason="db_error")
-        return _to_json({"error": str(e)})
+        projection = validate_projection(sections, columns, column_fields)
+        validate_version(if_none_match)
+        result = await _execute(
+            "get_table_metadata",
+            functools.partial(versioning.get_table_metadata, _source()),
+            schema_name,
+            table_name,
+            projection,
+            if_none_match,
+            client_id=audit_fields["client_id"],
+            target=target,
+        )
+        return _success("get_table_metadata", result, audit_fields)
     except Exception as e:
-        audit.log("get_table_metadata", "rejected", schema_name=schema_name, table_name=table_name, reason="error")
-        return _to_json({"error": f"처리 중 오류: {e!s}"})
+        return _error_response("get_table_metadata", e, audit_fields)
 
 
 @mcp.tool()
-def get_tables_metadata(schema_name: str, table_names: list[str]) -> str:
-    """여러 테이블에 대한 DDL 메타데이터를 한 번에 조회합니다. 존재하지 않는 테이블은 결과에 error로 표시됩니다."""
+async def get_tables_metadata(
+    schema_name: str,
+    table_names: list[str],
+    target: str | None = None,
+    sections: list[str] | None = None,
+    columns: list[str] | None = None,
+    column_fields: list[str] | None = None,
+    if_none_match: dict[str, str] | None = None,
+) -> str:
+    """여러 테이블에 대한 DDL 메타데이터를 한 번에 조회합니다. 존재하지 않는 테이블은 결과에 error로 표시됩니다.
+
+    sections, columns, column_fields는 get_table_metadata와 같으며 모든 테이블에 적용됩니다.
+    항목마다 version이 붙으며, if_none_match(테이블명 -> version)와 같은 테이블은 not_modified로만 표시됩니다.
+    """
+    audit_fields = _begin(schema_name=schema_name, target=target)
     try:
+        validate_target(target)
         validate_schema_name(schema_name)
         table_names = validate_table_names_list(table_names)
-        rate_limit_check()
-        _acquire_concurrency()
-        try:
-            result = metadata.get_tables_metadata(schema_name, table_names)
-            audit.log("get_tables_metadata", "success", schema_name=schema_name, table_count=len(table_names))
-            return _to_json(result)
-        finally:
-            _release_concurrency()
-    except ValidationError as e:
-        audit.log("get_tables_metadata", "rejected", schema_name=schema_name, reason="validation_failed")
-        return _to_json({"error": str(e)})
-    except RateLimitExceeded as e:
-        audit.log("get_tables_metadata", "rejected", schema_name=schema_name, reason="rate_limit_exceeded")
-        return _to_json({"error": e.message})
-    except DBConnectionError as e:
-        audit.log("get_tables_metadata", "rejected", schema_name=schema_name, reason="db_error")
-        return _to_json({"error": str(e)})
+        projection = validate_projection(sections, columns, column_fields)
+        validate_version_map(if_none_match)
+        result = await _execute(
+            "get_tables_metadata",
+            functools.partial(versioning.get_tables_metadata, _source()),
+            schema_name,
+            table_names,
+            projection,
+            if_none_match,
+            client_id=audit_fields["client_id"],
+            target=target,
+            table_count=len(table_names),
+        )
+        return _success("get_tables_metadata", result, audit_fields, table_count=len(table_names))
+    except Exception as e:
+        return _error_response("get_tables_metadata", e, audit_fields)
+
+
+@mcp.tool()
+async def get_create_table(
+    schema_name: str, table_names: list[str] | None = None, cursor: str | None = None, target: str | None = None
+) -> str:
+    """테이블들의 CREATE TABLE 문을 한 번에 반환합니다. 존재하지 않는 테이블은 결과에 error로 표시됩니다.
+    table_names를 생략하면 스키마의 테이블을 이름 순으로 한 페이지(MAX_TABLES_PER_REQUEST개)씩 반환하며,
+    응답의 next_cursor가 있으면 cursor로 넘겨 다음 페이지를 조회합니다.
+    source는 show(SHOW CREATE TABLE 원문) 또는 rendered(메타데이터로 생성)입니다."""
+    audit_fields = _begin(schema_name=schema_name, target=target)
+    try:
+        validate_target(target)
+        validate_schema_name(schema_name)
+        after = validate_list_cursor(cursor)
+        paged, next_cursor = table_names is None, None
+        if not paged:
+            if after is not None:
+                raise ValidationError("cursor는 table_names를 생략한 스키마 전체 조회에서만 쓸 수 있습니다.")
+            table_names = validate_table_names_list(table_names)
+        else:
+            if after is not None and after[0] != schema_name:
+                raise ValidationError("잘못된 커서입니다.")
+            # 스키마 전체는 테이블 목록 페이지(list_tables와 같은 키셋·캐시)로 나눠, 페이지의 테이블 수만큼 과금
+            page = await _execute(
+                "list_tables",
+                functools.partial(
+                    _source().list_tables, schema_name, page_size=max(1, config.MAX_TABLES_PER_REQUEST), after=after
+                ),
+                client_id=audit_fields["client_id"],
+                target=target,
+            )
+            table_names = [t["table_name"] for t in page["tables"]]
+            next_cursor = page["next_cursor"]
+        result = await _execute(
+            "get_create_table",
+            _source().get_create_tables,
+            schema_name,
+            table_names,
+            client_id=audit_fields["client_id"],
+            target=target,
+            table_count=len(table_names),
+        )
+        if paged:
+            result = {**result, "next_cursor": next_cursor}
+        return _success("get_create_table", result, audit_fields, table_count=len(result["tables"]))
+    except Exception as e:
+        return _error_response("get_create_table", e, audit_fields)
+
+
+@mcp.tool()
+async def get_schema_overview(
+    schema_name: str, target: str | None = None, if_none_match: str | None = None
+) -> str:
+    """한 스키마의 테이블 목록과 외래키 관계 요약을 반환합니다 (DDL 문서 목차·개요용).
+    target="*"이면 모든 DB 대상을 동시에 조회해 합칩니다 (항목별 target, failed_targets).
+    응답의 version을 if_none_match로 넘기면, 바뀌지 않은 경우 본문 없이 not_modified만 반환합니다."""
+    audit_fields = _begin(schema_name=schema_name, target=target)
+    try:
+        validate_target(target, fanout=True)
+        validate_schema_name(schema_name)
+        validate_version(if_none_match)
+        load = functools.partial(versioning.get_schema_overview, _source())
+        if target == targets.FANOUT:
+            # 대상별 결과를 모은 뒤 합친 버전으로 비교 (응답 크기만 줄어듦)
+            results, failed = await _fan_out(
+                "get_schema_overview", load, schema_name, None, client_id=audit_fields["client_id"]
+            )
+            version = versioning.merged_version(results, failed)
+            if if_none_match == version:
+                result = versioning.not_modified(version, schema=schema_name)
+            else:
+                result = {**targets.merge_overviews(schema_name, results, failed), "version": version}
+        else:
+            result = await _execute(
+                "get_schema_overview",
+                load,
+                schema_name,
+                if_none_match,
+                client_id=audit_fields["client_id"],
+                target=target,
+            )
+        return _success("get_schema_overview", result, audit_fields)
+    except Exception as e:
+        return _error_response("get_schema_overview", e, audit_fields)
+
+
+@mcp.tool()
+async def get_table_relations(
+    schema_name: str,
+    table_name: str,
+    depth: int = 1,
+    direction: str = "both",
+    target: str | None = None,
+) -> str:
+    """테이블의 FK 이웃과 depth단계 안의 연관 테이블을 반환합니다. direction: out(참조하는 부모), in(참조하는 자식), both."""
+    audit_fields = _begin(schema_name=schema_name, table_name=table_name, target=target)
+    try:
+        validate_target(target)
+        validate_schema_name(schema_name)
+        validate_table_name(table_name)
+        validate_graph_depth(depth)
+        validate_direction(direction)
+        result = await _execute(
+            "get_table_relations",
+            functools.partial(fk_graph.get_table_relations, _source()),
+            schema_name,
+            table_name,
+            depth,
+            direction,
+            client_id=audit_fields["client_id"],
+            target=target,
+        )
+        return _success("get_table_relations", result, audit_fields)
     except Exception as e:
-        audit.log("get_tables_metadata", "rejected", schema_name=schema_name, reason="error")
-        return _to_json({"error": f"처리 중 오류: {e!s}"})
+        return _error_response("get_table_relations", e, audit_fields)
 
 
 @mcp.tool()
-def get_schema_overview(schema_name: str) -> str:
-    """한 스키마의 테이블 목록과 외래키 관계 요약을 반환합니다 (DDL 문서 목차·개요용)."""
+async def find_join_path(
+    schema_name: str,
+    from_table: str,
+    to_table: str,
+    max_hops: int | None = None,
+    target: str | None = None,
+) -> str:
+    """두 테이블을 잇는 가장 짧은 FK 조인 경로(단계별 ON 조건 포함)를 반환합니다. 경로가 없으면 path는 null."""
+    audit_fields = _begin(schema_name=schema_name, table_name=from_table, target=target)
     try:
+        validate_target(target)
         validate_schema_name(schema_name)
-        rate_limit_check()
-        _acquire_concurrency()
+        validate_table_name(from_table)
+        validate_table_name(to_table)
+        if max_hops is None:
+            max_hops = config.FK_GRAPH_MAX_DEPTH
+        validate_graph_depth(max_hops, "max_hops")
+        result = await _execute(
+            "find_join_path",
+            functools.partial(fk_graph.find_join_path, _source()),
+            schema_name,
+            from_table,
+            to_table,
+            max_hops,
+            client_id=audit_fields["client_id"],
+            target=target,
+        )
+        return _success("find_join_path", result, audit_fields)
+    except Exception as e:
+        return _error_response("find_join_path", e, audit_fields)
+
+
+@mcp.tool()
+async def get_load_order(schema_name: str, target: str | None = None) -> str:
+    """참조 대상(부모) 테이블이 먼저 오는 적재 순서와 FK 순환(자기 참조 포함) 목록을 반환합니다."""
+    audit_fields = _begin(schema_name=schema_name, target=target)
+    try:
+        validate_target(target)
+        validate_schema_name(schema_name)
+        result = await _execute(
+            "get_load_order",
+            functools.partial(fk_graph.get_load_order, _source()),
+            schema_name,
+            client_id=audit_fields["client_id"],
+            target=target,
+        )
+        return _success("get_load_order", result, audit_fields)
+    except Exception as e:
+        return _error_response("get_load_order", e, audit_fields)
+
+
+@mcp.tool()
+async def search_columns(
+    query: str,
+    schema_name: str | None = None,
+    match: str = "prefix",
+    limit: int = 50,
+    target: str | None = None,
+) -> str:
+    """컬럼명·타입·코멘트로 컬럼을 검색합니다 (예: "user id", "billing"). schema_name 생략 시 허용된 전체 스키마.
+    match: exact(토큰 일치) / prefix(토큰 접두어, 기본) / substring(토큰 부분 문자열). 점수 높은 순."""
+    audit_fields = _begin(schema_name=schema_name, target=target)
+    try:
+        validate_target(target)
+        validate_search_query(query)
+        validate_schema_name(schema_name)
+        validate_search_options(match, limit)
+        result = await _execute(
+            "search_columns",
+            functools.partial(search.search_columns, _source()),
+            query,
+            schema_name,
+            match,
+            limit,
+            client_id=audit_fields["client_id"],
+            target=target,
+        )
+        return _success("search_columns", result, audit_fields)
+    except Exception as e:
+        return _error_response("search_columns", e, audit_fields)
+
+
+@mcp.tool()
+async def search_tables(
+    query: str,
+    schema_name: str | None = None,
+    match: str = "prefix",
+    limit: int = 50,
+    target: str | None = None,
+) -> str:
+    """테이블명·테이블 코멘트로 테이블을 검색합니다. schema_name 생략 시 허용된 전체 스키마.
+    match: exact / prefix(기본) / substring. 점수 높은 순."""
+    audit_fields = _begin(schema_name=schema_name, target=target)
+    try:
+        validate_target(target)
+        validate_search_query(query)
+        validate_schema_name(schema_name)
+        validate_search_options(match, limit)
+        result = await _execute(
+            "search_tables",
+            functools.partial(search.search_tables, _source()),
+            query,
+            schema_name,
+            match,
+            limit,
+            client_id=audit_fields["client_id"],
+            target=target,
+        )
+        return _success("search_tables", result, audit_fields)
+    except Exception as e:
+        return _error_response("search_tables", e, audit_fields)
+
+
+@mcp.tool()
+async def diff_schema(schema_name: str, since: str | None = None, target: str | None = None) -> str:
+    """since(이전 diff_schema 응답의 version) 이후 추가·삭제된 테이블과 컬럼·인덱스·FK 등이 바뀐 테이블을 반환합니다.
+    since 없이 호출하면 현재 상태를 기준점으로 저장하고 version만 반환합니다. 변경 표시가 바뀐 테이블만 다시 조회합니다.
+    리소스 schema://{target}/{schema_name}/changes를 구독하면 변경이 감지될 때 알림을 받습니다."""
+    audit_fields = _begin(schema_name=schema_name, target=target)
+    try:
+        validate_target(target)
+        validate_schema_name(schema_name)
+        validate_version(since, "since")
+        result = await _execute(
+            "diff_schema",
+            functools.partial(schema_diff.diff_schema, _source()),
+            schema_name,
+            since,
+            client_id=audit_fields["client_id"],
+            target=target,
+        )
+        return _success("diff_schema", result, audit_fields)
+    except Exception as e:
+        return _error_response("diff_schema", e, audit_fields)
+
+
+# 변경 감시 리소스 구독: URI -> {세션: 세션의 이벤트 루프}. 감시 스레드에서 알림을 보내므로 잠금으로 보호.
+# 감시(schema_diff.watch/unwatch)도 이 잠금 안에서 바꿔, 마지막 구독 해제와 새 구독이 엇갈려도 감시 여부가 맞게 한다
+_subscriptions: dict[str, dict[Any, asyncio.AbstractEventLoop]] = {}
+_subscriptions_lock = threading.Lock()
+
+
+def _parse_changes_uri(uri: str) -> tuple[str, str]:
+    """schema://{target}/{schema_name}/changes -> (대상, 스키마)."""
+    body = uri.removeprefix("schema://").removesuffix("/changes")
+    target, _, schema_name = body.partition("/")
+    if not uri.startswith("schema://") or not uri.endswith("/changes") or targets.get(target) is None:
+        raise ValidationError(f"구독할 수 없는 리소스입니다: {uri[:200]}")
+    validate_schema_name(schema_name)
+    return target, schema_name
+
+
+def _drop_subscription(uri: str, session: Any) -> None:
+    """세션의 구독 해제. 남은 구독이 없고 SCHEMA_WATCH_SCHEMAS로 지정한 스키마가 아니면 감시도 멈춘다."""
+    target, schema_name = _parse_changes_uri(uri)
+    with _subscriptions_lock:
+        sessions = _subscriptions.get(uri)
+        if sessions is None:
+            return
+        sessions.pop(session, None)
+        if sessions:
+            return
+        del _subscriptions[uri]
+        if not (target == targets.default_name() and schema_name in config.SCHEMA_WATCH_SCHEMAS):
+            schema_diff.unwatch(target, schema_name)
+
+
+def _notify_changed(target: str, schema_name: str) -> None:
+    """감시 스레드에서 호출: 구독한 세션마다 resources/updated 전송. 실패한 세션은 구독 해제."""
+    uri = schema_diff.resource_uri(target, schema_name)
+    with _subscriptions_lock:
+        sessions = list(_subscriptions.get(uri, {}).items())
+
+    def done(session: Any, future: Any) -> None:
+        if future.cancelled() or future.exception() is not None:
+            _drop_subscription(uri, session)
+
+    for session, loop in sessions:
         try:
-            result = metadata.get_schema_overview(schema_name)
-            audit.log("get_schema_overview", "success", schema_name=schema_name)
-            return _to_json(result)
-        finally:
-            _release_concurrency()
-    except ValidationError as e:
-        audit.log("get_schema_overview", "rejected", schema_name=schema_name, reason="validation_failed")
-        return _to_json({"error": str(e)})
-    except RateLimitExceeded as e:
-        audit.log("get_schema_overview", "rejected", schema_name=schema_name, reason="rate_limit_exceeded")
-        return _to_json({"error": e.message})
-    except DBConnectionError as e:
-        audit.log("get_schema_overview", "rejected", schema_name=schema_name, reason="db_error")
-        return _to_json({"error": str(e)})
+            future = asyncio.run_coroutine_threadsafe(mcp_compat.send_resource_updated(session, uri), loop)
+        except RuntimeError:  # 세션의 이벤트 루프가 닫힘
+            _drop_subscription(uri, session)
+            continue
+        future.add_done_callback(functools.partial(done, session))
+
+
+async def _subscribe(uri: str, session: Any) -> None:
+    target, schema_name = _parse_changes_uri(uri)
+    with _subscriptions_lock:
+        sessions = _subscriptions.setdefault(uri, {})
+        first = session not in sessions
+        sessions[session] = asyncio.get_running_loop()
+        schema_diff.watch(target, schema_name, _notify_changed)
+    if first:
+        # unsubscribe 없이 연결이 끊겨도 구독·감시가 남지 않도록
+        mcp_compat.on_session_closed(session, functools.partial(_drop_subscription, uri, session))
+
+
+async def _unsubscribe(uri: str, session: Any) -> None:
+    _drop_subscription(uri, session)
+
+
+mcp_compat.on_subscribe(mcp, _subscribe)
+mcp_compat.on_unsubscribe(mcp, _unsubscribe)
+mcp_compat.advertise_subscribe(mcp)
+
+
+@mcp.resource("schema://{target}/{schema_name}/changes", mime_type="application/json")
+async def schema_changes(target: str, schema_name: str) -> str:
+    """감시 중인 스키마에서 마지막으로 감지한 변경 (diff_schema 형식). 아직 없으면 changed=false."""
+    _parse_changes_uri(schema_diff.resource_uri(target, schema_name))
+    latest = schema_diff.latest_changes(target, schema_name)
+    return serialization.dumps(latest or {"schema": schema_name, "target": target, "changed": False})
+
+
+def _start_background(*, watch: bool = True) -> None:
+    """DB 모드면 미리 적재 시작, watch면 SCHEMA_WATCH_SCHEMAS 감시 시작."""
+    if snapshot.current() is None:
+        prewarm.start()
+    if not watch:
+        return
+    for schema_name in config.SCHEMA_WATCH_SCHEMAS:
+        schema_diff.watch(targets.default_name(), schema_name, _notify_changed)
+
+
+@mcp.tool()
+async def list_targets() -> str:
+    """조회할 수 있는 DB 대상(샤드 등) 목록과 기본 대상. 모든 Tool의 target 인자에 이름을 넘기면 그 대상을 조회합니다."""
+    audit_fields = _begin()
+    try:
+        return _success("list_targets", targets.describe(), audit_fields)
     except Exception as e:
-        audit.log("get_schema_overview", "rejected", schema_name=schema_name, reason="error")
-        return _to_json({"error": f"처리 중 오류: {e!s}"})
+        return _error_response("list_targets", e, audit_fields)
+
+
+def _component_stats() -> dict[str, dict[str, Any]]:
+    """커넥션 풀·캐시·처리량 제한·감사 로그·스냅샷 상태."""
+    return {
+        "db_pool": db.pool_stats(),
+        "routing": db.routing_stats(),
+        "circuit_breaker": db.breaker_stats(),
+        "query_timeout": db.timeout_stats(),
+        "metadata_cache": metadata.cache_stats(),
+        "singleflight": metadata.singleflight_stats(),
+        "prewarm": prewarm.prewarm_stats(),
+        "fk_graph": fk_graph.graph_stats(),
+        "schema_diff": schema_diff.diff_stats(),
+        "search_index": search.search_stats(),
+        "rate_limiter": rate_limiter.limiter_stats(),
+        "audit": audit.audit_stats(),
+        "snapshot": snapshot.snapshot_stats(),
+        "shared_state": shared_state.shared_stats(),
+    }
+
+
+if config.METRICS_ENABLED:
+
+    @mcp.custom_route("/metrics", methods=["GET"])
+    async def metrics_endpoint(request: Request) -> PlainTextResponse:
+        """Prometheus 텍스트 형식 지표 (HTTP 모드)."""
+        return PlainTextResponse(
+            metrics.render_prometheus(_component_stats()), media_type="text/plain; version=0.0.4"
+        )
+
+    @mcp.tool()
+    async def server_stats() -> str:
+        """서버 상태 요약: Tool별 호출 수·지연 분위수·SQL 문/행 수·단계별 시간, 커넥션 풀·캐시·처리량 제한 통계."""
+        # 공유 상태 통계는 SQLite 조회라 이벤트 루프 밖에서
+        return serialization.dumps({**metrics.summary(), **(await asyncio.to_thread(_component_stats))})
+
+
+def create_http_app() -> Any:
+    """--workers 모드의 워커 프로세스용 ASGI 앱 (uvicorn app factory).
+
+    요청이 어느 워커로 갈지 정해지지 않으므로 세션 없는(stateless) HTTP로 제공한다.
+    세션이 없어 리소스 구독·알림을 받을 곳이 없으므로 SCHEMA_WATCH_SCHEMAS 감시는 시작하지 않는다 (워커마다 DB를 주기적으로 읽게 됨).
+    """
+    _start_background(watch=False)
+    return mcp.http_app(stateless_http=True)
+
+
+def serve_workers(host: str, port: int, workers: int, app: str = "src.server:create_http_app") -> None:
+    """같은 포트를 여러 워커 프로세스가 나눠 받도록 uvicorn으로 실행. 워커는 환경 변수로 설정을 넘겨받는다.
+
+    처리량 제한·메타데이터 캐시는 SHARED_STATE_PATH로 워커끼리 공유한다. 미지정 시 이 프로세스만 쓰는 임시 디렉터리(0700)에
+    만들고 종료 시 삭제한다. 감사 로그는 워커마다 다른 파일에 쓴다(AUDIT_LOG_PER_PROCESS).
+    MAX_CONCURRENT_REQUESTS·DB 커넥션 풀은 워커마다 따로 적용된다.
+    """
+    import shutil
+
+    import uvicorn
+
+    os.environ["AUDIT_LOG_PER_PROCESS"] = "true"
+    shared_dir = None
+    if not config.SHARED_STATE_PATH:
+        shared_dir = tempfile.mkdtemp(prefix="db-mcp-shared-")
+        os.environ["SHARED_STATE_PATH"] = os.path.join(shared_dir, "shared.sqlite")
+    try:
+        uvicorn.run(app, factory=True, host=host, port=port, workers=workers)
+    finally:
+        if shared_dir is not None:
+            shutil.rmtree(shared_dir, ignore_errors=True)
 
 
 if __name__ == "__main__":
@@ -165,8 +835,32 @@ if __name__ == "__main__":
         help="HTTP 모드로 실행 (예: --http 8000). 미지정 시 stdio 모드.",
     )
     parser.add_argument("--host", default="127.0.0.1", help="HTTP 바인드 주소 (기본: 127.0.0.1)")
+    parser.add_argument(
+        "--snapshot",
+        metavar="PATH",
+        default=None,
+        help="DB 대신 스냅샷 파일로 응답 (python -m src.snapshot export로 생성). SNAPSHOT_PATH보다 우선.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="HTTP 모드 워커 프로세스 수 (기본: 1). 2 이상이면 처리량 제한·캐시를 공유 파일로 함께 사용.",
+    )
     args = parser.parse_args()
 
+    if args.workers > 1:
+        if args.http is None:
+            parser.error("--workers는 --http와 함께 사용합니다.")
+        if args.snapshot:
+            os.environ["SNAPSHOT_PATH"] = args.snapshot
+        serve_workers(args.host, args.http, args.workers)
+        raise SystemExit(0)
+
+    if args.snapshot:
+        snapshot.open_store(args.snapshot)
+    _start_background()
+
     if args.http is not None:
         asyncio.run(mcp.run_async(transport="http", host=args.host, port=args.http))
     else:
@@ -0,0 +1,204 @@
+"""여러 워커 프로세스(--workers)가 함께 쓰는 상태. SQLite 파일 1개(WAL)에 보관한다.
+
+- 처리량 제한 토큰 버킷: 워커가 달라도 클라이언트별 한도가 하나로 유지된다.
+- 메타데이터 캐시 2단계(L2): 워커별 메모리 캐시(L1)에 없으면 여기서 찾고, DB에서 읽은 값은 여기에도 저장한다.
+- 작업 임대(lease): 백그라운드 갱신처럼 워커 하나만 하면 되는 일을 맡을 워커를 정한다.
+
+SHARED_STATE_PATH가 비어 있으면 사용하지 않는다 (단일 프로세스). 시각은 프로세스끼리 비교하므로 time.time() 기준.
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from . import config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    client_id TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    target TEXT NOT NULL,
+    schema_name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    stored_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cache_schema ON cache (target, schema_name);
+CREATE INDEX IF NOT EXISTS cache_stored_at ON cache (stored_at);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class SharedStore:
+    """공유 SQLite 파일. 스레드마다 연결 1개. 쓰기는 BEGIN IMMEDIATE로 워커 사이에서도 원자적으로 처리."""
+
+    def __init__(self, path: str, *, cache_max_bytes: int) -> None:
+        self.path = path
+        self.cache_max_bytes = cache_max_bytes
+        self.owner = f"{os.getpid()}"
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._puts = 0
+        self._stats = {"cache_hits": 0, "cache_misses": 0, "cache_puts": 0, "cache_evictions": 0}
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += n
+
+    # ---- 처리량 제한 ----
+
+    def consume(self, client_id: str, cost: float, *, rate: float, capacity: float) -> float | None:
+        """client_id 버킷에서 cost만큼 차감. 성공이면 None, 부족하면 모자란 토큰 수."""
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE client_id = ?", (client_id,)).fetchone()
+            tokens = capacity if row is None else min(capacity, row[0] + max(0.0, now - row[1]) * rate)
+            short = None if tokens >= cost else cost - tokens
+            if short is None:
+                tokens -= cost
+            conn.execute(
+                "INSERT INTO buckets (client_id, tokens, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (client_id) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                (client_id, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return short
+
+    def evict_buckets(self, idle_seconds: float, max_clients: int) -> int:
+        """idle_seconds 동안 안 쓴 버킷과, max_clients를 넘는 오래된 버킷 삭제. 삭제 수 반환."""
+        conn = self._conn()
+        removed = conn.execute("DELETE FROM buckets WHERE updated_at < ?", (time.time() - idle_seconds,)).rowcount
+        removed += conn.execute(
+            "DELETE FROM buckets WHERE client_id IN "
+            "(SELECT client_id FROM buckets ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+            (max_clients,),
+        ).rowcount
+        return removed
+
+    def bucket_count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM buckets").fetchone()[0]
+
+    # ---- 메타데이터 캐시 L2 ----
+
+    def cache_get(self, key: str, fingerprint: str, ttl: float) -> str | None:
+        """지문이 같고 ttl(0이면 무제한) 안에 저장된 값(JSON 문자열). 없으면 None."""
+        row = self._conn().execute("SELECT value, fingerprint, stored_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] != fingerprint or (ttl > 0 and time.time() - row[2] >= ttl):
+            self._count("cache_misses")
+            return None
+        self._count("cache_hits")
+        return row[0]
+
+    def cache_put(self, key: str, target: str, schema_name: str, value: str, size: int, fingerprint: str) -> None:
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, target, schema_name, value, size, fingerprint, stored_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, target, schema_name, value, size, fingerprint, time.time()),
+        )
+        with self._lock:
+            self._stats["cache_puts"] += 1
+            self._puts += 1
+            check = self._puts % 64 == 0
+        if check and self.cache_max_bytes > 0:
+            self._evict_cache(conn)
+
+    def _evict_cache(self, conn: sqlite3.Connection) -> None:
+        """전체 크기가 상한을 넘으면 오래 저장된 항목부터 삭제 (put 64번마다 확인)."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.cache_max_bytes:
+            return
+        excess = total - self.cache_max_bytes
+        removed = 0
+        freed = 0
+        for key, size in conn.execute("SELECT key, size FROM cache ORDER BY stored_at").fetchall():
+            if freed >= excess:
+                break
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            freed += size
+            removed += 1
+        self._count("cache_evictions", removed)
+
+    def cache_invalidate(self, target: str, schema_name: str, fingerprint: str | None = None) -> None:
+        """스키마 항목 삭제. fingerprint를 주면 그 지문이 아닌(오래된) 항목만."""
+        if fingerprint is None:
+            self._conn().execute("DELETE FROM cache WHERE target = ? AND schema_name = ?", (target, schema_name))
+        else:
+            self._conn().execute(
+                "DELETE FROM cache WHERE target = ? AND schema_name = ? AND fingerprint != ?",
+                (target, schema_name, fingerprint),
+            )
+
+    def cache_invalidate_prefixes(self, target: str, schema_name: str, prefixes: list[str]) -> None:
+        """스키마 항목 중 키가 prefixes 중 하나로 시작하는 것만 삭제 (대소문자 무시)."""
+        conn = self._conn()
+        for prefix in prefixes:
+            conn.execute(
+                "DELETE FROM cache WHERE target = ? AND schema_name = ? AND lower(substr(key, 1, ?)) = lower(?)",
+                (target, schema_name, len(prefix), prefix),
+            )
+
+    def cache_clear(self, target: str) -> None:
+        self._conn().execute("DELETE FROM cache WHERE target = ?", (target,))
+
+    # ---- 작업 임대 ----
+
+    def try_lease(self, name: str, ttl: float) -> bool:
+        """name 작업을 이 프로세스가 맡는다(ttl초). 다른 프로세스가 유효하게 잡고 있으면 False. 이미 잡고 있으면 연장."""
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+            "WHERE leases.owner = excluded.owner OR leases.expires_at < ?",
+            (name, self.owner, now + ttl, now),
+        )
+        row = conn.execute("SELECT owner FROM leases WHERE name = ?", (name,)).fetchone()
+        return row is not None and row[0] == self.owner
+
+    def stats(self) -> dict[str, Any]:
+        row = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+        with self._lock:
+            return {"worker_pid": os.getpid(), "cache_entries": row[0], "cache_bytes": row[1], **self._stats}
+
+
+_store: SharedStore | None = None
+if config.SHARED_STATE_PATH:
+    _store = SharedStore(config.SHARED_STATE_PATH, cache_max_bytes=config.SHARED_CACHE_MAX_BYTES)
+
+
+def store() -> SharedStore | None:
+    """공유 상태 저장소 (SHARED_STATE_PATH 미설정 시 None)."""
+    return _store
+
+
+def shared_stats() -> dict[str, Any]:
+    """공유 상태 통계 (이 워커 기준 L2 적중·미스, 저장 항목 수·크기). 미사용 시 enabled=False."""
+    if _store is None:
+        return {"enabled": False}
+    return {"enabled": True, **_store.stats()}
@@ -0,0 +1,64 @@
+"""동일 요청 합치기(single-flight): 같은 키로 동시에 들어온 조회는 DB 작업 1번의 결과(또는 예외)를 함께 받는다.
+
+결과를 보관하지 않으므로 캐시처럼 오래된 값을 돌려줄 위험이 없다. 진행 중인 작업이 끝나면 키는 바로 사라진다.
+"""
+import threading
+from typing import Any, Callable, Hashable
+
+from . import config, metrics
+
+
+class _Call:
+    __slots__ = ("done", "value", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """키별 진행 중 작업 1개. 먼저 온 호출(leader)이 실행하고, 나머지는 끝날 때까지 기다려 같은 결과를 받는다."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._stats = {"executions": 0, "coalesced": 0, "errors": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any], label: str | None = None) -> Any:
+        """fn()을 실행하거나, 같은 key로 진행 중인 실행이 있으면 그 결과를 기다려 반환. label은 지표용(Tool 이름 등)."""
+        if not config.SINGLEFLIGHT_ENABLED:
+            return fn()
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["executions"] += 1
+            else:
+                call.waiters += 1
+                self._stats["coalesced"] += 1
+        if not leader:
+            metrics.record_coalesced(label or self.name)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"in_flight": len(self._calls), **self._stats}
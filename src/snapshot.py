@@ -0,0 +1,322 @@
+"""오프라인 스키마 스냅샷: 메타데이터를 SQLite 파일 하나로 내보내고, DB 없이 그 파일에서 응답.
+
+내보내기는 metadata 모듈과 같은 조회 경로(get_schema_overview, 스키마 전체 스캔)를 사용한다.
+파일은 임시 파일에 쓴 뒤 os.replace로 교체하므로, 서버가 읽는 중에 다시 내보내도 안전하다.
+
+사용 예:
+  python -m src.snapshot export --schemas mydb,other --out snapshot.db
+  python -m src.snapshot info snapshot.db
+  python -m src.server --snapshot snapshot.db
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from . import config, ddl, metadata, targets
+from .metadata import MetadataError
+
+SNAPSHOT_FORMAT = 1
+
+_DDL = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE schemas (
+    schema_name TEXT PRIMARY KEY,
+    overview TEXT NOT NULL
+);
+CREATE TABLE tables (
+    schema_name TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    table_comment TEXT,
+    metadata TEXT NOT NULL,
+    PRIMARY KEY (schema_name, table_name)
+) WITHOUT ROWID;
+"""
+
+
+def _compact(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def export_snapshot(schemas: list[str], path: str) -> dict[str, Any]:
+    """schemas의 테이블 목록·개요·테이블별 메타데이터를 path에 저장. 요약(스키마·테이블 수) 반환."""
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f"{target.name}.tmp-{os.getpid()}")
+    tmp.unlink(missing_ok=True)
+    summary: dict[str, Any] = {"path": str(target), "schemas": {}}
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.executescript(_DDL)
+        for schema_name in schemas:
+            overview = metadata.get_schema_overview(schema_name)
+            tables = metadata.get_schema_tables_metadata(schema_name)
+            conn.execute(
+                "INSERT INTO schemas (schema_name, overview) VALUES (?, ?)",
+                (schema_name, _compact(overview)),
+            )
+            conn.executemany(
+                "INSERT INTO tables (schema_name, table_name, table_comment, metadata) VALUES (?, ?, ?, ?)",
+                (
+                    (schema_name, name, entry["table"].get("table_comment"), _compact(entry))
+                    for name, entry in tables.items()
+                ),
+            )
+            summary["schemas"][schema_name] = len(tables)
+        created_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        conn.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?)",
+            [("format", str(SNAPSHOT_FORMAT)), ("created_at", created_at), ("schemas", _compact(schemas))],
+        )
+        conn.commit()
+    except BaseException:
+        conn.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    conn.close()
+    os.replace(tmp, target)
+    summary["created_at"] = created_at
+    return summary
+
+
+class SnapshotStore:
+    """스냅샷 파일 읽기 전용 조회. metadata 모듈과 같은 이름·반환 형식의 함수를 제공."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        stat = os.stat(path)
+        self._identity = (stat.st_ino, stat.st_mtime_ns)
+        self._local = threading.local()
+        meta = dict(self._conn().execute("SELECT key, value FROM meta").fetchall())
+        if meta.get("format") != str(SNAPSHOT_FORMAT):
+            raise MetadataError(f"지원하지 않는 스냅샷 형식입니다: {path}")
+        self.created_at = meta.get("created_at")
+        self.schemas: list[str] = json.loads(meta.get("schemas", "[]"))
+
+    def _conn(self) -> sqlite3.Connection:
+        # 스레드마다 읽기 전용 연결 1개. 파일이 교체돼도 열린 연결은 기존 파일을 계속 읽는다.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            self._local.conn = conn
+        return conn
+
+    def changed_on_disk(self) -> bool:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        return (stat.st_ino, stat.st_mtime_ns) != self._identity
+
+    def info(self) -> dict[str, Any]:
+        counts = dict(self._conn().execute("SELECT schema_name, COUNT(*) FROM tables GROUP BY schema_name").fetchall())
+        return {"path": self.path, "created_at": self.created_at, "schemas": {s: counts.get(s, 0) for s in self.schemas}}
+
+    def list_tables(
+        self,
+        schema_name: str | None = None,
+        *,
+        page_size: int | None = None,
+        after: tuple[str, str] | None = None,
+        name_prefix: str | None = None,
+        name_like: str | None = None,
+    ) -> dict[str, Any]:
+        limit = page_size or config.MAX_LIST_TABLES_RESULT
+        if config.MAX_LIST_TABLES_RESULT > 0:
+            limit = min(limit, config.MAX_LIST_TABLES_RESULT) if limit > 0 else config.MAX_LIST_TABLES_RESULT
+        where = ["1 = 1"]
+        params: list[Any] = []
+        if schema_name:
+            where.append("schema_name = ?")
+            params.append(schema_name)
+        elif config.ALLOWED_SCHEMAS:
+            where.append(f"schema_name IN ({', '.join('?' * len(config.ALLOWED_SCHEMAS))})")
+            params.extend(config.ALLOWED_SCHEMAS)
+        if name_prefix:
+            where.append("table_name LIKE ? ESCAPE '\\'")
+            params.append(metadata.escape_like(name_prefix) + "%")
+        if name_like:
+            where.append("table_name LIKE ?")
+            params.append(name_like)
+        if after is not None:
+            where.append("(schema_name > ? OR (schema_name = ? AND table_name > ?))")
+            params.extend((after[0], after[0], after[1]))
+        sql = (
+            "SELECT schema_name, table_name, table_comment FROM tables "
+            f"WHERE {' AND '.join(where)} ORDER BY schema_name, table_name"
+        )
+        if limit > 0:
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+        tables = [
+            {"schema": s, "table_name": t, "table_comment": c}
+            for s, t, c in self._conn().execute(sql, params).fetchall()
+        ]
+        next_cursor = None
+        if limit > 0 and len(tables) > limit:
+            tables = tables[:limit]
+            next_cursor = metadata.encode_list_cursor(tables[-1]["schema"], tables[-1]["table_name"])
+        return {"tables": tables, "next_cursor": next_cursor}
+
+    def get_table_metadata(
+        self, schema_name: str, table_name: str, projection: metadata.Projection | None = None
+    ) -> dict[str, Any]:
+        row = self._conn().execute(
+            "SELECT metadata FROM tables WHERE schema_name = ? AND table_name = ?", (schema_name, table_name)
+        ).fetchone()
+        if row is None:
+            raise MetadataError(f"스키마 또는 테이블이 존재하지 않습니다: {schema_name}.{table_name}")
+        entry = json.loads(row[0])
+        return entry if projection is None else projection.apply(entry)
+
+    def get_tables_metadata(
+        self, schema_name: str, table_names: list[str], projection: metadata.Projection | None = None
+    ) -> list[dict[str, Any]]:
+        result: list[dict[str, Any]] = []
+        for table_name in table_names:
+            try:
+                result.append(self.get_table_metadata(schema_name, table_name, projection))
+            except MetadataError as e:
+                result.append({"error": str(e), "schema": schema_name, "table_name": table_name})
+        return result
+
+    def get_schema_tables_metadata(self, schema_name: str) -> dict[str, dict[str, Any]]:
+        rows = self._conn().execute("SELECT table_name, metadata FROM tables WHERE schema_name = ?", (schema_name,))
+        return {t: json.loads(raw) for t, raw in rows}
+
+    def get_create_tables(self, schema_name: str, table_names: list[str]) -> dict[str, Any]:
+        """저장된 메타데이터로 CREATE TABLE 문 생성 (스냅샷에는 SHOW CREATE TABLE 원문이 없음)."""
+        metadata.check_table_count(table_names)
+        entries = {
+            t: e for t, e in zip(table_names, self.get_tables_metadata(schema_name, table_names)) if "error" not in e
+        }
+        found = {t: ddl.render_create_table(e) for t, e in entries.items()}
+        return ddl.response(schema_name, table_names, found, "rendered")
+
+    def get_schema_overview(self, schema_name: str) -> dict[str, Any]:
+        row = self._conn().execute("SELECT overview FROM schemas WHERE schema_name = ?", (schema_name,)).fetchone()
+        if row is None:
+            raise MetadataError(f"스냅샷에 없는 스키마입니다: {schema_name}")
+        return json.loads(row[0])
+
+    def list_schemas(self) -> list[str]:
+        if config.ALLOWED_SCHEMAS:
+            return [s for s in self.schemas if s in config.ALLOWED_SCHEMAS]
+        return list(self.schemas)
+
+    def schema_fingerprint(self, schema_name: str) -> str:
+        # 스냅샷 파일은 바뀌지 않으므로 파일 식별자가 곧 지문
+        return f"snapshot:{self._identity[0]}:{self._identity[1]}:{schema_name}"
+
+    def table_stamps(self, schema_name: str, table_names: list[str] | None = None) -> dict[str, int]:
+        """테이블명 -> 저장된 메타데이터의 CRC32 (diff_schema용, 스냅샷이 교체되면 바뀐 테이블만 달라짐)."""
+        rows = self._conn().execute("SELECT table_name, metadata FROM tables WHERE schema_name = ?", (schema_name,))
+        stamps = {t: zlib.crc32(raw.encode("utf-8")) for t, raw in rows}
+        if table_names is not None:
+            wanted = set(table_names)
+            stamps = {t: s for t, s in stamps.items() if t in wanted}
+        return stamps
+
+    def invalidate_tables(self, schema_name: str, table_names: list[str]) -> None:
+        # 스냅샷 모드는 메타데이터 캐시를 쓰지 않는다
+        return None
+
+    def revalidate_tables(self, schema_name: str, table_names: list[str]) -> None:
+        return None
+
+    def search_rows(self, schema_name: str) -> tuple[list[tuple[str, str]], list[tuple[str, str, str, str]]]:
+        tables: list[tuple[str, str]] = []
+        columns: list[tuple[str, str, str, str]] = []
+        for table_name, table_comment, raw in self._conn().execute(
+            "SELECT table_name, table_comment, metadata FROM tables WHERE schema_name = ? ORDER BY table_name",
+            (schema_name,),
+        ):
+            tables.append((table_name, table_comment or ""))
+            for c in json.loads(raw)["columns"]:
+                columns.append((table_name, c["column_name"], c["data_type"] or "", c["column_comment"] or ""))
+        return tables, columns
+
+
+_store: SnapshotStore | None = None
+_store_lock = threading.Lock()
+_last_check = 0.0
+
+
+def open_store(path: str) -> SnapshotStore:
+    """스냅샷 모드 시작. 이후 current()가 이 파일(교체 시 새 파일)을 사용."""
+    global _store, _last_check
+    store = SnapshotStore(path)
+    with _store_lock:
+        _store = store
+        _last_check = time.monotonic()
+    return store
+
+
+def current() -> SnapshotStore | None:
+    """현재 스냅샷. SNAPSHOT_RELOAD_INTERVAL마다 파일 교체 여부를 보고 바뀌었으면 새 파일로 원자적으로 전환."""
+    global _store, _last_check
+    store = _store
+    if store is None or config.SNAPSHOT_RELOAD_INTERVAL <= 0:
+        return store
+    now = time.monotonic()
+    if now - _last_check < config.SNAPSHOT_RELOAD_INTERVAL:
+        return store
+    with _store_lock:
+        if _store is not store or now - _last_check < config.SNAPSHOT_RELOAD_INTERVAL:
+            return _store
+        _last_check = now
+        if store.changed_on_disk():
+            try:
+                _store = SnapshotStore(store.path)
+            except (OSError, sqlite3.Error, MetadataError) as e:
+                # 교체 중이거나 손상된 파일이면 기존 스냅샷으로 계속 응답
+                print(f"스냅샷 다시 읽기 실패, 기존 스냅샷 유지: {e}", file=sys.stderr, flush=True)
+        return _store
+
+
+def snapshot_stats() -> dict[str, Any]:
+    store = _store
+    if store is None:
+        return {"enabled": False}
+    return {"enabled": True, "path": store.path, "created_at": store.created_at, "schemas": store.schemas}
+
+
+def _main() -> None:
+    parser = argparse.ArgumentParser(description="MySQL 메타데이터 스냅샷 내보내기/확인")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_export = sub.add_parser("export", help="DB에서 메타데이터를 읽어 스냅샷 파일 생성(기존 파일은 원자적으로 교체)")
+    p_export.add_argument("--schemas", default=None, help="쉼표 구분 스키마 목록 (미지정 시 ALLOWED_SCHEMAS)")
+    p_export.add_argument("--out", required=True, help="스냅샷 파일 경로")
+    p_export.add_argument("--target", default=None, help="DB 대상 이름 (DB_TARGETS_FILE 사용 시, 미지정 시 기본 대상)")
+    p_info = sub.add_parser("info", help="스냅샷 파일 요약 출력")
+    p_info.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        schemas = [s.strip() for s in (args.schemas or "").split(",") if s.strip()] or list(config.ALLOWED_SCHEMAS)
+        if not schemas:
+            parser.error("--schemas 또는 ALLOWED_SCHEMAS를 지정하세요.")
+        from .validation import ValidationError, validate_schema_name
+
+        try:
+            for s in schemas:
+                validate_schema_name(s)
+        except ValidationError as e:
+            parser.error(str(e))
+        if args.target is not None and targets.get(args.target) is None:
+            parser.error(f"알 수 없는 대상입니다: {args.target} (사용 가능: {', '.join(targets.names())})")
+        with targets.use(args.target):
+            print(json.dumps(export_snapshot(schemas, args.out), ensure_ascii=False, indent=2))
+    else:
+        print(json.dumps(SnapshotStore(args.path).info(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,215 @@
+"""DB 대상(target) 목록과 현재 대상. 대상마다 접속 정보·커넥션 풀·동시 실행 한도를 따로 둔다.
+
+DB_TARGETS_FILE(JSON)을 지정하지 않으면 DB_* 환경 변수로 만든 대상 1개(default)만 사용한다.
+현재 대상은 contextvar로 전달되므로 DB 워커·병렬 조회 스레드에서도 그대로 보인다.
+"""
+import contextlib
+import contextvars
+import json
+import os
+import re
+from typing import Any, Iterator
+
+from . import config
+
+# 모든 대상에 동시 조회 (list_tables, get_schema_overview)
+FANOUT = "*"
+
+DEFAULT_NAME = "default"
+
+_NAME_PATTERN = re.compile(r"^[a-zA-Z0-9_.-]+$")
+
+
+class TargetConfigError(Exception):
+    """대상 설정 파일 오류 (서버 시작 시)."""
+    pass
+
+
+class Target:
+    """DB 대상 1개의 접속 정보와 한도. 설정 파일에 없는 항목은 DB_*·DB_POOL_* 환경 변수 값을 사용."""
+    __slots__ = (
+        "name",
+        "host",
+        "port",
+        "user",
+        "password",
+        "database",
+        "ssl",
+        "connect_timeout",
+        "query_timeout",
+        "pool_max_size",
+        "pool_min_size",
+        "max_concurrent",
+        "fanout_timeout",
+        "endpoints",
+    )
+
+    # 설정 키: (타입, 기본값)
+    _FIELDS: dict[str, tuple[type, Any]] = {
+        "host": (str, config.DB_HOST),
+        "port": (int, config.DB_PORT),
+        "user": (str, config.DB_USER),
+        "password": (str, config.DB_PASSWORD),
+        "database": (str, config.DB_NAME),
+        "ssl": (bool, config.DB_SSL),
+        "connect_timeout": (int, config.DB_CONNECT_TIMEOUT),
+        "query_timeout": (int, config.DB_QUERY_TIMEOUT),
+        "pool_max_size": (int, config.DB_POOL_MAX_SIZE),
+        "pool_min_size": (int, config.DB_POOL_MIN_SIZE),
+        "max_concurrent": (int, 0),
+        "fanout_timeout": (float, config.FANOUT_TIMEOUT),
+        "endpoints": (list, list(config.DB_ENDPOINTS)),
+    }
+
+    def __init__(self, name: str, **fields: Any) -> None:
+        self.name = name
+        for key, (_, default) in self._FIELDS.items():
+            setattr(self, key, fields.get(key, default))
+        # 같은 데이터를 가진 읽기 엔드포인트 "host[:port]" 목록. 비어 있으면 host:port 하나
+        self.endpoints = [_parse_endpoint(e, self.port) for e in self.endpoints] or [(self.host, self.port)]
+
+    @classmethod
+    def from_dict(cls, name: str, raw: Any) -> "Target":
+        if not isinstance(raw, dict):
+            raise TargetConfigError(f"대상 {name}: 객체여야 합니다.")
+        raw = dict(raw)
+        # 비밀번호는 파일 대신 환경 변수로 넘길 수 있음
+        password_env = raw.pop("password_env", None)
+        if password_env is not None:
+            raw["password"] = os.getenv(str(password_env), "")
+        fields: dict[str, Any] = {}
+        for key, value in raw.items():
+            spec = cls._FIELDS.get(key)
+            if spec is None:
+                raise TargetConfigError(f"대상 {name}: 알 수 없는 항목 {key}")
+            kind = spec[0]
+            ok = isinstance(value, kind) and (kind is bool or not isinstance(value, bool))
+            if kind is float and isinstance(value, int) and not isinstance(value, bool):
+                value, ok = float(value), True
+            if kind is list and ok:
+                ok = all(isinstance(e, str) and e.strip() for e in value)
+            if not ok:
+                raise TargetConfigError(f"대상 {name}: {key}는 {kind.__name__}이어야 합니다.")
+            fields[key] = value
+        return cls(name, **fields)
+
+    def describe(self) -> dict[str, Any]:
+        """list_targets 응답용 (비밀번호 제외)."""
+        return {
+            "name": self.name,
+            "host": self.host,
+            "port": self.port,
+            "database": self.database or None,
+            "endpoints": [f"{h}:{p}" for h, p in self.endpoints],
+            "pool_max_size": self.pool_max_size,
+            "max_concurrent": self.max_concurrent,
+            "fanout_timeout": self.fanout_timeout,
+        }
+
+
+def _parse_endpoint(raw: str, default_port: int) -> tuple[str, int]:
+    host, sep, port = raw.strip().rpartition(":")
+    if not sep or not port.isdigit():
+        return raw.strip(), default_port
+    return host, int(port)
+
+
+def load_targets(path: str) -> tuple[dict[str, Target], str]:
+    """설정 파일에서 (이름 -> Target, 기본 대상 이름) 로드.
+
+    형식: {"default": "shard01", "targets": {"shard01": {"host": ..., "password_env": ...}, ...}}
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+    except (OSError, ValueError) as e:
+        raise TargetConfigError(f"대상 설정 파일을 읽을 수 없습니다: {path}: {e}") from e
+    entries = raw.get("targets") if isinstance(raw, dict) else None
+    if not isinstance(entries, dict) or not entries:
+        raise TargetConfigError(f"대상 설정 파일에 targets가 없습니다: {path}")
+    registry: dict[str, Target] = {}
+    for name, entry in entries.items():
+        if not _NAME_PATTERN.match(name) or len(name) > config.MAX_IDENTIFIER_LENGTH:
+            raise TargetConfigError(f"대상 이름에 허용되지 않은 문자가 포함되어 있습니다: {name}")
+        registry[name] = Target.from_dict(name, entry)
+    default = raw.get("default", next(iter(registry)))
+    if default not in registry:
+        raise TargetConfigError(f"기본 대상이 targets에 없습니다: {default}")
+    return registry, default
+
+
+if config.DB_TARGETS_FILE:
+    _registry, _default = load_targets(config.DB_TARGETS_FILE)
+else:
+    _registry, _default = {DEFAULT_NAME: Target(DEFAULT_NAME)}, DEFAULT_NAME
+
+_current: contextvars.ContextVar[str | None] = contextvars.ContextVar("db_target", default=None)
+
+
+def names() -> list[str]:
+    """설정 파일 순서의 대상 이름 목록."""
+    return list(_registry)
+
+
+def default_name() -> str:
+    return _default
+
+
+def is_multi() -> bool:
+    return len(_registry) > 1
+
+
+def get(name: str) -> Target | None:
+    return _registry.get(name)
+
+
+def current_name() -> str:
+    """현재 컨텍스트의 대상 이름 (지정 안 했으면 기본 대상)."""
+    return _current.get() or _default
+
+
+def current() -> Target:
+    return _registry[current_name()]
+
+
+@contextlib.contextmanager
+def use(name: str | None) -> Iterator[None]:
+    """블록 안에서 현재 대상을 name으로 (None이면 기본 대상). copy_context()로 넘긴 스레드에도 전달된다."""
+    token = _current.set(name)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def describe() -> dict[str, Any]:
+    return {"default": _default, "targets": [t.describe() for t in _registry.values()]}
+
+
+def merge_stats(per_target: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """대상별 통계를 합산. 숫자 항목은 더하고, 대상이 2개 이상이면 대상별 값도 targets에 둔다."""
+    merged: dict[str, Any] = {}
+    for stats in per_target.values():
+        for key, value in stats.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                merged[key] = merged.get(key, 0) + value
+    if len(per_target) > 1:
+        merged["targets"] = per_target
+    return merged
+
+
+def merge_table_lists(results: dict[str, dict[str, Any]], failed: dict[str, str]) -> dict[str, Any]:
+    """대상별 list_tables 결과를 하나로. 테이블마다 target을 붙이고, 다음 페이지는 대상별 커서로 남긴다."""
+    tables = [{"target": name, **t} for name, page in results.items() for t in page["tables"]]
+    next_cursors = {name: page["next_cursor"] for name, page in results.items() if page.get("next_cursor")}
+    return {"tables": tables, "next_cursors": next_cursors, "failed_targets": failed}
+
+
+def merge_overviews(schema_name: str, results: dict[str, dict[str, Any]], failed: dict[str, str]) -> dict[str, Any]:
+    """대상별 get_schema_overview 결과를 하나로. 테이블·관계마다 target을 붙인다."""
+    return {
+        "schema": schema_name,
+        "tables": [{"target": name, **t} for name, o in results.items() for t in o["tables"]],
+        "relationships": [{"target": name, **r} for name, o in results.items() for r in o["relationships"]],
+        "failed_targets": failed,
+    }
@@ -1,8 +1,11 @@
 """입력 검증: 스키마/테이블 식별자 패턴, 길이, 리스트 개수, 화이트리스트."""
+import base64
+import binascii
+import json
 import re
 from typing import Any
 
-from . import config
+from . import config, metadata, snapshot, targets
 
 
 class ValidationError(Exception):
@@ -13,6 +16,9 @@ class ValidationError(Exception):
 # MySQL 식별자 허용 문자(영문, 숫자, 언더스코어). 백틱/따옴표·공백·세미콜론 등 차단.
 IDENTIFIER_PATTERN = re.compile(r"^[a-zA-Z0-9_]+$")
 
+# 테이블명 LIKE 패턴: 식별자 문자 + 와일드카드(%, _)만 허용
+LIKE_PATTERN = re.compile(r"^[a-zA-Z0-9_%]+$")
+
 
 def validate_schema_name(schema_name: str | None) -> None:
     """스키마명 검증. None은 list_tables 전체 조회용으로 허용."""
@@ -59,3 +65,144 @@ def validate_table_names_list(table_names: Any) -> list[str]:
         validate_table_name(name)
         out.append(name.strip())
     return out
+
+
+def _validate_choices(values: Any, allowed: tuple[str, ...], name: str) -> list[str]:
+    if not isinstance(values, list) or not values:
+        raise ValidationError(f"{name}는 비어 있지 않은 배열이어야 합니다.")
+    unknown = [v for v in values if v not in allowed]
+    if unknown:
+        raise ValidationError(f"{name}에 알 수 없는 항목이 있습니다: {str(unknown[0])[:64]} (가능: {', '.join(allowed)})")
+    return values
+
+
+def validate_projection(sections: Any, columns: Any, column_fields: Any) -> metadata.Projection | None:
+    """get_table(s)_metadata 부분 조회 인자. 모두 None이면 전체 조회(None) 반환."""
+    if sections is None and columns is None and column_fields is None:
+        return None
+    if sections is not None:
+        _validate_choices(sections, metadata.SECTIONS, "sections")
+    if column_fields is not None:
+        _validate_choices(column_fields, metadata.COLUMN_FIELDS, "column_fields")
+    if columns is not None:
+        # MySQL 테이블당 최대 컬럼 수 4096
+        if not isinstance(columns, list) or not columns or len(columns) > 4096:
+            raise ValidationError("columns는 1개 이상 4096개 이하의 배열이어야 합니다.")
+        for i, name in enumerate(columns):
+            if not isinstance(name, str) or not IDENTIFIER_PATTERN.match(name) or len(name) > config.MAX_IDENTIFIER_LENGTH:
+                raise ValidationError(f"columns의 {i + 1}번째 항목이 올바른 컬럼명이 아닙니다.")
+    if (columns is not None or column_fields is not None) and sections is not None and "columns" not in sections:
+        raise ValidationError("columns, column_fields를 쓰려면 sections에 columns가 있어야 합니다.")
+    return metadata.Projection(sections, columns, column_fields)
+
+
+def validate_version(version: Any, name: str = "if_none_match") -> None:
+    """이전 응답의 version 토큰. None이면 조건 없이 조회."""
+    if version is None:
+        return
+    if not isinstance(version, str) or not version or len(version) > 64:
+        raise ValidationError(f"{name}는 64자 이하의 version 문자열이어야 합니다.")
+
+
+def validate_version_map(versions: Any) -> None:
+    """get_tables_metadata의 if_none_match: 테이블명 -> version 객체."""
+    if versions is None:
+        return
+    if not isinstance(versions, dict) or len(versions) > config.MAX_TABLES_PER_REQUEST:
+        raise ValidationError(
+            f"if_none_match는 테이블명 -> version 객체여야 합니다 ({config.MAX_TABLES_PER_REQUEST}개 이하)."
+        )
+    for table_name, version in versions.items():
+        validate_table_name(table_name)
+        validate_version(version, f"if_none_match[{table_name}]")
+
+
+def validate_page_size(page_size: Any) -> None:
+    """list_tables 페이지 크기. None이면 기본값 사용."""
+    if page_size is None:
+        return
+    if not isinstance(page_size, int) or isinstance(page_size, bool) or page_size < 1:
+        raise ValidationError("페이지 크기는 1 이상의 정수여야 합니다.")
+
+
+def validate_name_prefix(name_prefix: str | None) -> None:
+    """테이블명 접두어 필터. 식별자 문자만 허용."""
+    if name_prefix is None:
+        return
+    if not isinstance(name_prefix, str) or not name_prefix.strip():
+        raise ValidationError("테이블명 접두어는 비어 있지 않은 문자열이어야 합니다.")
+    if len(name_prefix) > config.MAX_IDENTIFIER_LENGTH or not IDENTIFIER_PATTERN.match(name_prefix):
+        raise ValidationError("테이블명 접두어에 허용되지 않은 문자가 포함되어 있습니다.")
+
+
+def validate_name_like(name_like: str | None) -> None:
+    """테이블명 LIKE 패턴 필터. 식별자 문자와 %, _만 허용."""
+    if name_like is None:
+        return
+    if not isinstance(name_like, str) or not name_like.strip():
+        raise ValidationError("테이블명 패턴은 비어 있지 않은 문자열이어야 합니다.")
+    if len(name_like) > config.MAX_IDENTIFIER_LENGTH or not LIKE_PATTERN.match(name_like):
+        raise ValidationError("테이블명 패턴에는 영문, 숫자, _, %만 사용할 수 있습니다.")
+
+
+def validate_graph_depth(depth: Any, name: str = "depth") -> None:
+    """FK 그래프 탐색 단계 수. 1 이상 FK_GRAPH_MAX_DEPTH 이하."""
+    if not isinstance(depth, int) or isinstance(depth, bool) or not 1 <= depth <= config.FK_GRAPH_MAX_DEPTH:
+        raise ValidationError(f"{name}는 1 이상 {config.FK_GRAPH_MAX_DEPTH} 이하의 정수여야 합니다.")
+
+
+def validate_direction(direction: Any) -> None:
+    """FK 방향: out(참조하는 쪽), in(참조받는 쪽), both."""
+    if direction not in ("out", "in", "both"):
+        raise ValidationError("direction은 out, in, both 중 하나여야 합니다.")
+
+
+def validate_search_query(query: Any) -> None:
+    """검색어: 비어 있지 않은 200자 이하 문자열이며 검색 토큰(문자·숫자)이 하나 이상 있어야 함."""
+    if not isinstance(query, str) or not query.strip():
+        raise ValidationError("검색어를 입력하세요.")
+    if len(query) > 200:
+        raise ValidationError("검색어는 200자 이하여야 합니다.")
+    if not any(ch.isalnum() for ch in query):
+        raise ValidationError("검색어에 문자나 숫자가 하나 이상 있어야 합니다.")
+
+
+def validate_search_options(match: Any, limit: Any) -> None:
+    """검색 매칭 방식(exact/prefix/substring)과 결과 수(1 ~ SEARCH_MAX_RESULTS)."""
+    if match not in ("exact", "prefix", "substring"):
+        raise ValidationError("match는 exact, prefix, substring 중 하나여야 합니다.")
+    if not isinstance(limit, int) or isinstance(limit, bool) or not 1 <= limit <= config.SEARCH_MAX_RESULTS:
+        raise ValidationError(f"limit는 1 이상 {config.SEARCH_MAX_RESULTS} 이하의 정수여야 합니다.")
+
+
+def validate_target(target: Any, *, fanout: bool = False) -> None:
+    """DB 대상 이름. None이면 기본 대상. fanout이면 전체 대상("*")도 허용."""
+    if target is None:
+        return
+    if not isinstance(target, str) or not target.strip():
+        raise ValidationError("target은 비어 있지 않은 문자열이어야 합니다.")
+    if snapshot.current() is not None:
+        raise ValidationError("스냅샷 모드에서는 target을 지정할 수 없습니다.")
+    if target == targets.FANOUT:
+        if not fanout:
+            raise ValidationError('target="*"(전체 대상 조회)는 list_tables, get_schema_overview에서만 사용할 수 있습니다.')
+        return
+    if targets.get(target) is None:
+        raise ValidationError(f"알 수 없는 대상입니다: {target[: config.MAX_IDENTIFIER_LENGTH]}")
+
+
+def validate_list_cursor(cursor: str | None) -> tuple[str, str] | None:
+    """list_tables 이어 보기 커서를 (스키마, 테이블명)으로 복원. 형식이 잘못되면 ValidationError."""
+    if cursor is None or cursor == "":
+        return None
+    if not isinstance(cursor, str) or len(cursor) > 4 * config.MAX_IDENTIFIER_LENGTH + 32:
+        raise ValidationError("잘못된 커서입니다.")
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        schema_name, table_name = json.loads(raw.decode("utf-8"))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise ValidationError("잘못된 커서입니다.") from None
+    for value in (schema_name, table_name):
+        if not isinstance(value, str) or not IDENTIFIER_PATTERN.match(value):
+            raise ValidationError("잘못된 커서입니다.")
+    return schema_name, table_name
@@ -0,0 +1,70 @@
+"""조건부 조회: 메타데이터 응답의 버전 토큰(version)과 if_none_match.
+
+토큰은 응답 본문의 내용 해시라, 같은 토큰이면 같은 내용이다. 클라이언트가 이전 응답의 version을 if_none_match로 넘기고
+그 사이 바뀌지 않았으면 본문 대신 not_modified만 돌려준다 (전송량이 줄어듦).
+
+테이블 메타데이터는 비교 전에 요청한 테이블의 변경 표시(TABLES·COLUMNS·STATISTICS·제약 뷰, FK 규칙·참조 대상과
+CHECK 식 포함)만 읽어 캐시 항목이 오래됐는지 확인하므로(metadata.revalidate_tables), 캐시가 있으면 비교는 작은 쿼리 1개와
+캐시 조회로 끝나고 스키마 지문이 놓치는 ALTER도 토큰에 반영된다. 캐시를 끄면 비교에도 본문 조회가 필요하다.
+스키마 개요는 캐시된 개요의 내용 해시라 캐시와 같은 주기(스키마 지문·TTL)로 갱신된다.
+"""
+from typing import Any
+
+from . import metadata
+from .metadata import Projection
+
+
+def not_modified(version: str, **names: Any) -> dict[str, Any]:
+    """본문 없이 버전만 담은 응답."""
+    return {**names, "version": version, "not_modified": True}
+
+
+def get_table_metadata(
+    source: Any, schema_name: str, table_name: str, projection: Projection | None, if_none_match: str | None
+) -> dict[str, Any]:
+    if if_none_match is not None:
+        source.revalidate_tables(schema_name, [table_name])
+    entry = source.get_table_metadata(schema_name, table_name, projection)
+    version = metadata.content_version(entry, "get_table_metadata", schema_name, table_name)
+    if if_none_match == version:
+        return not_modified(version, schema=schema_name, table_name=table_name)
+    return {**entry, "version": version}
+
+
+def get_tables_metadata(
+    source: Any,
+    schema_name: str,
+    table_names: list[str],
+    projection: Projection | None,
+    if_none_match: dict[str, str] | None,
+) -> list[dict[str, Any]]:
+    """항목마다 version을 붙이고, if_none_match(테이블명 -> version)와 같은 테이블은 not_modified로 바꾼다."""
+    known = if_none_match or {}
+    checked = [t for t in dict.fromkeys(table_names) if t in known]
+    if checked:
+        source.revalidate_tables(schema_name, checked)
+    result: list[dict[str, Any]] = []
+    for table_name, entry in zip(table_names, source.get_tables_metadata(schema_name, table_names, projection)):
+        if "error" in entry:
+            result.append(entry)
+            continue
+        version = metadata.content_version(entry, "get_table_metadata", schema_name, table_name)
+        if known.get(table_name) == version:
+            result.append(not_modified(version, schema=schema_name, table_name=table_name))
+        else:
+            result.append({**entry, "version": version})
+    return result
+
+
+def get_schema_overview(source: Any, schema_name: str, if_none_match: str | None) -> dict[str, Any]:
+    overview = source.get_schema_overview(schema_name)
+    version = metadata.content_version(overview, "get_schema_overview", schema_name)
+    if if_none_match == version:
+        return not_modified(version, schema=schema_name)
+    return {**overview, "version": version}
+
+
+def merged_version(results: dict[str, dict[str, Any]], failed: dict[str, str]) -> str:
+    """전체 대상 조회(target="*") 결과의 버전: 대상별 version과 실패한 대상 이름을 합친 토큰."""
+    parts = [f"{name}={r['version']}" for name, r in sorted(results.items())]
+    return metadata.version_token("fanout", *parts, *(f"{name}!" for name in sorted(failed)))
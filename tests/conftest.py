@@ -0,0 +1,36 @@
+"""테스트 공통: scripts/bench_schema.py의 가짜 information_schema(SQLite)로 MySQL 없이 실행."""
+import sys
+from pathlib import Path
+
+import pytest
+
+_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_ROOT))
+sys.path.insert(0, str(_ROOT / "scripts"))
+
+import bench_schema  # noqa: E402
+
+SCHEMA = "bench"
+
+
+@pytest.fixture(scope="session")
+def fake_path(tmp_path_factory: pytest.TempPathFactory) -> str:
+    """테이블 12개(컬럼·인덱스·FK·CHECK 포함)짜리 가짜 information_schema 파일."""
+    path = tmp_path_factory.mktemp("fake") / "information_schema.db"
+    bench_schema.write_fake(str(path), SCHEMA, bench_schema.generate(12, 6, 2, 1))
+    return str(path)
+
+
+@pytest.fixture
+def fake_db(fake_path: str, tmp_path: Path) -> str:
+    """테스트마다 고칠 수 있는 가짜 information_schema 사본을 DB 연결로 설치하고 메타데이터 캐시를 비운다. 사본 경로 반환."""
+    from src import db, metadata
+
+    path = tmp_path / "information_schema.db"
+    path.write_bytes(Path(fake_path).read_bytes())
+    db.close_pool()
+    metadata._caches.clear()
+    bench_schema.install_fake(str(path))
+    yield str(path)
+    db.close_pool()
+    metadata._caches.clear()
@@ -0,0 +1,87 @@
+"""적응형 쿼리 타임아웃: 표본은 쿼리 실행 시간만, 타임아웃은 세션 변수(SET SESSION)로 적용."""
+import time
+
+import pytest
+
+import bench_schema
+from src import db, targets
+
+
+@pytest.fixture
+def adaptive(fake_db: str, monkeypatch: pytest.MonkeyPatch) -> str:
+    monkeypatch.setattr(db.config, "DB_ADAPTIVE_TIMEOUT", True)
+    monkeypatch.setattr(db.config, "DB_ADAPTIVE_TIMEOUT_MIN_SAMPLES", 1)
+    monkeypatch.setattr(db, "_windows", {})
+    return fake_db
+
+
+def _window() -> db.LatencyWindow:
+    return db._get_window(targets.current())
+
+
+def _select(conn) -> None:
+    with conn.cursor() as cur:
+        cur.execute("SELECT COUNT(*) AS n FROM information_schema.TABLES")
+        cur.fetchall()
+
+
+def test_samples_query_time_not_hold_time(adaptive: str) -> None:
+    with db.get_connection() as conn:
+        time.sleep(0.2)  # 쿼리 없이 연결만 쥐고 있음
+    assert _window().stats(30.0)["samples"] == 0
+    with db.get_connection() as conn:
+        _select(conn)
+        time.sleep(0.2)
+    stats = _window().stats(30.0)
+    assert stats["samples"] == 1 and stats["p50_ms"] < 200
+
+
+def test_timeout_applied_as_session_variable(adaptive: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(db.config, "DB_ADAPTIVE_TIMEOUT_MIN", 3.0)
+    with db.get_connection() as conn:
+        _select(conn)
+    # 표본이 짧아 하한(3초)으로 잘림 -> MySQL은 밀리초
+    with db.get_connection() as conn:
+        assert conn.session == {"max_execution_time": "3000"}
+        conn.session.clear()
+    with db.get_connection() as conn:
+        assert conn.session == {}  # 같은 풀 연결·같은 값이면 다시 보내지 않음
+
+
+def test_mariadb_uses_max_statement_time(adaptive: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(db.config, "DB_ADAPTIVE_TIMEOUT_MIN", 2.5)
+    monkeypatch.setattr(
+        db, "_connect", lambda target, endpoint: bench_schema.FakeConnection(adaptive, server_version="10.6.16-MariaDB")
+    )
+    with db.get_connection() as conn:
+        _select(conn)
+    with db.get_connection() as conn:
+        assert conn.session == {"max_statement_time": "2.500"}
+
+
+def test_disabled_leaves_session_alone(fake_db: str) -> None:
+    with db.get_connection() as conn:
+        _select(conn)
+    with db.get_connection() as conn:
+        assert conn.session == {}
+
+
+@pytest.mark.parametrize(
+    "version, expected",
+    [
+        ("8.0.36", "SET SESSION max_execution_time = 1500"),
+        ("5.7.7-log", None),
+        ("5.5.5-10.4.32-MariaDB", "SET SESSION max_statement_time = 1.500"),
+        ("10.0.38-MariaDB", None),
+    ],
+)
+def test_session_timeout_sql(version: str, expected: str | None) -> None:
+    assert db._session_timeout_sql(version, 1.5) == expected
+
+
+def test_statement_timeout_error_is_timeout() -> None:
+    import pymysql
+
+    error = pymysql.err.OperationalError(3024, "maximum statement execution time exceeded")
+    converted = db._to_db_error(error, db.Endpoint("db", 3306, 10))
+    assert converted.retryable and "타임아웃" in str(converted)
@@ -0,0 +1,54 @@
+"""감사 로그 기록기: flush는 기록을 마치되 쓰기 스레드를 멈추지 않고, block 정책은 이벤트 루프에서 기다리지 않는다."""
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from src import audit, config
+
+
+@pytest.fixture
+def writer(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> audit._AuditWriter:
+    monkeypatch.setattr(config, "AUDIT_LOG_PATH", str(tmp_path / "audit.log"))
+    monkeypatch.setattr(config, "AUDIT_LOG_PER_PROCESS", False)
+    monkeypatch.setattr(config, "AUDIT_ASYNC", True)
+    monkeypatch.setattr(config, "AUDIT_FLUSH_INTERVAL_MS", 10)
+    w = audit._AuditWriter()
+    yield w
+    w.close()
+
+
+def _lines(path: str) -> list[dict]:
+    return [json.loads(line) for line in Path(path).read_text(encoding="utf-8").splitlines()]
+
+
+def test_flush_keeps_writer_running(writer: audit._AuditWriter) -> None:
+    writer.submit(json.dumps({"n": 1}))
+    assert writer.flush()
+    assert _lines(config.AUDIT_LOG_PATH) == [{"n": 1}]
+    writer.submit(json.dumps({"n": 2}))
+    assert writer.flush()
+    assert _lines(config.AUDIT_LOG_PATH) == [{"n": 1}, {"n": 2}]
+
+
+def test_close_stops_writer(writer: audit._AuditWriter) -> None:
+    writer.submit(json.dumps({"n": 1}))
+    writer.close()
+    assert _lines(config.AUDIT_LOG_PATH) == [{"n": 1}]
+    assert not writer._thread.is_alive()
+
+
+def test_block_policy_drops_on_event_loop(monkeypatch: pytest.MonkeyPatch, writer: audit._AuditWriter) -> None:
+    monkeypatch.setattr(config, "AUDIT_QUEUE_FULL_POLICY", "block")
+    writer._queue.maxsize = 1
+    writer._ensure_started()
+    writer._stop.set()
+    writer._thread.join()  # 쓰기 스레드를 멈춰 큐가 비지 않게 한다
+
+    async def submit_twice() -> None:
+        writer.submit("{}")
+        writer.submit("{}")  # 기다리면 테스트가 멈춘다
+
+    asyncio.run(asyncio.wait_for(submit_twice(), timeout=2))
+    assert writer.stats()["dropped"] == 1
@@ -0,0 +1,84 @@
+"""대상별 회로 차단기: closed → open → half_open → closed / 다시 open."""
+import types
+
+import pytest
+
+from src import db
+from src.db import CircuitBreaker, CircuitOpenError
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(db, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def _breaker(probes: int = 1) -> CircuitBreaker:
+    return CircuitBreaker("t", failure_threshold=3, open_seconds=30, half_open_probes=probes)
+
+
+def _fail(breaker: CircuitBreaker, n: int) -> None:
+    for _ in range(n):
+        breaker.record(False, breaker.acquire())
+
+
+def test_opens_after_consecutive_failures(clock: _Clock) -> None:
+    breaker = _breaker()
+    _fail(breaker, 2)
+    breaker.record(True, breaker.acquire())  # 성공하면 연속 실패가 0으로
+    _fail(breaker, 2)
+    assert breaker.state == "closed"
+    _fail(breaker, 1)
+    assert breaker.state == "open"
+    clock.now += 10
+    with pytest.raises(CircuitOpenError) as exc:
+        breaker.acquire()
+    assert exc.value.retry_after == 20
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    assert breaker.stats()["rejected"] == 2
+
+
+def test_half_open_probe_success_closes(clock: _Clock) -> None:
+    breaker = _breaker()
+    _fail(breaker, 3)
+    clock.now += 30
+    assert breaker.state == "half_open"
+    assert breaker.acquire() is True
+    with pytest.raises(CircuitOpenError):  # 시험 슬롯 1개를 이미 사용 중
+        breaker.acquire()
+    breaker.record(True, probe=True)
+    assert breaker.state == "closed"
+    assert breaker.acquire() is False
+
+
+def test_half_open_probe_failure_reopens(clock: _Clock) -> None:
+    breaker = _breaker()
+    _fail(breaker, 3)
+    clock.now += 30
+    breaker.record(False, breaker.acquire())
+    assert breaker.state == "open"
+    assert breaker.stats()["opened"] == 2
+    clock.now += 29
+    assert breaker.state == "open"
+    clock.now += 1
+    assert breaker.state == "half_open"
+
+
+def test_undecided_result_returns_probe_slot(clock: _Clock) -> None:
+    breaker = _breaker()
+    _fail(breaker, 3)
+    clock.now += 30
+    breaker.record(None, breaker.acquire())  # 풀 대기 초과 등: 상태는 그대로, 시험 슬롯만 반환
+    assert breaker.state == "half_open"
+    assert breaker.acquire() is True
+
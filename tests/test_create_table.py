@@ -0,0 +1,25 @@
+"""get_create_tables: 요청한 테이블만(MAX_TABLES_PER_REQUEST개 이하) 요청 순서로, 스키마 전체 경로는 없다."""
+import pytest
+
+from conftest import SCHEMA
+from src import metadata
+
+
+def test_request_order_and_missing_table(fake_db: str) -> None:
+    result = metadata.get_create_tables(SCHEMA, ["t_00003", "nope", "t_00001"])
+    assert [t["table_name"] for t in result["tables"]] == ["t_00003", "nope", "t_00001"]
+    assert result["tables"][0]["create_table"].startswith("CREATE TABLE `t_00003`")
+    assert "error" in result["tables"][1]
+
+
+@pytest.mark.parametrize("source", ["show", "render"])
+def test_table_count_capped(fake_db: str, monkeypatch: pytest.MonkeyPatch, source: str) -> None:
+    monkeypatch.setattr(metadata.config, "CREATE_TABLE_SOURCE", source)
+    monkeypatch.setattr(metadata.config, "MAX_TABLES_PER_REQUEST", 3)
+    with pytest.raises(metadata.MetadataError):
+        metadata.get_create_tables(SCHEMA, [f"t_{i:05d}" for i in range(4)])
+
+
+def test_table_names_required(fake_db: str) -> None:
+    with pytest.raises(TypeError):
+        metadata.get_create_tables(SCHEMA)  # type: ignore[call-arg]
@@ -0,0 +1,115 @@
+"""스키마 지문·테이블별 변경 표시: DDL 변경에는 바뀌고 데이터 변경(UPDATE_TIME)에는 바뀌지 않는지.
+
+기본 지문은 TABLES만 보고, 정의 뷰 전체는 테이블별 변경 표시와 METADATA_CACHE_DEEP_FINGERPRINT 지문이 본다.
+"""
+import sqlite3
+
+import pytest
+
+from conftest import SCHEMA
+from src import metadata
+
+
+def _write(path: str, sql: str, *params) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute(sql, params)
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def deep(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(metadata.config, "METADATA_CACHE_DEEP_FINGERPRINT", True)
+
+
+def test_stamps_sum_to_deep_fingerprint(fake_db: str, deep: None) -> None:
+    stamps = metadata._load_table_stamps(SCHEMA, None)
+    assert metadata._schema_fingerprint(SCHEMA) == f"{len(stamps)}:{sum(stamps.values())}"
+    assert metadata._load_table_stamps(SCHEMA, ["t_00001", "nope"]) == {"t_00001": stamps["t_00001"]}
+
+
+def test_data_change_keeps_fingerprint(fake_db: str) -> None:
+    before = metadata._schema_fingerprint(SCHEMA)
+    _write(fake_db, "UPDATE TABLES SET UPDATE_TIME = '2030-01-01 00:00:00' WHERE TABLE_NAME = 't_00001'")
+    assert metadata._schema_fingerprint(SCHEMA) == before
+
+
+# 테이블을 다시 만들거나 TABLES 행이 바뀌는 DDL: 기본 지문에도 잡힌다
+_TABLE_DDL = [
+    "UPDATE TABLES SET CREATE_TIME = '2030-01-01 00:00:00' WHERE TABLE_NAME = 't_00001'",
+    "UPDATE TABLES SET TABLE_COMMENT = 'changed' WHERE TABLE_NAME = 't_00001'",
+]
+# 테이블을 다시 만들지 않는 ALTER: 변경 표시와 deep 지문에만 잡힌다
+_DEFINITION_DDL = [
+    # 코멘트만 바꾸는 ALTER
+    "UPDATE COLUMNS SET COLUMN_COMMENT = 'changed' WHERE TABLE_NAME = 't_00001' AND COLUMN_NAME = 'id'",
+    # INSTANT ADD COLUMN
+    "INSERT INTO COLUMNS VALUES ('bench', 't_00001', 'added', 99, 'int', 'YES', NULL, '', '')",
+    "INSERT INTO STATISTICS VALUES ('bench', 't_00001', 'ix_added', 'id', 1, 1)",
+    "DELETE FROM TABLE_CONSTRAINTS WHERE TABLE_NAME = 't_00001' AND CONSTRAINT_TYPE = 'UNIQUE'",
+    "UPDATE REFERENTIAL_CONSTRAINTS SET UPDATE_RULE = 'CASCADE' WHERE TABLE_NAME = 't_00001'",
+    "UPDATE KEY_COLUMN_USAGE SET REFERENCED_COLUMN_NAME = 'c_001' WHERE CONSTRAINT_NAME = 'fk_t_00001_t_00000'",
+]
+
+
+@pytest.mark.parametrize("sql", _TABLE_DDL + _DEFINITION_DDL)
+def test_ddl_change_changes_stamp(fake_db: str, sql: str) -> None:
+    stamps = metadata._load_table_stamps(SCHEMA, None)
+    _write(fake_db, sql)
+    after = metadata._load_table_stamps(SCHEMA, None)
+    assert {t for t in stamps if after[t] != stamps[t]} == {"t_00001"}
+
+
+@pytest.mark.parametrize("sql", _TABLE_DDL + _DEFINITION_DDL)
+def test_ddl_change_changes_deep_fingerprint(fake_db: str, deep: None, sql: str) -> None:
+    before = metadata._schema_fingerprint(SCHEMA)
+    _write(fake_db, sql)
+    assert metadata._schema_fingerprint(SCHEMA) != before
+
+
+@pytest.mark.parametrize("sql", _TABLE_DDL)
+def test_table_ddl_changes_fingerprint(fake_db: str, sql: str) -> None:
+    before = metadata._schema_fingerprint(SCHEMA)
+    _write(fake_db, sql)
+    assert metadata._schema_fingerprint(SCHEMA) != before
+
+
+def test_fingerprint_reads_only_tables(fake_db: str) -> None:
+    sql, _ = metadata._stamps_sql(SCHEMA, None, metadata._server_features("8.0.36"), deep=False)
+    assert "information_schema.TABLES" in sql and "COLUMNS" not in sql and "STATISTICS" not in sql
+    before = metadata._schema_fingerprint(SCHEMA)
+    _write(fake_db, _DEFINITION_DDL[0])
+    assert metadata._schema_fingerprint(SCHEMA) == before
+
+
+def test_cache_survives_data_change(fake_db: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(metadata.config, "METADATA_CACHE_FINGERPRINT_INTERVAL", 0)
+    metadata._caches.clear()
+    metadata.get_table_metadata(SCHEMA, "t_00002")
+    _write(fake_db, "UPDATE TABLES SET UPDATE_TIME = '2030-01-01 00:00:00'")
+    metadata.get_table_metadata(SCHEMA, "t_00002")
+    assert metadata._target_cache().stats()["hits"] == 1
+
+
+def test_invalidate_tables(fake_db: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(metadata.config, "METADATA_CACHE_FINGERPRINT_INTERVAL", 0)
+    metadata._caches.clear()
+    metadata.get_table_metadata(SCHEMA, "t_00002")
+    metadata.get_table_metadata(SCHEMA, "t_00003")
+    _write(fake_db, "UPDATE COLUMNS SET COLUMN_COMMENT = 'x' WHERE TABLE_NAME = 't_00002' AND COLUMN_NAME = 'id'")
+    # 기본 지문은 코멘트 변경을 못 보므로 TTL 전까지 캐시된 값
+    assert metadata.get_table_metadata(SCHEMA, "t_00002")["columns"][0]["column_comment"] != "x"
+    before = metadata.schema_fingerprint(SCHEMA)
+    metadata.invalidate_tables(SCHEMA, ["T_00002"])
+    assert metadata.schema_fingerprint(SCHEMA) != before  # 검색 색인·prewarm도 다시 만들도록
+    assert metadata.get_table_metadata(SCHEMA, "t_00002")["columns"][0]["column_comment"] == "x"
+    hits = metadata._target_cache().stats()["hits"]
+    metadata.get_table_metadata(SCHEMA, "t_00003")
+    assert metadata._target_cache().stats()["hits"] == hits + 1
+
+
+@pytest.mark.parametrize("version, has_check", [("5.7.44", False), ("8.0.15", False), ("8.0.36", True)])
+def test_stamps_include_check_clause_when_supported(version: str, has_check: bool) -> None:
+    sql, params = metadata._stamps_sql(SCHEMA, ["t_00005"], metadata._server_features(version))
+    assert ("CHECK_CONSTRAINTS" in sql) is has_check
+    assert sql.count("%s") == len(params)
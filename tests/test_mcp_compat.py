@@ -0,0 +1,86 @@
+"""src/mcp_compat.py가 기대하는 FastMCP·MCP SDK 내부 API 확인. FastMCP를 올린 뒤 실패하면 어댑터를 고친다."""
+import asyncio
+
+import pytest
+from fastmcp import Client, FastMCP
+from mcp.server.session import ServerSession
+from pydantic import AnyUrl
+
+from conftest import SCHEMA
+
+
+def test_lowlevel_server_internals() -> None:
+    server = FastMCP("compat")._mcp_server
+    assert callable(server.subscribe_resource)
+    assert callable(server.unsubscribe_resource)
+    assert callable(server.get_capabilities)
+    assert hasattr(type(server), "request_context")
+
+
+def test_session_exit_stack() -> None:
+    from contextlib import AsyncExitStack
+
+    import anyio
+    from mcp.server.models import InitializationOptions
+    from mcp.types import ServerCapabilities
+
+    send, receive = anyio.create_memory_object_stream(1)
+    options = InitializationOptions(server_name="compat", server_version="0", capabilities=ServerCapabilities())
+    session = ServerSession(receive, send, options)
+    assert isinstance(session._exit_stack, AsyncExitStack)
+
+
+def _watched() -> list[str]:
+    from src import schema_diff
+
+    return schema_diff.diff_stats()["watch"]["watched"]
+
+
+def test_subscription_lifecycle(fake_db: str) -> None:
+    from src import schema_diff, server, targets
+
+    uri = schema_diff.resource_uri(targets.default_name(), SCHEMA)
+
+    async def run() -> None:
+        async with Client(server.mcp) as client:
+            assert client.initialize_result.capabilities.resources.subscribe is True
+            await client.session.subscribe_resource(AnyUrl(uri))
+            assert uri in _watched()
+            await client.session.unsubscribe_resource(AnyUrl(uri))
+            assert uri not in _watched()
+            await client.session.subscribe_resource(AnyUrl(uri))
+            assert uri in _watched()
+        # unsubscribe 없이 연결이 끊기면 세션 종료 시 정리
+        for _ in range(50):
+            if uri not in _watched():
+                break
+            await asyncio.sleep(0.01)
+        assert uri not in _watched()
+        assert uri not in server._subscriptions
+
+    asyncio.run(run())
+
+
+def test_subscribe_rejects_other_uri(fake_db: str) -> None:
+    from src import server
+
+    async def run() -> None:
+        async with Client(server.mcp) as client:
+            with pytest.raises(Exception):
+                await client.session.subscribe_resource(AnyUrl("schema://nope/x/changes"))
+
+    asyncio.run(run())
+
+
+def test_stateless_workers_do_not_watch(fake_db: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    from src import config, schema_diff, server, targets
+
+    monkeypatch.setattr(config, "SCHEMA_WATCH_SCHEMAS", (SCHEMA,))
+    uri = schema_diff.resource_uri(targets.default_name(), SCHEMA)
+    server.create_http_app()
+    assert uri not in _watched()
+    server._start_background()
+    try:
+        assert uri in _watched()
+    finally:
+        schema_diff.unwatch(targets.default_name(), SCHEMA)
@@ -0,0 +1,81 @@
+"""projection별 메타데이터 조회 SQL: 서버 버전(CHECK_CONSTRAINTS 지원 여부)에 따라 필요한 문만 보내는지."""
+import bench_schema
+import pytest
+
+from conftest import SCHEMA
+from src import config, metadata
+from src.metadata import Projection
+
+
+# 합성 스키마에서 CHECK 제약이 있는 테이블 (5개마다 1개)
+_TABLE = "t_00005"
+
+
+def _fetch(path: str, version: str, projection: Projection | None) -> tuple[dict, list[str]]:
+    """버전을 흉내 낸 연결로 _TABLE 조회. (결과, 실행한 SQL 목록) 반환."""
+    cur = bench_schema.FakeConnection(path, server_version=version).cursor()
+    executed: list[str] = []
+    execute = cur.execute
+
+    def record(query, args=None):
+        executed.append(query)
+        return execute(query, args)
+
+    cur.execute = record
+    return metadata._fetch_tables_metadata(cur, SCHEMA, [_TABLE], projection), executed
+
+
+@pytest.mark.parametrize(
+    ("version", "mariadb", "checks"),
+    [
+        ("5.7.44-log", False, False),
+        ("8.0.15", False, False),
+        ("8.0.16", False, True),
+        ("5.5.5-10.2.21-MariaDB", True, False),
+        ("5.5.5-10.6.12-MariaDB-log", True, True),
+    ],
+)
+def test_server_features(version: str, mariadb: bool, checks: bool) -> None:
+    assert metadata._server_features(version) == {"mariadb": mariadb, "check_constraints": checks}
+
+
+@pytest.mark.parametrize("multi", [False, True])
+def test_check_only_projection_without_check_support(
+    fake_path: str, monkeypatch: pytest.MonkeyPatch, multi: bool
+) -> None:
+    monkeypatch.setattr(config, "DB_MULTI_STATEMENTS", multi)
+    found, executed = _fetch(fake_path, "5.7.44-log", Projection(["check_constraints"]))
+    sql = "\n".join(executed)
+    assert "IN ()" not in sql
+    assert "TABLE_CONSTRAINTS" not in sql
+    assert "STATISTICS" not in sql
+    assert found[_TABLE]["check_constraints"] == []
+
+
+@pytest.mark.parametrize("multi", [False, True])
+def test_check_only_projection_with_check_support(
+    fake_path: str, monkeypatch: pytest.MonkeyPatch, multi: bool
+) -> None:
+    monkeypatch.setattr(config, "DB_MULTI_STATEMENTS", multi)
+    found, executed = _fetch(fake_path, "8.0.36", Projection(["check_constraints"]))
+    sql = "\n".join(executed)
+    assert "CHECK_CONSTRAINTS" in sql
+    assert "REFERENTIAL_CONSTRAINTS" not in sql
+    assert "STATISTICS" not in sql
+    assert found[_TABLE]["check_constraints"]
+
+
+def test_full_fetch_on_old_server_skips_check_join(fake_path: str) -> None:
+    found, executed = _fetch(fake_path, "5.7.44-log", None)
+    sql = "\n".join(executed)
+    assert "CHECK_CONSTRAINTS" not in sql
+    assert "'CHECK'" not in sql
+    entry = found[_TABLE]
+    assert entry["primary_key"] == ["id"]
+    assert entry["check_constraints"] == []
+
+
+def test_columns_projection_sends_one_statement(fake_path: str) -> None:
+    found, executed = _fetch(fake_path, "8.0.36", Projection(["columns"], columns=["id"]))
+    assert len(executed) == 1
+    assert [c["column_name"] for c in found[_TABLE]["columns"]] == ["id"]
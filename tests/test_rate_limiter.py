@@ -0,0 +1,99 @@
+"""토큰 버킷 처리량 제한: 충전·거부·retry_after, 공유 저장소(여러 워커)에서도 같은 한도."""
+import types
+
+import pytest
+
+from src import rate_limiter, shared_state
+from src.rate_limiter import RateLimitExceeded, TokenBucketLimiter
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(rate_limiter, "time", types.SimpleNamespace(monotonic=clock))
+    monkeypatch.setattr(shared_state, "time", types.SimpleNamespace(time=clock))
+    return clock
+
+
+def _limiter(shared: shared_state.SharedStore | None = None, **kwargs) -> TokenBucketLimiter:
+    options = {"rate_per_minute": 60, "burst": 3, "max_clients": 100, "idle_seconds": 600, **kwargs}
+    return TokenBucketLimiter(shared=shared, **options)
+
+
+@pytest.fixture(params=["memory", "shared"])
+def limiter(request: pytest.FixtureRequest, clock: _Clock, tmp_path) -> TokenBucketLimiter:
+    if request.param == "memory":
+        return _limiter()
+    return _limiter(shared_state.SharedStore(str(tmp_path / "shared.db"), cache_max_bytes=0))
+
+
+def test_burst_then_reject(limiter: TokenBucketLimiter) -> None:
+    for _ in range(3):
+        limiter.consume("a")
+    with pytest.raises(RateLimitExceeded) as exc:
+        limiter.consume("a")
+    assert exc.value.retry_after == 1
+    limiter.consume("b")  # 클라이언트마다 버킷이 따로
+    assert {k: limiter.stats()[k] for k in ("allowed", "rejected")} == {"allowed": 4, "rejected": 1}
+
+
+def test_refill(limiter: TokenBucketLimiter, clock: _Clock) -> None:
+    for _ in range(3):
+        limiter.consume("a")
+    clock.now += 2  # 초당 1개 충전
+    limiter.consume("a")
+    limiter.consume("a")
+    with pytest.raises(RateLimitExceeded):
+        limiter.consume("a")
+    clock.now += 3600  # 용량 이상으로는 차지 않음
+    for _ in range(3):
+        limiter.consume("a")
+    with pytest.raises(RateLimitExceeded):
+        limiter.consume("a")
+
+
+def test_cost(limiter: TokenBucketLimiter) -> None:
+    limiter.consume("a", 2.5)
+    with pytest.raises(RateLimitExceeded) as exc:
+        limiter.consume("a", 1)
+    assert exc.value.retry_after == 1
+    limiter.consume("a", 0.5)
+    limiter.consume("b", 100)  # 용량보다 큰 비용은 용량으로 잘라 항상 거부되지 않게
+
+
+def test_shared_buckets_across_workers(clock: _Clock, tmp_path) -> None:
+    path = str(tmp_path / "shared.db")
+    first = _limiter(shared_state.SharedStore(path, cache_max_bytes=0))
+    second = _limiter(shared_state.SharedStore(path, cache_max_bytes=0))
+    first.consume("a")
+    second.consume("a")
+    first.consume("a")
+    with pytest.raises(RateLimitExceeded):
+        second.consume("a")
+
+
+def test_idle_and_lru_eviction(clock: _Clock) -> None:
+    limiter = _limiter(max_clients=2, idle_seconds=60)
+    for client in ("a", "b", "c"):
+        limiter.consume(client)
+    assert limiter.stats()["clients"] == 2
+    clock.now += 60
+    limiter.consume("d")
+    assert limiter.stats()["clients"] == 1
+    assert limiter.stats()["evictions"] == 3
+
+
+def test_tool_cost(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(rate_limiter.config, "RATE_LIMIT_TOOL_COSTS", {"get_schema_overview": 2.0})
+    monkeypatch.setattr(rate_limiter.config, "RATE_LIMIT_TABLE_COST", 0.1)
+    assert rate_limiter.tool_cost("list_tables") == 1.0
+    assert rate_limiter.tool_cost("get_schema_overview") == 2.0
+    assert rate_limiter.tool_cost("get_tables_metadata", 11) == pytest.approx(2.0)
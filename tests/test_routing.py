@@ -0,0 +1,35 @@
+"""엔드포인트 선택: 한 번도 성공하지 못한 엔드포인트의 실패 벌점은 소속 대상의 connect_timeout."""
+import pytest
+
+from src import db
+from src.targets import Target
+
+
+@pytest.fixture(autouse=True)
+def no_explore(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(db.config, "DB_ROUTING_EXPLORE_RATE", 0.0)
+    monkeypatch.setattr(db.config, "DB_CONNECT_TIMEOUT", 10)
+
+
+def _router(connect_timeout: int) -> db.Router:
+    return db.Router(Target("t", endpoints=["a:3306", "b:3306"], connect_timeout=connect_timeout))
+
+
+def test_failure_penalty_uses_target_connect_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(db.config, "DB_ENDPOINT_COOLDOWN", 0)
+    monkeypatch.setattr(db.config, "DB_ROUTING_ERROR_PENALTY", 0.0)
+    router = _router(2)
+    a, b = router.endpoints
+    router.observe(a, None)
+    a.probe = False  # 제외 후 시험 순서가 아니라 점수로 고르게
+    router.observe(b, 3.0)  # 느리지만 성공한 엔드포인트
+    assert a.score() == 2.0
+    # 전역 DB_CONNECT_TIMEOUT(10초)이 아니라 대상 값(2초)으로 비교 -> 실패한 a가 더 빠르다고 봄
+    assert router.choose() is a
+
+
+def test_stats_score_per_target() -> None:
+    fast, slow = _router(1), _router(20)
+    for router in (fast, slow):
+        router.observe(router.endpoints[0], None)
+    assert fast.stats()["routes"]["a:3306"]["score"] < slow.stats()["routes"]["a:3306"]["score"]
@@ -0,0 +1,122 @@
+"""diff_schema: 기준점 이후 추가·삭제·변경된 테이블과 섹션별 차이."""
+import sqlite3
+
+import pytest
+
+from conftest import SCHEMA
+from src import metadata, schema_diff
+from src.metadata import MetadataError
+
+# DROP TABLE 시 행이 사라지는 information_schema 뷰
+_TABLE_VIEWS = (
+    "TABLES", "COLUMNS", "STATISTICS", "TABLE_CONSTRAINTS", "KEY_COLUMN_USAGE", "REFERENTIAL_CONSTRAINTS"
+)
+
+
+def _write(path: str, *statements: str) -> None:
+    conn = sqlite3.connect(path)
+    for sql in statements:
+        conn.execute(sql)
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def differ(fake_db: str, monkeypatch: pytest.MonkeyPatch) -> schema_diff.SchemaDiffer:
+    monkeypatch.setattr(metadata.config, "METADATA_CACHE_FINGERPRINT_INTERVAL", 0)
+    return schema_diff.SchemaDiffer(8)
+
+
+def _since_baseline(differ: schema_diff.SchemaDiffer, path: str, *statements: str) -> dict:
+    base = differ.diff(metadata, SCHEMA, None)
+    assert base["baseline"] is True and base["table_count"] == 12
+    _write(path, *statements)
+    return differ.diff(metadata, SCHEMA, base["version"])
+
+
+def test_no_change(differ: schema_diff.SchemaDiffer, fake_db: str) -> None:
+    result = _since_baseline(differ, fake_db, "UPDATE TABLES SET UPDATE_TIME = '2030-01-01 00:00:00'")
+    assert result["changed"] is False
+    assert result["tables_checked"] == 0
+
+
+def test_added_table(differ: schema_diff.SchemaDiffer, fake_db: str) -> None:
+    result = _since_baseline(
+        differ,
+        fake_db,
+        "INSERT INTO TABLES VALUES ('bench', 'new_table', 'BASE TABLE', 'InnoDB', 'utf8mb4_general_ci', '',"
+        " 'Dynamic', '2030-01-01 00:00:00', NULL)",
+        "INSERT INTO COLUMNS VALUES ('bench', 'new_table', 'id', 1, 'bigint', 'NO', NULL, '', '')",
+    )
+    assert result["added_tables"] == ["new_table"]
+    assert result["dropped_tables"] == [] and result["changed_tables"] == []
+
+
+def test_dropped_table(differ: schema_diff.SchemaDiffer, fake_db: str) -> None:
+    result = _since_baseline(
+        differ,
+        fake_db,
+        *(f"DELETE FROM {view} WHERE TABLE_NAME = 't_00003'" for view in _TABLE_VIEWS),
+    )
+    assert result["dropped_tables"] == ["t_00003"]
+    assert result["added_tables"] == []
+
+
+def test_modified_columns_and_indexes(differ: schema_diff.SchemaDiffer, fake_db: str) -> None:
+    result = _since_baseline(
+        differ,
+        fake_db,
+        "UPDATE COLUMNS SET COLUMN_COMMENT = 'changed' WHERE TABLE_NAME = 't_00001' AND COLUMN_NAME = 'id'",
+        "INSERT INTO COLUMNS VALUES ('bench', 't_00001', 'added', 99, 'int', 'YES', NULL, '', '')",
+        "INSERT INTO STATISTICS VALUES ('bench', 't_00001', 'ix_added', 'added', 1, 1)",
+    )
+    assert result["tables_checked"] == 1
+    (changed,) = result["changed_tables"]
+    assert changed["table_name"] == "t_00001"
+    assert changed["columns"] == {"added": ["added"], "modified": ["id"]}
+    assert changed["indexes"] == {"added": ["ix_added"]}
+    assert changed["column_order"] is True
+
+
+@pytest.mark.parametrize(
+    "statements, section",
+    [
+        # 이름이 같은 FK의 ON DELETE 규칙만 변경
+        (("UPDATE REFERENTIAL_CONSTRAINTS SET DELETE_RULE = 'CASCADE' WHERE CONSTRAINT_NAME = 'fk_t_00005_t_00000'",),
+         "foreign_keys"),
+        # 이름이 같은 FK의 참조 대상만 변경
+        (
+            (
+                "UPDATE REFERENTIAL_CONSTRAINTS SET REFERENCED_TABLE_NAME = 't_00001'"
+                " WHERE CONSTRAINT_NAME = 'fk_t_00005_t_00000'",
+                "UPDATE KEY_COLUMN_USAGE SET REFERENCED_TABLE_NAME = 't_00001'"
+                " WHERE CONSTRAINT_NAME = 'fk_t_00005_t_00000'",
+            ),
+            "foreign_keys",
+        ),
+        # 이름이 같은 CHECK의 식만 변경
+        (("UPDATE CHECK_CONSTRAINTS SET CHECK_CLAUSE = '(`id` > 1)' WHERE CONSTRAINT_NAME = 'ck_t_00005'",),
+         "check_constraints"),
+    ],
+)
+def test_modified_constraint_with_same_name(
+    differ: schema_diff.SchemaDiffer, fake_db: str, statements: tuple[str, ...], section: str
+) -> None:
+    result = _since_baseline(differ, fake_db, *statements)
+    (changed,) = result["changed_tables"]
+    assert changed["table_name"] == "t_00005"
+    assert list(changed[section]) == ["modified"]
+
+
+def test_chained_versions(differ: schema_diff.SchemaDiffer, fake_db: str) -> None:
+    first = _since_baseline(
+        differ, fake_db, "UPDATE COLUMNS SET COLUMN_COMMENT = 'a' WHERE TABLE_NAME = 't_00002' AND COLUMN_NAME = 'id'"
+    )
+    _write(fake_db, "UPDATE COLUMNS SET COLUMN_COMMENT = 'b' WHERE TABLE_NAME = 't_00004' AND COLUMN_NAME = 'id'")
+    second = differ.diff(metadata, SCHEMA, first["version"])
+    assert [c["table_name"] for c in second["changed_tables"]] == ["t_00004"]
+
+
+def test_unknown_version(differ: schema_diff.SchemaDiffer) -> None:
+    with pytest.raises(MetadataError):
+        differ.diff(metadata, SCHEMA, "nope")
@@ -0,0 +1,98 @@
+"""버전 토큰과 if_none_match: 토큰은 응답 내용 해시이고, 캐시가 놓친 ALTER도 비교 전에 테이블 변경 표시로 반영한다."""
+import sqlite3
+
+import pytest
+
+from conftest import SCHEMA
+from src import metadata, versioning
+
+
+def _write(path: str, sql: str) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute(sql)
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def cached(fake_db: str, monkeypatch: pytest.MonkeyPatch) -> str:
+    # 지문 재확인 없이 캐시만으로 답하는 상황
+    monkeypatch.setattr(metadata.config, "METADATA_CACHE_FINGERPRINT_INTERVAL", 3600)
+    return fake_db
+
+
+def _get(table_name: str, if_none_match: str | None = None) -> dict:
+    return versioning.get_table_metadata(metadata, SCHEMA, table_name, None, if_none_match)
+
+
+def test_same_content_not_modified(cached: str) -> None:
+    first = _get("t_00005")
+    assert first["version"] == _get("t_00005")["version"]
+    assert _get("t_00005", first["version"]) == {
+        "schema": SCHEMA, "table_name": "t_00005", "version": first["version"], "not_modified": True
+    }
+
+
+def test_check_reads_only_requested_table_stamps(cached: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    version = _get("t_00005")["version"]
+    _get("t_00005", version)  # 첫 비교: 기억한 변경 표시가 없어 그 테이블 캐시만 다시 읽음
+    load = metadata._load_table_stamps
+    calls = []
+    monkeypatch.setattr(metadata, "_load_table_stamps", lambda s, names: calls.append(names) or load(s, names))
+    misses = metadata._target_cache().stats()["misses"]
+    assert _get("t_00005", version)["not_modified"] is True
+    assert calls == [["t_00005"]]
+    assert metadata._target_cache().stats()["misses"] == misses  # 본문은 캐시에서
+
+
+@pytest.mark.parametrize(
+    "sql, check",
+    [
+        (
+            "UPDATE REFERENTIAL_CONSTRAINTS SET DELETE_RULE = 'CASCADE' WHERE CONSTRAINT_NAME = 'fk_t_00005_t_00000'",
+            lambda e: e["foreign_keys"][0]["delete_rule"] == "CASCADE",
+        ),
+        (
+            "UPDATE CHECK_CONSTRAINTS SET CHECK_CLAUSE = '(`id` > 1)' WHERE CONSTRAINT_NAME = 'ck_t_00005'",
+            lambda e: e["check_constraints"][0]["check_clause"] == "(`id` > 1)",
+        ),
+        (
+            "UPDATE COLUMNS SET COLUMN_COMMENT = 'changed' WHERE TABLE_NAME = 't_00005' AND COLUMN_NAME = 'id'",
+            lambda e: e["columns"][0]["column_comment"] == "changed",
+        ),
+    ],
+)
+def test_alter_missed_by_fingerprint_changes_version(cached: str, sql: str, check) -> None:
+    version = _get("t_00005", "unknown")["version"]
+    _write(cached, sql)
+    result = _get("t_00005", version)
+    assert "not_modified" not in result and result["version"] != version
+    assert check(result)
+    assert _get("t_00005", result["version"])["not_modified"] is True
+
+
+def test_stale_cache_before_first_check(cached: str) -> None:
+    # 토큰 없이 받은(캐시된) 본문이 이미 오래됐어도, 토큰 비교 때 다시 읽어 새 내용을 준다
+    version = _get("t_00005")["version"]
+    _write(cached, "UPDATE COLUMNS SET COLUMN_COMMENT = 'changed' WHERE TABLE_NAME = 't_00005' AND COLUMN_NAME = 'id'")
+    assert _get("t_00005")["version"] == version  # 토큰 없이는 캐시 그대로
+    result = _get("t_00005", version)
+    assert result["version"] != version and result["columns"][0]["column_comment"] == "changed"
+
+
+def test_tables_metadata_mixed(cached: str) -> None:
+    first = versioning.get_tables_metadata(metadata, SCHEMA, ["t_00001", "t_00002", "nope"], None, None)
+    assert "error" in first[2]
+    known = {"t_00001": first[0]["version"], "t_00002": first[1]["version"]}
+    _write(cached, "UPDATE COLUMNS SET COLUMN_COMMENT = 'x' WHERE TABLE_NAME = 't_00002' AND COLUMN_NAME = 'id'")
+    second = versioning.get_tables_metadata(metadata, SCHEMA, ["t_00001", "t_00002"], None, known)
+    assert second[0]["not_modified"] is True
+    assert "not_modified" not in second[1] and second[1]["columns"][0]["column_comment"] == "x"
+
+
+def test_overview_version(cached: str) -> None:
+    first = versioning.get_schema_overview(metadata, SCHEMA, None)
+    assert versioning.get_schema_overview(metadata, SCHEMA, first["version"])["not_modified"] is True
+    metadata.clear_cache(SCHEMA)
+    _write(cached, "UPDATE TABLES SET TABLE_COMMENT = 'x' WHERE TABLE_NAME = 't_00001'")
+    assert "not_modified" not in versioning.get_schema_overview(metadata, SCHEMA, first["version"])